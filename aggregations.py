@@ -0,0 +1,64 @@
+import pandas as pd
+import streamlit as st
+
+from utils import dataset_version
+
+METRICS = ["OVR", "PACE", "SHOOTING", "PASSING", "DRIBBLING", "PHYSICAL", "AERIAL", "MENTAL", "Age", "market_value"]
+
+# Statistics produced for every metric; q25/q75 are the box-plot quartiles
+STATISTICS = ["count", "mean", "median", "std", "min", "max", "q25", "q75"]
+
+
+def filter_key(filters) -> tuple:
+    """Hashable, order-independent key for a {column: allowed values} filter set"""
+    return tuple(sorted((col, tuple(sorted(map(str, values)))) for col, values in (filters or {}).items()))
+
+
+def apply_filters(df: pd.DataFrame, key: tuple) -> pd.DataFrame:
+    for col, values in key:
+        df = df[df[col].astype(str).isin(values)]
+    return df
+
+
+def compute_group_stats(df: pd.DataFrame, by: str = "League", metrics=None) -> pd.DataFrame:
+    """
+    All statistics for all metrics per group from one groupby.
+    Returns a frame indexed by group with (metric, statistic) columns plus ('Players', 'count').
+    """
+    metrics = [m for m in (metrics or METRICS) if m in df.columns]
+    grouped = df.groupby(by, sort=True)[metrics]
+    stats = grouped.agg(["count", "mean", "median", "std", "min", "max"])
+    quartiles = grouped.quantile([0.25, 0.75]).unstack()
+    quartiles.columns = pd.MultiIndex.from_tuples(
+        [(metric, "q25" if q == 0.25 else "q75") for metric, q in quartiles.columns]
+    )
+    stats = pd.concat([stats, quartiles], axis=1)
+    stats = stats.reindex(columns=pd.MultiIndex.from_product([metrics, STATISTICS]))
+    stats[("Players", "count")] = grouped.size()
+    return stats
+
+
+@st.cache_data(show_spinner=False)
+def _cached_group_stats(_df, version, by, key):
+    return compute_group_stats(apply_filters(_df, key), by)
+
+
+def get_group_stats(df: pd.DataFrame, by: str = "League", filters=None, version: str = None) -> pd.DataFrame:
+    """
+    Cached per-group statistics keyed by dataset version, grouping column and active filter set.
+    Every tab of a page reads from the same table instead of re-masking the data per group.
+    """
+    return _cached_group_stats(df, version or dataset_version(), by, filter_key(filters))
+
+
+def long_format(stats: pd.DataFrame, metrics, statistics=("median", "mean")) -> pd.DataFrame:
+    """(group, metric) rows with one column per statistic plus the group size, for line/bar charts"""
+    group_name = stats.index.name or "Group"
+    frames = []
+    for metric in metrics:
+        part = stats[metric][list(statistics)].copy()
+        part.columns = [s.title() for s in statistics]
+        part["Metric"] = metric
+        part["Players"] = stats[("Players", "count")]
+        frames.append(part)
+    return pd.concat(frames).rename_axis(group_name).reset_index()
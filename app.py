@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 from pathlib import Path
 import sys
 import os
@@ -7,6 +6,11 @@ import os
 # Add pages directory to path
 sys.path.append(str(Path(__file__).parent / "pages"))
 
+from dashboard_summary import get_dashboard_summary, preview_frame
+from utils import watch_dataset
+import profiling
+import telemetry
+
 # Configure page - START COLLAPSED
 st.set_page_config(
     page_title="Football Scouting Dashboard",
@@ -15,6 +19,17 @@ st.set_page_config(
     initial_sidebar_state="collapsed"  # Start collapsed
 )
 
+# Hidden debug panel (?debug=1 or SCOUT_DEBUG=1): per-rerun section timings and cache hits
+debug_telemetry = telemetry.begin_run(st.session_state.get("current_page", "dashboard"))
+
+# Hot reload: swap in an edited CSV and pin this rerun to one consistent dataset snapshot.
+# The dashboard renders from its persisted summary and never touches the snapshot, so it
+# skips the watcher: a fresh process serves the landing page without reading the CSV.
+if st.session_state.get("current_page", "dashboard") != "dashboard":
+    dataset_change = watch_dataset()
+    if dataset_change:
+        st.toast(f"🔄 Dataset reloaded: {dataset_change.describe()}")
+
 # Enhanced CSS with collapsible sidebar and navigation
 st.markdown("""
 <style>
@@ -360,6 +375,7 @@ div[data-testid="stVerticalBlock"] > div[style*="flex-direction: column;"] > div
 }
 </style>
 """, unsafe_allow_html=True)
+telemetry.mark("app css")
 
 # Initialize session state
 if "current_page" not in st.session_state:
@@ -393,20 +409,10 @@ def render_sidebar():
                 st.session_state.current_page = page_key
                 st.rerun()
 
-# Enhanced data loading
-@st.cache_data
-def load_data():
-    try:
-        df = pd.read_csv('forwards_clean_with_market_values_updated.csv')
-        return df
-    except FileNotFoundError:
-        st.error("⚠️ Data file not found. Please ensure 'forwards_clean_with_market_values_updated.csv' is in the project directory.")
-        return pd.DataFrame()
-
 # Main dashboard content
 def show_dashboard():
-    # Load data
-    df = load_data()
+    # Materialised KPIs for the current dataset version (no DataFrame scan on navigation)
+    summary = get_dashboard_summary()
     
     # Hero section
     st.markdown('''
@@ -418,31 +424,26 @@ def show_dashboard():
     </div>
     ''', unsafe_allow_html=True)
     
-    if not df.empty:
+    if summary is not None:
         # Key Statistics
         st.markdown('<div class="section-header">📊 Key Statistics</div>', unsafe_allow_html=True)
         
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            total_forwards = len(df)
-            st.metric("⚽ Total Forwards", f"{total_forwards:,}")
+            st.metric("⚽ Total Forwards", f"{summary['total_forwards']:,}")
         
         with col2:
-            leagues_count = df['League'].nunique() if 'League' in df.columns else 0
-            st.metric("🏆 Leagues", leagues_count)
+            st.metric("🏆 Leagues", summary['leagues'])
         
         with col3:
-            teams_count = df['Team'].nunique() if 'Team' in df.columns else 0
-            st.metric("👕 Teams", teams_count)
+            st.metric("👕 Teams", summary['teams'])
         
         with col4:
-            if 'market_value' in df.columns:
-                avg_market_value = df['market_value'].mean()
-                st.metric("💰 Avg Market Value", f"€{avg_market_value:.1f}M")
+            if summary['avg_market_value'] is not None:
+                st.metric("💰 Avg Market Value", f"€{summary['avg_market_value']:.1f}M")
             else:
-                avg_overall = df['OVR'].mean() if 'OVR' in df.columns else 0
-                st.metric("⭐ Avg Overall", f"{avg_overall:.1f}")
+                st.metric("⭐ Avg Overall", f"{summary['avg_overall'] or 0:.1f}")
         
         # Clickable Scouting Tools
         st.markdown('<div class="section-header">🚀 Scouting Tools</div>', unsafe_allow_html=True)
@@ -485,14 +486,7 @@ def show_dashboard():
         if st.checkbox("📋 Preview Database", help="Show sample data"):
             st.markdown('<div class="section-header">📊 Data Sample</div>', unsafe_allow_html=True)
             
-            preview_cols = ['Name', 'Team', 'League', 'Age', 'Position']
-            if 'market_value' in df.columns:
-                preview_cols.append('market_value')
-            if 'OVR' in df.columns:
-                preview_cols.append('OVR')
-                
-            existing_cols = [col for col in preview_cols if col in df.columns]
-            preview_df = df[existing_cols].head(10)
+            preview_df = preview_frame(summary)
             
             st.dataframe(
                 preview_df,
@@ -521,6 +515,7 @@ def show_dashboard():
 # Page routing
 def main():
     render_sidebar()
+    telemetry.mark("sidebar")
     
     current_page = st.session_state.current_page
     
@@ -528,9 +523,12 @@ def main():
         if current_page == "dashboard":
             show_dashboard()
         else:
-            # Import and run the specific page
+            # Import and run the specific page (profiled with SCOUT_PROFILE=1 or ?profile=1)
             module = __import__(current_page)
-            module.main()
+            force_profile = st.query_params.get("profile") == "1"
+            profiling.profile_call(f"page-{current_page}", module.main, force=force_profile)
+            if force_profile and profiling.last_profile():
+                st.caption(f"🔬 Profile saved: {os.path.basename(profiling.last_profile()[0])}")
     except ModuleNotFoundError as e:
         st.error(f"⚠️ Page '{current_page}' not found: {e}")
         st.info("Returning to dashboard...")
@@ -541,6 +539,10 @@ def main():
         st.info("Returning to dashboard...")
         st.session_state.current_page = "dashboard"
         show_dashboard()
+    
+    if debug_telemetry:
+        telemetry.end_run()
+        telemetry.render_debug_panel()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,165 @@
+# backend/embedding_cache.py - PERSISTENT EMBEDDING CACHE SHARED BY BUILDER AND QUERIES
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+
+def resolve_cache_dir():
+    """Locate the shared on-disk cache directory (next to the vector database)"""
+    cache_dir = os.environ.get("SCOUT_CACHE_DIR")
+    if not cache_dir:
+        cache_dir = "../cache" if os.path.exists("../football_vectordb") else "./cache"
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+class EmbeddingCache:
+    """On-disk text hash -> vector store with a size limit and LRU eviction.
+
+    Vectors are stored either as raw float32 or as int8 with a per-vector
+    scale; lookups always return float32.
+    """
+
+    def __init__(self, path=None, model_name="all-MiniLM-L6-v2", dtype=None, max_entries=None):
+        self.path = path or os.environ.get("EMBEDDING_CACHE_PATH") or os.path.join(resolve_cache_dir(), "embeddings.sqlite")
+        self.model_name = model_name
+        self.dtype = dtype or os.environ.get("EMBEDDING_CACHE_DTYPE", "float32")
+        if self.dtype not in ("float32", "int8"):
+            raise ValueError(f"Unsupported embedding cache dtype: {self.dtype}")
+        self.max_entries = int(max_entries or os.environ.get("EMBEDDING_CACHE_MAX_ENTRIES", 200000))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                dtype TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                scale REAL NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+        self._conn.commit()
+
+    def key(self, text):
+        """Cache key for a text: the model name is part of the hash so models never mix"""
+        return hashlib.sha256(f"{self.model_name}\x00{text}".encode("utf-8")).hexdigest()
+
+    def _pack(self, vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        if self.dtype == "int8":
+            scale = float(np.abs(vector).max()) / 127.0 or 1.0
+            codes = np.clip(np.rint(vector / scale), -127, 127).astype(np.int8)
+            return "int8", len(vector), scale, codes.tobytes()
+        return "float32", len(vector), 1.0, vector.tobytes()
+
+    @staticmethod
+    def _unpack(dtype, scale, blob):
+        if dtype == "int8":
+            return np.frombuffer(blob, dtype=np.int8).astype(np.float32) * scale
+        return np.frombuffer(blob, dtype=np.float32).copy()
+
+    def _roundtrip(self, vector):
+        dtype, _, scale, blob = self._pack(vector)
+        return self._unpack(dtype, scale, blob)
+
+    def get_many(self, texts):
+        """Return {position: vector} for every text already in the cache"""
+        keys = [self.key(t) for t in texts]
+        found = {}
+        with self._lock:
+            rows = {}
+            # SQLite caps the number of bound parameters, so look up in chunks
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for key, dtype, scale, blob in self._conn.execute(
+                    f"SELECT key, dtype, scale, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ):
+                    rows[key] = (dtype, scale, blob)
+            if rows:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, k) for k in rows]
+                )
+                self._conn.commit()
+        for pos, key in enumerate(keys):
+            if key in rows:
+                found[pos] = self._unpack(*rows[key])
+        return found
+
+    def put_many(self, texts, vectors):
+        """Store vectors for texts, then evict least recently used entries over the limit"""
+        now = time.time()
+        records = [(self.key(t), *self._pack(v), now) for t, v in zip(texts, vectors)]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, dtype, dim, scale, vector, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                records
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def encode(self, model, texts, batch_size=64):
+        """Drop-in for model.encode(texts): only texts missing from the cache are encoded"""
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        found = self.get_many(texts)
+        missing = [i for i in range(len(texts)) if i not in found]
+        self.hits += len(found)
+        self.misses += len(missing)
+
+        if missing:
+            # Encode each distinct missing text once, even if it repeats in the batch
+            unique_texts = list(dict.fromkeys(texts[i] for i in missing))
+            encoded = np.asarray(model.encode(unique_texts, batch_size=batch_size), dtype=np.float32)
+            self.put_many(unique_texts, encoded)
+            by_text = dict(zip(unique_texts, encoded))
+            if self.dtype == "int8":
+                # Return what later lookups will return, so builds and queries agree
+                by_text = {t: self._roundtrip(v) for t, v in by_text.items()}
+            for i in missing:
+                found[i] = by_text[texts[i]]
+
+        return np.vstack([found[i] for i in range(len(texts))])
+
+    def stats(self):
+        """Hit/miss counters and on-disk footprint"""
+        with self._lock:
+            count, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": count,
+            "max_entries": self.max_entries,
+            "dtype": self.dtype,
+            "vector_bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,195 @@
+# backend/lexical_index.py - BM25 INVERTED INDEX OVER PLAYER DOCUMENTS AND PLAY STYLES
+import math
+import re
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "best", "by", "find", "for", "from", "good", "in", "is",
+    "me", "most", "of", "on", "or", "player", "players", "show", "the", "to", "top", "under",
+    "who", "with"
+}
+
+# Scouting vocabulary mapped onto the words used in the generated stat descriptions
+QUERY_EXPANSIONS = {
+    "creative": ["vision", "passing"],
+    "playmaker": ["vision", "passing", "distribution"],
+    "clinical": ["finishing"],
+    "finisher": ["finishing"],
+    "skillful": ["dribbling", "control"],
+    "skilful": ["dribbling", "control"],
+    "dribbler": ["dribbling", "control"],
+    "quick": ["fast", "pace"],
+    "rapid": ["fast", "pace"],
+    "powerful": ["strength", "physical"],
+    "physical": ["strength", "physicality"],
+}
+
+# Explicitly named play styles: "Rapid", 'Technical', play style Rapid
+MARKED_TRAIT_RE = re.compile(r'"([^"]+)"|\'([^\']+)\'|\bplay\s*styles?\s*:?\s+([a-z+]+(?:\s*,\s*[a-z+]+)*)', re.I)
+
+
+def normalize_text(text):
+    """Lowercase and strip accents so 'Mbappé' matches 'mbappe'"""
+    text = unicodedata.normalize("NFKD", str(text))
+    return "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(normalize_text(text)) if t not in STOPWORDS]
+
+
+def expand_query(tokens):
+    expanded = list(tokens)
+    for token in tokens:
+        expanded.extend(QUERY_EXPANSIONS.get(token, []))
+    return expanded
+
+
+def parse_play_styles(value):
+    """'Quick Step+, Finesse Shot' -> ['quick step', 'finesse shot'] (the '+' upgrade marker is dropped)"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return []
+    traits = []
+    for raw in str(value).split(","):
+        trait = normalize_text(raw).replace("+", "").strip()
+        if trait:
+            traits.append(" ".join(TOKEN_RE.findall(trait)))
+    return traits
+
+
+def trait_token(trait):
+    return "trait_" + trait.replace(" ", "_")
+
+
+def reciprocal_rank_fusion(rankings, k=60, weights=None):
+    """Fuse several ranked id lists: score(id) = sum(w / (k + rank))"""
+    weights = weights or [1.0] * len(rankings)
+    scores = defaultdict(float)
+    for ranking, weight in zip(rankings, weights):
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] += weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class BM25Index:
+    """In-memory BM25 index with a separate vocabulary for play-style traits.
+
+    Each document has plain text fields plus a list of traits; every trait is
+    indexed both as its words and as a single phrase token so that
+    "Press Proven" matches the trait rather than any player who "presses".
+    """
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_ids = []
+        self.position = {}
+        self.postings = {}
+        self.idf = {}
+        self.doc_len = None
+        self.avg_len = 0.0
+        self.traits = []
+        self.trait_patterns = []
+        self.style_vocab = set()
+
+    def build(self, doc_ids, texts, traits, style_texts=None):
+        """Index documents; style_texts are descriptive words that count as soft intent"""
+        style_texts = style_texts or [""] * len(texts)
+        self.style_vocab = set()
+        term_docs = defaultdict(list)
+        term_freqs = defaultdict(list)
+        lengths = np.zeros(len(texts), dtype=np.float32)
+        trait_vocab = set()
+
+        for pos, (text, doc_traits, style_text) in enumerate(zip(texts, traits, style_texts)):
+            style_tokens = tokenize(style_text)
+            self.style_vocab.update(style_tokens)
+            tokens = tokenize(text) + style_tokens
+            for trait in doc_traits:
+                tokens.extend(trait.split())
+                tokens.append(trait_token(trait))
+                self.style_vocab.update(trait.split())
+                trait_vocab.add(trait)
+
+            counts = defaultdict(int)
+            for token in tokens:
+                counts[token] += 1
+            for token, count in counts.items():
+                term_docs[token].append(pos)
+                term_freqs[token].append(count)
+            lengths[pos] = len(tokens)
+
+        n_docs = len(texts)
+        self.doc_ids = list(doc_ids)
+        self.position = {doc_id: pos for pos, doc_id in enumerate(self.doc_ids)}
+        self.doc_len = lengths
+        self.avg_len = float(lengths.mean()) if n_docs else 0.0
+        self.postings = {
+            token: (np.array(term_docs[token], dtype=np.int32), np.array(term_freqs[token], dtype=np.float32))
+            for token in term_docs
+        }
+        self.idf = {
+            token: math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for token, docs in term_docs.items()
+        }
+        # Longest traits first so "power shot" is not shadowed by a shorter overlap
+        self.traits = sorted(trait_vocab, key=len, reverse=True)
+        self.trait_patterns = [(t, re.compile(r"\b" + re.escape(t) + r"\b")) for t in self.traits]
+        return self
+
+    def match_traits(self, query):
+        """Play-style traits named in the query"""
+        query = " ".join(TOKEN_RE.findall(normalize_text(query)))
+        return [trait for trait, pattern in self.trait_patterns if pattern.search(query)]
+
+    def filter_traits(self, query):
+        """
+        Traits meant as hard filters: multi-word trait names ("finesse shot"), or any trait the
+        query marks explicitly, quoted or after "play style". Single-word traits that double
+        as ordinary adjectives ("rapid", "technical") are left to ranking.
+        """
+        marked = " ".join(next(group for group in groups if group) for groups in MARKED_TRAIT_RE.findall(query))
+        marked_traits = set(self.match_traits(marked)) if marked else set()
+        return [trait for trait in self.match_traits(query) if " " in trait or trait in marked_traits]
+
+    def soft_terms(self, query):
+        """Query words that describe style rather than hard constraints"""
+        return [t for t in tokenize(query) if t in self.style_vocab or t in QUERY_EXPANSIONS]
+
+    def docs_with_traits(self, traits):
+        """Doc ids carrying every one of the traits"""
+        positions = None
+        for trait in traits:
+            docs, _ = self.postings.get(trait_token(trait), (np.array([], dtype=np.int32), None))
+            positions = set(docs.tolist()) if positions is None else positions & set(docs.tolist())
+        return {self.doc_ids[p] for p in (positions or set())}
+
+    def scores(self, query):
+        """BM25 score of every document for the query as a dense array"""
+        scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+        tokens = expand_query(tokenize(query)) + [trait_token(t) for t in self.match_traits(query)]
+        for token in tokens:
+            if token not in self.postings:
+                continue
+            docs, tf = self.postings[token]
+            norm = self.k1 * (1 - self.b + self.b * self.doc_len[docs] / self.avg_len)
+            scores[docs] += self.idf[token] * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    def search(self, query, top_n=50, candidates=None):
+        """Ranked (doc_id, score) list, optionally restricted to a set of candidate ids"""
+        scores = self.scores(query)
+        if candidates is not None:
+            mask = np.zeros(len(self.doc_ids), dtype=bool)
+            mask[[self.position[d] for d in candidates if d in self.position]] = True
+            scores = np.where(mask, scores, 0.0)
+        hits = np.flatnonzero(scores > 0)
+        if len(hits) > top_n:
+            hits = hits[np.argpartition(-scores[hits], top_n - 1)[:top_n]]
+        hits = hits[np.argsort(-scores[hits])]
+        return [(self.doc_ids[i], float(scores[i])) for i in hits]
@@ -1,12 +1,17 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from typing import Optional
 import uvicorn
 import asyncio
 import sys
 import os
+import secrets
+import time
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from rag_system import FootballRAGSystem
+from dataset_watcher import POLL_INTERVAL
+import profiling
 
 app = FastAPI(title="Football RAG API", version="1.0.0")
 
@@ -19,20 +24,45 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def add_process_time_header(request: Request, call_next):
+    """Server-side handling time, so load tests can tell queueing apart from service time"""
+    start = time.perf_counter()
+    response = await call_next(request)
+    response.headers["X-Process-Time"] = f"{(time.perf_counter() - start) * 1000:.1f}"
+    return response
+
 # Initialize RAG system
 rag_system = None
+reload_task = None
 
 class QueryRequest(BaseModel):
     query: str
+    mode: str = "auto"  # "auto", "template" or "llm"
+    enrich: bool = False  # for template answers, generate LLM prose in the background
 
 class QueryResponse(BaseModel):
     response: str
     sources: list = []
+    mode: str = "llm"
+    enrichment_id: Optional[str] = None
+
+class ProfilingRequest(BaseModel):
+    enabled: bool
+    profiler: str = "sampling"  # "sampling" or "cprofile"
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Admin endpoints need X-Admin-Token matching SCOUT_ADMIN_TOKEN; without a configured token they stay closed"""
+    expected = os.environ.get("SCOUT_ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (set SCOUT_ADMIN_TOKEN)")
+    if not secrets.compare_digest(x_admin_token or "", expected):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize the RAG system on startup"""
-    global rag_system
+    global rag_system, reload_task
     try:
         rag_system = FootballRAGSystem()
         await rag_system.initialize()
@@ -40,30 +70,109 @@ async def startup_event():
     except Exception as e:
         print(f"❌ Failed to initialize RAG system: {e}")
         raise
+    if POLL_INTERVAL > 0:
+        reload_task = asyncio.create_task(watch_dataset())
+
+async def watch_dataset():
+    """Hot-reload the player CSV: check its size/mtime every SCOUT_RELOAD_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(POLL_INTERVAL)
+        try:
+            await rag_system.reload_dataset()
+        except Exception as e:
+            print(f"⚠️ Dataset reload failed, keeping the current data: {e}")
 
 @app.get("/health")
 async def health_check():
     return {
         "status": "healthy", 
         "message": "Football RAG API is running",
-        "rag_ready": rag_system is not None
+        "rag_ready": rag_system is not None,
+        "data_version": rag_system.data_version if rag_system else None,
+        "answer_modes": rag_system.answer_mode_counts if rag_system else {}
     }
 
+@app.get("/vector-storage")
+async def vector_storage():
+    """Footprint and recall@k of the vector store used by the query path"""
+    if rag_system is None:
+        raise HTTPException(status_code=503, detail="RAG system not initialized")
+    return rag_system.vector_storage_report()
+
+@app.get("/correlations")
+async def correlations(columns: Optional[str] = None, method: str = "pearson"):
+    """Cached correlation matrix (r, p-values, pairwise n); columns is a comma-separated subset"""
+    if rag_system is None:
+        raise HTTPException(status_code=503, detail="RAG system not initialized")
+    if method not in ("pearson", "spearman"):
+        raise HTTPException(status_code=422, detail=f"Unknown method: {method}")
+    selected = [c.strip() for c in columns.split(",")] if columns else None
+    return rag_system.correlation_report(selected, method)
+
 @app.post("/query", response_model=QueryResponse)
-async def process_query(request: QueryRequest):
+async def process_query(request: QueryRequest, http_response: Response, profile: bool = False):
+    """profile=true profiles this request; the profile files are named in X-Profile"""
     if rag_system is None:
         raise HTTPException(status_code=503, detail="RAG system not initialized")
     
+    if request.mode not in ("auto", "template", "llm"):
+        raise HTTPException(status_code=422, detail=f"Unknown mode: {request.mode}")
+    
     try:
-        response = await rag_system.process_query(request.query)
+        if profile:
+            with profiling.forced():
+                response = await rag_system.process_query(request.query, mode=request.mode, enrich=request.enrich)
+            if profiling.last_profile():
+                http_response.headers["X-Profile"] = ",".join(os.path.basename(p) for p in profiling.last_profile())
+        else:
+            response = await rag_system.process_query(request.query, mode=request.mode, enrich=request.enrich)
         return QueryResponse(
             response=response["answer"],
-            sources=response.get("sources", [])
+            sources=response.get("sources", []),
+            mode=response.get("mode", "llm"),
+            enrichment_id=response.get("enrichment_id")
         )
     except Exception as e:
         print(f"Query processing error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/enrichment/{enrichment_id}")
+async def get_enrichment(enrichment_id: str):
+    """Poll the background LLM prose for a template answer"""
+    if rag_system is None:
+        raise HTTPException(status_code=503, detail="RAG system not initialized")
+    result = rag_system.get_enrichment(enrichment_id)
+    if result["status"] == "unknown":
+        raise HTTPException(status_code=404, detail="Unknown enrichment id")
+    return result
+
+@app.get("/admin/profiling", dependencies=[Depends(require_admin)])
+async def profiling_status():
+    """Whether every query is being profiled, and the latest profile files"""
+    return profiling.status()
+
+@app.post("/admin/profiling", dependencies=[Depends(require_admin)])
+async def set_profiling(request: ProfilingRequest):
+    """Switch profiling of every query on or off at runtime"""
+    if request.enabled:
+        try:
+            profiling.enable(request.profiler)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    else:
+        profiling.disable()
+    return profiling.status()
+
+@app.post("/admin/reload", dependencies=[Depends(require_admin)])
+async def reload_dataset(force: bool = False):
+    """Re-read the player CSV now instead of waiting for the next check (force: even if it looks unchanged)"""
+    if rag_system is None:
+        raise HTTPException(status_code=503, detail="RAG system not initialized")
+    try:
+        return await rag_system.reload_dataset(force)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Reload failed: {e}")
+
 if __name__ == "__main__":
     print("🚀 Starting Football RAG API...")
     uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
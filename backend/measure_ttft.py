@@ -0,0 +1,54 @@
+# backend/measure_ttft.py - TIME-TO-FIRST-TOKEN BEFORE/AFTER PROMPT BUDGETING
+import argparse
+import asyncio
+import statistics
+
+from rag_system import FootballRAGSystem
+
+SAMPLE_QUERIES = [
+    "Who is the fastest player in Premier League?",
+    "Compare Mbappe vs Haaland",
+    "Find young French talents under €20M",
+    "Best finishers in Serie A",
+    "Creative wingers with Finesse Shot",
+    "Strongest physical players in Bundesliga",
+]
+
+
+async def measure(rounds, budget):
+    rag = FootballRAGSystem()
+    await rag.initialize()
+
+    results = {"unbudgeted": [], "budgeted": []}
+    tokens = {"unbudgeted": [], "budgeted": []}
+    for _ in range(rounds):
+        for query in SAMPLE_QUERIES:
+            # Alternate modes per query so model warm-up affects both equally
+            for mode, context_budget in (("unbudgeted", None), ("budgeted", budget)):
+                rag.context_budget = context_budget
+                # Forced LLM path, and no stale timing from a previous query if this one fails
+                rag.last_llm_timing = {}
+                await rag.process_query(query, mode="llm")
+                timing = rag.last_llm_timing
+                if timing.get("ttft_ms") is not None:
+                    results[mode].append(timing["ttft_ms"])
+                    tokens[mode].append(timing.get("prompt_eval_count") or 0)
+
+    print("\n📊 Time to first token")
+    for mode, values in results.items():
+        if not values:
+            print(f"  {mode:<11} no successful generations")
+            continue
+        print(f"  {mode:<11} median {statistics.median(values):7.0f}ms | "
+              f"mean {statistics.mean(values):7.0f}ms | "
+              f"prompt tokens evaluated (mean) {statistics.mean(tokens[mode]):6.0f} | n={len(values)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure Ollama TTFT with and without prompt budgeting")
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--budget", type=int, default=None, help="Context token budget (default: system default)")
+    args = parser.parse_args()
+
+    from prompt_builder import DEFAULT_CONTEXT_BUDGET
+    asyncio.run(measure(args.rounds, args.budget or DEFAULT_CONTEXT_BUDGET))
@@ -0,0 +1,189 @@
+# backend/prompt_builder.py - TOKEN-BUDGETED PROMPT CONSTRUCTION FOR THE LLM STAGE
+import math
+
+import pandas as pd
+
+# Instruction blocks are static so the prompt always starts with the same
+# prefix per query type and Ollama can reuse its cached KV for it.
+INSTRUCTIONS = {
+    "singular": """You are a professional football scout. Based on the data below, identify and analyze THE SINGLE BEST player that matches the user's query.
+
+CRITICAL RULES:
+- Focus on ONE player only (the top player in the main results)
+- Use the qualitative descriptions provided (never show raw numbers for pace/shooting/physical/passing/dribbling)
+- Show exact numbers ONLY for: Age, Market Value (€M), Overall Rating (/100)
+- Be detailed and professional like a real scout report
+- If suggestions are provided, mention them at the end
+""",
+    "comparison": """You are a professional football scout. Compare ALL the players provided in the data below.
+
+CRITICAL RULES:
+- Compare each player's strengths and weaknesses point by point
+- Use the qualitative descriptions provided (never show raw numbers for pace/shooting/physical/passing/dribbling)
+- Show exact numbers ONLY for: Age, Market Value (€M), Overall Rating (/100)
+- Use the comparison table provided to structure your analysis
+- Give a clear final recommendation with reasoning
+""",
+    "plural": """You are a professional football scout. Analyze the TOP players from the data below that match the user's query.
+
+CRITICAL RULES:
+- Present MULTIPLE players in ranked order (start with #1, #2, #3, etc.)
+- Use the qualitative descriptions provided (never show raw numbers for pace/shooting/physical/passing/dribbling)
+- Show exact numbers ONLY for: Age, Market Value (€M), Overall Rating (/100)
+- Be detailed for each player with tactical insights
+- If no exact matches were found, clearly explain this and present alternatives
+- If a suggestions section is provided, present it at the end labeled 'ALTERNATIVE OPTIONS'
+""",
+}
+
+ANSWER_HEADERS = {
+    "singular": "Professional Scout Analysis:",
+    "comparison": "Professional Comparison Analysis:",
+    "plural": "Professional Scout Analysis:",
+}
+
+# Response length per query type (was a fixed 900 tokens for everything)
+NUM_PREDICT = {"singular": 450, "comparison": 700, "plural": 650}
+
+# Per-player encodings from richest to most compact
+ENCODINGS = ("full", "compact", "minimal")
+
+DEFAULT_CONTEXT_BUDGET = 600
+
+
+def estimate_tokens(text):
+    """Cheap token estimate (~4 characters per token for English/Llama-style tokenizers)"""
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def encode_player(player, label, stats, encoding="full"):
+    """Render one player at the requested level of detail"""
+    name = player['Name']
+    team = f"{player.get('Team', 'Unknown')} ({player.get('League', 'Unknown')})"
+    age = int(player.get('Age', 25))
+    value = f"€{player.get('market_value', 0):.1f}M"
+    overall = f"{player.get('OVR', 75):.1f}/100"
+    play_style = player.get('play style') if 'play style' in player.index and pd.notna(player.get('play style')) else None
+
+    if encoding == "full":
+        block = f"{label}: {name}\n"
+        block += f"- Team: {team}\n"
+        block += f"- Age: {age} years\n"
+        block += f"- Position: {player.get('Position', 'Unknown')}\n"
+        block += f"- Nation: {player.get('Nation', 'Unknown')}\n"
+        block += f"- Market Value: {value}\n"
+        block += f"- Overall Rating: {overall}\n"
+        for stat_name, description in stats.items():
+            block += f"- {stat_name.title()}: {description}\n"
+        if play_style:
+            block += f"- Play Style: {play_style}\n"
+        return block + "\n"
+
+    if encoding == "compact":
+        traits = "; ".join(f"{k}: {v}" for k, v in stats.items())
+        line = (f"{label}: {name} | {team} | {age}y | {player.get('Position', '?')} | "
+                f"{player.get('Nation', '?')} | {value} | OVR {overall} | {traits}")
+        if play_style:
+            line += f" | Styles: {play_style}"
+        return line + "\n"
+
+    return f"{label}: {name} | {team} | {age}y | {value} | OVR {overall}\n"
+
+
+def build_player_section(players, stats_fn, label, budget, min_encoding_for_first="compact"):
+    """Encode players so the section fits the token budget.
+
+    Tries progressively cheaper encodings (full, compact, compact for the
+    leading players only, minimal; the top player keeps at least
+    `min_encoding_for_first`), then drops players from the tail.
+    Returns (text, encoding_used, players_included).
+    """
+    rows = [player for _, player in players.iterrows()]
+    if not rows:
+        return "", None, 0
+    stats = [stats_fn(player) for player in rows]
+
+    def render(encoding, count, detailed=0):
+        # The first `detailed` players get the compact encoding, the top player
+        # never drops below min_encoding_for_first
+        parts = []
+        for i in range(count):
+            player_encoding = "compact" if i < detailed and encoding == "minimal" else encoding
+            if i == 0:
+                player_encoding = ENCODINGS[min(ENCODINGS.index(player_encoding), ENCODINGS.index(min_encoding_for_first))]
+            parts.append(encode_player(rows[i], f"{label} {i + 1}", stats[i], player_encoding))
+        return "".join(parts)
+
+    if budget is None:
+        return render("full", len(rows)), "full", len(rows)
+
+    for encoding in ("full", "compact"):
+        text = render(encoding, len(rows))
+        if estimate_tokens(text) <= budget:
+            return text, encoding, len(rows)
+
+    # Keep as many leading players compact as fit, the rest minimal
+    for detailed in range(len(rows) - 1, -1, -1):
+        text = render("minimal", len(rows), detailed)
+        if estimate_tokens(text) <= budget:
+            return text, "mixed" if detailed > 1 else "minimal", len(rows)
+
+    count = len(rows)
+    while count > 1:
+        count -= 1
+        text = render("minimal", count)
+        if estimate_tokens(text) <= budget:
+            return text, "minimal", count
+    return render("minimal", 1), "minimal", 1
+
+
+def build_prompt(query_type, query, main_results, suggestions, stats_fn, comparison_table="",
+                 suggestions_header="", notes="", context_budget=DEFAULT_CONTEXT_BUDGET):
+    """Assemble the prompt as static instructions + budgeted data + question.
+
+    context_budget=None disables budgeting (full encodings for every player).
+    Returns (prompt, info) where info records the token estimates and encodings chosen.
+    """
+    instructions = INSTRUCTIONS[query_type]
+    table = comparison_table if query_type == "comparison" else ""
+
+    if context_budget is None:
+        main_budget = suggestions_budget = None
+    else:
+        remaining = max(context_budget - estimate_tokens(table) - estimate_tokens(notes), 200)
+        # Suggestions get at most a quarter of the data budget
+        suggestions_budget = remaining // 4 if not suggestions.empty else 0
+        main_budget = remaining - suggestions_budget
+
+    main_text, main_encoding, main_count = build_player_section(main_results, stats_fn, "Player", main_budget)
+
+    suggestions_text, suggestions_encoding, suggestions_count = "", None, 0
+    if not suggestions.empty and query_type != "comparison":
+        suggestions_text, suggestions_encoding, suggestions_count = build_player_section(
+            suggestions, stats_fn, "Option", suggestions_budget, min_encoding_for_first="minimal"
+        )
+        suggestions_text = f"\n{suggestions_header}\n{suggestions_text}"
+
+    sections = [instructions]
+    if notes:
+        sections.append(notes)
+    if table:
+        sections.append(table)
+        sections.append(f"Detailed Player Data:\n{main_text}")
+    else:
+        sections.append(f"Main Results:\n{main_text}")
+    if suggestions_text:
+        sections.append(suggestions_text)
+    sections.append(f"Question: {query}\n\n{ANSWER_HEADERS[query_type]}")
+    prompt = "\n".join(sections)
+
+    info = {
+        "prompt_tokens_estimate": estimate_tokens(prompt),
+        "instruction_tokens_estimate": estimate_tokens(instructions),
+        "main_encoding": main_encoding,
+        "main_players": main_count,
+        "suggestions_encoding": suggestions_encoding,
+        "suggestion_players": suggestions_count,
+        "num_predict": NUM_PREDICT[query_type],
+    }
+    return prompt, info
@@ -2,38 +2,135 @@
 import chromadb
 import requests
 import json
+import asyncio
 from sentence_transformers import SentenceTransformer
 import pandas as pd
+import numpy as np
 import os
 import re
+import sys
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from embedding_cache import EmbeddingCache
+from vector_quantization import QUANTIZATION_MODES, QuantizedIndex, storage_report
+from lexical_index import BM25Index, parse_play_styles, reciprocal_rank_fusion
+from prompt_builder import DEFAULT_CONTEXT_BUDGET, build_prompt
+from template_answers import classify_query, render_template_answer
+
+# Helpers shared with the Streamlit pages live at the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from player_index import INDEX_COLUMNS, PlayerIndex
+from correlations import get_correlations
+from dataset_watcher import DatasetSnapshot, DatasetWatcher
+from profiling import profiled
+from setup_vectordb import DOCUMENT_COLUMNS, player_document, player_metadata
+
+# Query words that name a numeric attribute, for correlation notes in the prompt
+ATTRIBUTE_WORDS = {
+    'PACE': ['pace', 'speed', 'fast'],
+    'SHOOTING': ['shooting', 'finishing', 'goalscoring'],
+    'PASSING': ['passing', 'vision', 'creativity'],
+    'DRIBBLING': ['dribbling', 'ball control'],
+    'PHYSICAL': ['physical', 'strength', 'physicality'],
+    'AERIAL': ['aerial', 'heading', 'height'],
+    'MENTAL': ['mental', 'composure'],
+    'OVR': ['overall', 'rating', 'ovr'],
+    'Age': ['age', 'older', 'younger'],
+    'market_value': ['market value', 'value', 'price', 'cost']
+}
+
+# Columns the BM25 index reads (document fields, play styles, stat descriptions)
+LEXICAL_COLUMNS = ["Name", "Position", "Alternative positions", "Nation", "League", "Team", "Preferred foot",
+                   "play style", "PACE", "SHOOTING", "PASSING", "DRIBBLING", "PHYSICAL"]
+
+# Players re-embedded per Chroma upsert when a reload changes their documents
+VECTOR_SYNC_BATCH = 100
+
+# Query keywords of the hard filters in apply_comprehensive_filtering
+NATIONALITY_MAP = {
+    'french': ['france', 'fra'],
+    'france': ['france', 'fra'],
+    'brazilian': ['brazil', 'bra'],
+    'brazil': ['brazil', 'bra'],
+    'argentinian': ['argentina', 'arg'],
+    'argentina': ['argentina', 'arg'],
+    'spanish': ['spain', 'esp'],
+    'spain': ['spain', 'esp'],
+    'english': ['england', 'eng'],
+    'england': ['england', 'eng'],
+    'german': ['germany', 'ger'],
+    'germany': ['germany', 'ger'],
+    'italian': ['italy', 'ita'],
+    'italy': ['italy', 'ita'],
+    'portuguese': ['portugal', 'por'],
+    'portugal': ['portugal', 'por'],
+    'dutch': ['netherlands', 'ned'],
+    'netherlands': ['netherlands', 'ned']
+}
+
+LEAGUE_FILTERS = {
+    'premier league': 'Premier League',
+    'premier': 'Premier League',
+    'la liga': 'La Liga',
+    'laliga': 'La Liga',
+    'serie a': 'Serie A',
+    'bundesliga': 'Bundesliga',
+    'ligue 1': 'Ligue 1'
+}
+
+OLLAMA_URL = os.environ.get("OLLAMA_URL", "http://localhost:11434")
+OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "qwen2.5:7b")
 
 class FootballRAGSystem:
     def __init__(self):
         self.client = None
         self.collection = None
         self.embedder = None
+        self.embedding_cache = None
+        self.quantized_index = None
+        self.lexical_index = None
+        self.player_index = None
+        self.correlations = None
+        self.data_version = None
+        # LLM_CONTEXT_BUDGET=0 disables budgeting (full encodings for every player)
+        self.context_budget = int(os.environ.get("LLM_CONTEXT_BUDGET", DEFAULT_CONTEXT_BUDGET)) or None
+        self.last_llm_timing = {}
+        # Background LLM enrichment of template answers
+        self.enrichment_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-enrich")
+        self.enrichments = OrderedDict()
+        self.max_enrichments = 256
+        self.answer_mode_counts = {"template": 0, "llm": 0}
+        self.db_path = None
         self.df = None
+        # Hot reload of the CSV: watcher, per-structure input versions, last reload result
+        self.watcher = None
+        self.derived_versions = {}
+        self.reload_lock = asyncio.Lock()
+        self.last_reload = None
         
     async def initialize(self):
         """Initialize all components"""
         print("🔄 Initializing RAG system...")
         
         # Load data
-        csv_path = "../forwards_clean_with_market_values_updated.csv"
+        csv_path = os.environ.get("SCOUT_DATA_PATH") or "../forwards_clean_with_market_values_updated.csv"
         if not os.path.exists(csv_path):
             csv_path = "forwards_clean_with_market_values_updated.csv"
         
-        self.df = pd.read_csv(csv_path)
-        print(f"📊 Loaded {len(self.df)} players")
+        self.watcher = DatasetWatcher(csv_path)
+        print(f"📊 Loaded {len(self.watcher.snapshot.df)} players")
         
-        # Enhanced data cleaning and validation
-        self.df = self.clean_and_validate_data()
+        # Cleaned table, player index, correlations and BM25 index
+        self.apply_dataset(self.prepare_dataset(self.watcher.snapshot))
         
         # Initialize ChromaDB
         db_path = "../football_vectordb"
         if not os.path.exists(db_path):
             db_path = "./football_vectordb"
             
+        self.db_path = db_path
         self.client = chromadb.PersistentClient(path=db_path)
         
         try:
@@ -45,10 +142,23 @@ class FootballRAGSystem:
         # Initialize embedding model
         print("🤖 Loading embedding model...")
         self.embedder = SentenceTransformer('all-MiniLM-L6-v2')
+        self.embedding_cache = EmbeddingCache(model_name='all-MiniLM-L6-v2')
+        print(f"🧠 Embedding cache ready ({self.embedding_cache.stats()['entries']} cached vectors)")
+        
+        # Optional compact vector store built by setup_vectordb.py --quantization
+        quantization = os.environ.get("VECTOR_QUANTIZATION", "").lower()
+        if quantization in QUANTIZATION_MODES:
+            if QuantizedIndex.exists(db_path, quantization):
+                self.quantized_index = QuantizedIndex.load(db_path, quantization, self.fetch_embeddings)
+                footprint = self.quantized_index.footprint()
+                print(f"🗜️ Using {quantization} vectors: {footprint['quantized_bytes'] / 1024:.1f} KB in memory "
+                      f"({footprint['compression_ratio']:.1f}x smaller than float32)")
+            else:
+                print(f"⚠️ No {quantization} vectors found, run setup_vectordb.py --quantization {quantization}")
         
         # Test Ollama connection
         try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=5)
+            response = requests.get(f"{OLLAMA_URL}/api/tags", timeout=5)
             if response.status_code != 200:
                 raise Exception(f"Ollama returned status {response.status_code}")
             print("🦙 Ollama connection verified")
@@ -57,9 +167,89 @@ class FootballRAGSystem:
         
         print("✅ RAG system initialized successfully!")
     
-    def clean_and_validate_data(self):
-        """Enhanced data cleaning and validation"""
-        df = self.df.copy()
+    def embed_texts(self, texts):
+        """Embed texts through the shared cache so repeated texts are never re-encoded"""
+        return self.embedding_cache.encode(self.embedder, texts)
+    
+    def fetch_embeddings(self, ids):
+        """Stored float32 vectors of these ids from Chroma, in the order asked (the quantized re-rank)"""
+        stored = self.collection.get(ids=list(ids), include=["embeddings"])
+        by_id = dict(zip(stored["ids"], stored["embeddings"]))
+        return np.asarray([by_id[pid] for pid in ids], dtype=np.float32)
+    
+    def semantic_search(self, query, n_results=20, where=None):
+        """Dense retrieval against the Chroma collection, returns (id, similarity, metadata) tuples"""
+        query_embedding = self.embed_texts([query])[0]
+        
+        # Compact codes + float re-rank; metadata filters still go through Chroma
+        if self.quantized_index is not None and where is None:
+            hits = self.quantized_index.search(query_embedding, k=n_results)
+            if not hits:
+                return []
+            metadata = self.collection.get(ids=[pid for pid, _ in hits], include=["metadatas"])
+            meta_by_id = dict(zip(metadata["ids"], metadata["metadatas"]))
+            return [(pid, score, meta_by_id.get(pid, {})) for pid, score in hits]
+        
+        results = self.collection.query(
+            query_embeddings=[query_embedding.tolist()],
+            n_results=n_results,
+            where=where
+        )
+        
+        ids = results.get("ids", [[]])[0]
+        distances = results.get("distances", [[]])[0]
+        metadatas = results.get("metadatas", [[]])[0]
+        # Collection uses cosine distance, convert back to similarity
+        return [(pid, 1.0 - dist, meta) for pid, dist, meta in zip(ids, distances, metadatas)]
+    
+    def build_lexical_index(self, df):
+        """BM25 index keyed by DataFrame index, the same ids the vector DB uses (player_<idx>)"""
+        texts, traits, style_texts = [], [], []
+        for _, player in df.iterrows():
+            texts.append(" ".join(str(player.get(col, "")) for col in
+                                  ["Name", "Position", "Alternative positions", "Nation", "League", "Team", "Preferred foot"]
+                                  if pd.notna(player.get(col))))
+            traits.append(parse_play_styles(player.get("play style")))
+            style_texts.append(" ".join(self.convert_stats_to_text(player).values()))
+        return BM25Index().build(df.index.tolist(), texts, traits, style_texts)
+    
+    def hybrid_rank(self, query, candidates_df, top_n=50):
+        """Rank candidate players by reciprocal rank fusion of BM25 and dense Chroma scores"""
+        candidate_ids = candidates_df.index.tolist()
+        lexical = [doc_id for doc_id, _ in self.lexical_index.search(query, top_n=top_n, candidates=candidate_ids)]
+        
+        dense = []
+        try:
+            # Over-fetch so enough dense hits survive the hard filters
+            candidate_set = set(candidate_ids)
+            for pid, _, _ in self.semantic_search(query, n_results=min(len(self.df), max(top_n * 4, 100))):
+                idx = int(pid.rsplit("_", 1)[-1])
+                if idx in candidate_set:
+                    dense.append(idx)
+        except Exception as e:
+            print(f"⚠️ Dense retrieval unavailable, using lexical ranking only: {e}")
+        
+        fused = reciprocal_rank_fusion([lexical, dense[:top_n]])
+        ranked_ids = [doc_id for doc_id, _ in fused]
+        # Candidates neither retriever surfaced keep their existing order at the end
+        seen = set(ranked_ids)
+        ranked_ids += [doc_id for doc_id in candidate_ids if doc_id not in seen]
+        return candidates_df.loc[ranked_ids]
+    
+    def vector_storage_report(self, queries=None, k=10):
+        """Memory/disk footprint and recall@k of the quantized store against full precision"""
+        if self.quantized_index is None:
+            return {"mode": "float32", "message": "Quantized vectors not enabled"}
+        queries = queries or [
+            "fast winger with great dribbling",
+            "clinical striker in the Premier League",
+            "young French talent under 20 million",
+        ]
+        return storage_report(self.quantized_index, self.embed_texts(queries), k=k, directory=self.db_path)
+    
+    def clean_and_validate_data(self, df=None):
+        """Enhanced data cleaning and validation (of `df`, or the current table)"""
+        df = (self.df if df is None else df).copy()
         
         # Basic cleaning
         df = df.dropna(subset=['Name'])
@@ -82,6 +272,114 @@ class FootballRAGSystem:
         print(f"🧹 Data cleaned and validated: {len(df)} players")
         return df
     
+    def prepare_dataset(self, snapshot, change=None):
+        """
+        Everything derived from one dataset snapshot, built off the event loop. A structure
+        whose input columns are unchanged since the current one was built is carried over.
+        With `change`, the vector store is brought up to date as well.
+        """
+        df = self.clean_and_validate_data(snapshot.df)
+        cleaned = DatasetSnapshot(df, snapshot.file_version)
+        state = {"df": df, "data_version": cleaned.version, "derived_versions": {}, "rebuilt": []}
+        
+        def derive(name, columns, build):
+            version = cleaned.columns_version(columns)
+            state["derived_versions"][name] = version
+            if self.derived_versions.get(name) == version:
+                state[name] = getattr(self, name)
+                return
+            start = time.perf_counter()
+            state[name] = build()
+            state["rebuilt"].append(name)
+            print(f"🔁 {name} built in {(time.perf_counter() - start) * 1000:.0f}ms")
+        
+        # Name -> row hash index for player lookups
+        derive("player_index", INDEX_COLUMNS, lambda: PlayerIndex(df))
+        # Lexical index over player documents and play-style traits
+        derive("lexical_index", LEXICAL_COLUMNS, lambda: self.build_lexical_index(df))
+        # Pearson/Spearman matrix shared with the API and the prompt notes
+        numeric = df.select_dtypes(include="number").columns
+        derive("correlations", numeric, lambda: get_correlations(df, (cleaned.columns_version(numeric), "all")))
+        
+        if change is not None and self.collection is not None:
+            state["vectors"] = self.sync_vector_store(change)
+        return state
+    
+    def apply_dataset(self, state):
+        """
+        Swap in a prepared dataset. Plain assignments with no await in between, so code on
+        the event loop sees either the old structures or the new ones, never a mix.
+        """
+        self.df = state["df"]
+        self.data_version = state["data_version"]
+        self.player_index = state["player_index"]
+        self.lexical_index = state["lexical_index"]
+        self.correlations = state["correlations"]
+        self.derived_versions = state["derived_versions"]
+        if state.get("quantized_index") is not None:
+            self.quantized_index = state["quantized_index"]
+    
+    def sync_vector_store(self, change):
+        """
+        Re-embed and upsert only the players a change added or whose document columns changed,
+        and delete removed ones (ids are player_<row index>, as in setup_vectordb.py). The
+        quantized store, if enabled, is rebuilt from the collection and returned via the state.
+        """
+        stale = change.changed_rows(DOCUMENT_COLUMNS).union(change.added)
+        removed = [f"player_{idx}" for idx in change.removed]
+        if removed:
+            self.collection.delete(ids=removed)
+        
+        players = change.new.df.loc[stale]
+        for i in range(0, len(players), VECTOR_SYNC_BATCH):
+            batch = players.iloc[i:i + VECTOR_SYNC_BATCH]
+            documents = [player_document(player) for _, player in batch.iterrows()]
+            self.collection.upsert(
+                ids=[f"player_{idx}" for idx in batch.index],
+                documents=documents,
+                metadatas=[player_metadata(player) for _, player in batch.iterrows()],
+                embeddings=self.embed_texts(documents)
+            )
+        
+        result = {"upserted": len(stale), "deleted": len(removed)}
+        if self.quantized_index is not None and (len(stale) or removed):
+            stored = self.collection.get(include=["embeddings"])
+            index = QuantizedIndex.build(stored["ids"], stored["embeddings"], self.quantized_index.mode)
+            index.save(self.db_path)
+            result["quantized_index"] = QuantizedIndex.load(self.db_path, index.mode, self.fetch_embeddings)
+        print(f"📚 Vector store synced: {result['upserted']} upserted, {result['deleted']} deleted")
+        return result
+    
+    async def reload_dataset(self, force=False):
+        """
+        Pick up a changed CSV (force: re-read and diff even if size/mtime look unchanged).
+        Derived structures are rebuilt in a worker thread and swapped in together; if that
+        fails the watcher goes back to the old snapshot so the next check retries.
+        """
+        async with self.reload_lock:
+            start = time.perf_counter()
+            change = await asyncio.to_thread(self.watcher.check, force)
+            if change is None:
+                return {"reloaded": False, "version": self.data_version}
+            try:
+                state = await asyncio.to_thread(self.prepare_dataset, change.new, change)
+            except Exception:
+                self.watcher.revert(change)
+                raise
+            vectors = state.get("vectors", {})
+            state["quantized_index"] = vectors.pop("quantized_index", None)
+            self.apply_dataset(state)
+            self.last_reload = {
+                "reloaded": True,
+                "version": self.data_version,
+                "changes": change.summary(),
+                "rebuilt": state["rebuilt"],
+                "vectors": vectors,
+                "seconds": round(time.perf_counter() - start, 3)
+            }
+            print(f"✅ Dataset swapped in ({len(self.df)} players), rebuilt: {', '.join(state['rebuilt']) or 'nothing'}")
+            return self.last_reload
+    
     def detect_query_type(self, query):
         """Advanced query type detection"""
         query_lower = query.lower()
@@ -145,33 +443,23 @@ class FootballRAGSystem:
         """Extract nationality filters with better matching"""
         query_lower = query.lower()
         
-        nationality_map = {
-            'french': ['france', 'fra'],
-            'france': ['france', 'fra'],
-            'brazilian': ['brazil', 'bra'],
-            'brazil': ['brazil', 'bra'],
-            'argentinian': ['argentina', 'arg'],
-            'argentina': ['argentina', 'arg'],
-            'spanish': ['spain', 'esp'],
-            'spain': ['spain', 'esp'],
-            'english': ['england', 'eng'],
-            'england': ['england', 'eng'],
-            'german': ['germany', 'ger'],
-            'germany': ['germany', 'ger'],
-            'italian': ['italy', 'ita'],
-            'italy': ['italy', 'ita'],
-            'portuguese': ['portugal', 'por'],
-            'portugal': ['portugal', 'por'],
-            'dutch': ['netherlands', 'ned'],
-            'netherlands': ['netherlands', 'ned']
-        }
         
-        for keyword, country_codes in nationality_map.items():
+        for keyword, country_codes in NATIONALITY_MAP.items():
             if keyword in query_lower:
                 return country_codes
         
         return None
     
+    def hard_filter_terms(self, query):
+        """Query phrases consumed by the nationality and league filters (the first match of each, as applied)"""
+        query_lower = query.lower()
+        terms = []
+        for table in (NATIONALITY_MAP, LEAGUE_FILTERS):
+            keyword = next((k for k in table if k in query_lower), None)
+            if keyword:
+                terms.append(keyword)
+        return terms
+    
     def extract_price_threshold(self, query):
         """Extract price thresholds from query"""
         query_lower = query.lower()
@@ -265,18 +553,13 @@ class FootballRAGSystem:
         if 'better' in query_lower or 'vs' in query_lower or 'compare' in query_lower:
             comparison_players = self.extract_players_for_comparison(query)
             if comparison_players:
-                # Create pattern for all comparison players
-                patterns = []
+                # Token lookups in the player index instead of regex scans over every name
+                rows = []
                 for player in comparison_players:
-                    if player == 'luis diaz':
-                        patterns.append(r'luis.*d[ií]az')
-                    elif player == 'mbeumo':
-                        patterns.append(r'mb[eu]umo')
-                    else:
-                        patterns.append(player.replace(' ', '.*'))
-                
-                combined_pattern = '|'.join(patterns)
-                matched_df = df[df['Name'].str.lower().str.contains(combined_pattern, case=False, na=False)]
+                    rows.extend(sorted(self.player_index.with_tokens(player)))
+                # Full names written out in the query that the alias table does not know
+                rows.extend(self.player_index.find_in_text(query))
+                matched_df = df.loc[list(dict.fromkeys(rows))]
                 print(f"🔍 After comparison filter ({comparison_players}): {len(matched_df)} players")
                 
                 if matched_df.empty:
@@ -308,17 +591,8 @@ class FootballRAGSystem:
             print(f"👶 After age filter (<{age_threshold}): {len(df)} players")
         
         # Apply league filtering
-        league_filters = {
-            'premier league': 'Premier League',
-            'premier': 'Premier League',
-            'la liga': 'La Liga',
-            'laliga': 'La Liga',
-            'serie a': 'Serie A',
-            'bundesliga': 'Bundesliga',
-            'ligue 1': 'Ligue 1'
-        }
         
-        for keyword, league_name in league_filters.items():
+        for keyword, league_name in LEAGUE_FILTERS.items():
             if keyword in query_lower:
                 df = df[df['League'].str.contains(league_name, case=False, na=False)]
                 print(f"🏆 After {league_name} filter: {len(df)} players")
@@ -339,6 +613,14 @@ class FootballRAGSystem:
             df = df[df['Position'].str.contains('ST|CF|LW|RW', case=False, na=False)]
             print(f"🎯 After finisher position filter: {len(df)} players")
         
+        # Apply play-style filtering (e.g. "Finesse Shot", "Press Proven"); one-word traits only when
+        # named explicitly, otherwise "rapid" or "technical" is soft intent for hybrid_rank
+        play_styles = self.lexical_index.filter_traits(query) if self.lexical_index else []
+        if play_styles:
+            styled_ids = self.lexical_index.docs_with_traits(play_styles)
+            df = df[df.index.isin(styled_ids)]
+            print(f"🎨 After play style filter ({play_styles}): {len(df)} players")
+        
         # ENHANCED FALLBACK LOGIC
         main_results = df.copy()
         suggestions = pd.DataFrame()
@@ -409,9 +691,18 @@ class FootballRAGSystem:
         elif 'cheapest' in query_lower:
             main_results = main_results.nsmallest(15, 'market_value')
             suggestions = suggestions.nsmallest(3, 'market_value')
+        elif 'valuable' in query_lower or 'expensive' in query_lower:
+            main_results = self.sort_with_fallback(main_results, 'market_value', ascending=False)
+            suggestions = self.sort_with_fallback(suggestions, 'market_value', ascending=False)
         elif 'talent' in query_lower or 'potential' in query_lower:
             main_results = self.sort_with_fallback(main_results, 'OVR', ascending=False)
             suggestions = self.sort_with_fallback(suggestions, 'OVR', ascending=False)
+        elif self.lexical_index and not main_results.empty and self.lexical_index.soft_terms(query):
+            # Soft intent ("creative", "explosive", play styles): hybrid lexical + dense ranking
+            start = time.perf_counter()
+            main_results = self.hybrid_rank(query, main_results).head(15)
+            suggestions = self.sort_with_fallback(suggestions, 'OVR', ascending=False)
+            print(f"🔀 Hybrid ranking on {self.lexical_index.soft_terms(query)} in {(time.perf_counter() - start) * 1000:.1f}ms")
         else:
             # Default sort by overall rating
             main_results = self.sort_with_fallback(main_results, 'OVR', ascending=False)
@@ -430,6 +721,31 @@ class FootballRAGSystem:
             print(f"⚠️ Column {column} not found, falling back to OVR")
             return df.nlargest(15, 'OVR')
     
+    def correlation_notes(self, query):
+        """Dataset-wide correlation facts for the attributes a relationship question mentions"""
+        query_lower = query.lower()
+        if not re.search(r'correlat|relationship|relate|linked|trade-?off|go together', query_lower):
+            return ""
+        mentioned = [col for col, words in ATTRIBUTE_WORDS.items()
+                     if col in self.correlations.columns and any(re.search(rf'\b{w}\b', query_lower) for w in words)]
+        if len(mentioned) >= 2:
+            pairs = [(a, b, self.correlations.pair(a, b)) for i, a in enumerate(mentioned) for b in mentioned[i + 1:]]
+        elif mentioned:
+            # One attribute: its strongest relationships with the other attributes
+            others = [c for c in ATTRIBUTE_WORDS if c in self.correlations.columns and c != mentioned[0]]
+            pairs = sorted(((mentioned[0], b, self.correlations.pair(mentioned[0], b)) for b in others),
+                           key=lambda item: -abs(item[2]["r"]))[:5]
+        else:
+            pairs = self.correlations.strongest_pairs(list(ATTRIBUTE_WORDS), top_n=5)
+        lines = ["DATASET CORRELATIONS (all forwards, Pearson r):"]
+        for a, b, stats in pairs:
+            lines.append(f"- {a} vs {b}: r={stats['r']:.2f} ({stats['strength'].lower()}, p={stats['p']:.2g}, n={stats['n']})")
+        return "\n".join(lines) + "\n"
+    
+    def correlation_report(self, columns=None, method="pearson"):
+        """Correlation matrix with p-values and pairwise counts for the API"""
+        return self.correlations.to_dict(columns, method)
+    
     def convert_stats_to_text(self, player):
         """Enhanced stat conversion with better descriptions"""
         descriptions = {}
@@ -492,109 +808,119 @@ class FootballRAGSystem:
         
         return comparison
     
-    async def call_enhanced_llm(self, context, suggestions_context, comparison_table, query, query_type, has_price_threshold, has_nationality_filter):
-        """Enhanced LLM call with advanced prompting"""
+    async def call_enhanced_llm(self, prompt, num_predict=650):
+        """Stream the LLM response and record time-to-first-token"""
+        start = time.perf_counter()
+        first_token_at = None
+        chunks = []
+        final = {}
         
-        if query_type == "singular":
-            prompt = f"""You are a professional football scout. Based on the data below, identify and analyze THE SINGLE BEST player that matches the user's query.
-
-CRITICAL RULES:
-- Focus on ONE player only (the top player in the main results)
-- Use the qualitative descriptions provided (never show raw numbers for pace/shooting/physical/passing/dribbling)
-- Show exact numbers ONLY for: Age, Market Value (€M), Overall Rating (/100)
-- Be detailed and professional like a real scout report
-- If suggestions are provided, mention them at the end
-
-Main Results:
-{context}
-
-{suggestions_context if suggestions_context else ""}
-
-Question: {query}
-
-Professional Scout Analysis:"""
-
-        elif query_type == "comparison":
-            prompt = f"""You are a professional football scout. Compare ALL the players provided in the data below.
-
-CRITICAL RULES:
-- Compare each player's strengths and weaknesses point by point
-- Use the qualitative descriptions provided (never show raw numbers for pace/shooting/physical/passing/dribbling)
-- Show exact numbers ONLY for: Age, Market Value (€M), Overall Rating (/100)
-- Use the comparison table provided to structure your analysis
-- Give a clear final recommendation with reasoning
-
-{comparison_table}
-
-Detailed Player Data:
-{context}
-
-Question: {query}
-
-Professional Comparison Analysis:"""
-
-        else:  # plural
-            no_matches_context = ""
-            if has_nationality_filter and "No players found with strict criteria" in suggestions_context:
-                no_matches_context = f"""
-IMPORTANT: No players were found matching the exact nationality criteria. The suggestions below are alternative options that might interest the user.
-"""
-            
-            prompt = f"""You are a professional football scout. Analyze the TOP players from the data below that match the user's query.
-
-CRITICAL RULES:
-- Present MULTIPLE players in ranked order (start with #1, #2, #3, etc.)
-- Use the qualitative descriptions provided (never show raw numbers for pace/shooting/physical/passing/dribbling)
-- Show exact numbers ONLY for: Age, Market Value (€M), Overall Rating (/100)
-- Be detailed for each player with tactical insights
-- If no exact matches were found, clearly explain this and present alternatives
-{f"- Include suggestions section at the end labeled 'ALTERNATIVE OPTIONS'" if suggestions_context else ""}
-
-{no_matches_context}
-
-Main Results:
-{context}
-
-{suggestions_context if suggestions_context else ""}
-
-Question: {query}
-
-Professional Scout Analysis:"""
-
         try:
             response = requests.post(
-                "http://localhost:11434/api/generate",
+                f"{OLLAMA_URL}/api/generate",
                 json={
-                    "model": "qwen2.5:7b",
+                    "model": OLLAMA_MODEL,
                     "prompt": prompt,
-                    "stream": False,
+                    "stream": True,
+                    "keep_alive": "30m",  # keep the model and its prompt cache warm
                     "options": {
                         "temperature": 0.2,  # Lower for more consistent responses
                         "top_p": 0.85,
                         "top_k": 35,
-                        "num_predict": 900,  # Increased for comprehensive responses
+                        "num_predict": num_predict,
                         "stop": []
                     }
                 },
+                stream=True,
                 timeout=75
             )
             
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("response", "No response generated").strip()
-            else:
+            if response.status_code != 200:
                 return f"Error: LLM returned status {response.status_code}"
-                
+            
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("response"):
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    chunks.append(chunk["response"])
+                if chunk.get("done"):
+                    final = chunk
+                    break
         except Exception as e:
             return f"Error calling LLM: {str(e)}"
+        
+        total = time.perf_counter() - start
+        self.last_llm_timing = {
+            "ttft_ms": (first_token_at - start) * 1000 if first_token_at else None,
+            "total_ms": total * 1000,
+            "prompt_eval_count": final.get("prompt_eval_count"),
+            "prompt_eval_ms": final.get("prompt_eval_duration", 0) / 1e6,
+            "eval_count": final.get("eval_count"),
+        }
+        if first_token_at:
+            print(f"⏱️ LLM: TTFT {self.last_llm_timing['ttft_ms']:.0f}ms, total {total * 1000:.0f}ms, "
+                  f"prompt tokens {final.get('prompt_eval_count', '?')}")
+        
+        return "".join(chunks).strip() or "No response generated"
+    
+    def _generate_sync(self, prompt, num_predict):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.call_enhanced_llm(prompt, num_predict=num_predict))
+        finally:
+            loop.close()
     
-    async def process_query(self, query: str) -> dict:
-        """Enhanced query processing with production-grade features"""
+    def start_enrichment(self, prompt, num_predict):
+        """Generate LLM prose for a template answer in the background, returns an enrichment id"""
+        enrichment_id = uuid.uuid4().hex
+        self.enrichments[enrichment_id] = self.enrichment_executor.submit(self._generate_sync, prompt, num_predict)
+        while len(self.enrichments) > self.max_enrichments:
+            self.enrichments.popitem(last=False)
+        return enrichment_id
+    
+    def get_enrichment(self, enrichment_id):
+        """Status of a background enrichment: unknown, pending or done (with the answer)"""
+        future = self.enrichments.get(enrichment_id)
+        if future is None:
+            return {"status": "unknown"}
+        if not future.done():
+            return {"status": "pending"}
+        try:
+            return {"status": "done", "answer": future.result()}
+        except Exception as e:
+            return {"status": "done", "answer": f"Error calling LLM: {str(e)}"}
+    
+    def build_answer_prompt(self, query_type, query, main_players, suggestions, comparison_table, suggestions_header):
+        """Token-budgeted prompt: static instructions first, then compact player data"""
+        return build_prompt(
+            query_type,
+            query,
+            main_players,
+            suggestions,
+            self.convert_stats_to_text,
+            comparison_table=comparison_table,
+            suggestions_header=suggestions_header,
+            notes=self.correlation_notes(query),
+            context_budget=self.context_budget
+        )
+    
+    @profiled("process_query")
+    async def process_query(self, query: str, mode: str = "auto", enrich: bool = False) -> dict:
+        """Enhanced query processing with production-grade features
+        
+        mode: "auto" answers simple lookups from a template and the rest with the LLM,
+        "template" / "llm" force one path. enrich=True schedules LLM prose for
+        template answers in the background (see get_enrichment).
+        """
         print(f"🔍 Processing: {query}")
         
         # Detect query type
         query_type = self.detect_query_type(query)
-        print(f"📝 Type: {query_type}")
+        answer_mode = classify_query(query, query_type, self.hard_filter_terms(query)) if mode == "auto" else mode
+        print(f"📝 Type: {query_type}, answer mode: {answer_mode}")
         
         # Apply comprehensive filtering
         main_results, suggestions = self.apply_comprehensive_filtering(query)
@@ -621,83 +947,55 @@ Professional Scout Analysis:"""
                 
                 return {
                     "answer": fallback_msg,
-                    "sources": []
+                    "sources": [],
+                    "mode": "template"
                 }
         
         print(f"✅ Found {len(main_results)} main results, {len(suggestions)} suggestions")
         
-        # Create rich context
-        context = ""
-        sources = []
-        
         max_players = 1 if query_type == "singular" else min(8, len(main_results))
+        main_players = main_results.head(max_players)
+        sources = main_players['Name'].tolist()
         
-        for idx, (_, player) in enumerate(main_results.head(max_players).iterrows()):
-            stats = self.convert_stats_to_text(player)
-            
-            context += f"Player {idx + 1}: {player['Name']}\n"
-            context += f"- Team: {player.get('Team', 'Unknown')} ({player.get('League', 'Unknown')})\n"
-            context += f"- Age: {int(player.get('Age', 25))} years\n"
-            context += f"- Position: {player.get('Position', 'Unknown')}\n"
-            context += f"- Nation: {player.get('Nation', 'Unknown')}\n"
-            context += f"- Market Value: €{player.get('market_value', 0):.1f}M\n"
-            context += f"- Overall Rating: {player.get('OVR', 75):.1f}/100\n"
-            
-            for stat_name, description in stats.items():
-                context += f"- {stat_name.title()}: {description}\n"
-            
-            if 'play style' in player.index and pd.notna(player['play style']):
-                context += f"- Play Style: {player['play style']}\n"
-            
-            context += f"\n"
-            sources.append(player['Name'])
-        
-        # Create suggestions context
-        suggestions_context = ""
-        if not suggestions.empty:
-            has_price_threshold = self.extract_price_threshold(query) is not None
-            has_nationality_filter = self.extract_nationality_filter(query) is not None
-            
-            if has_price_threshold:
-                suggestions_context += "\n\nSLIGHTLY OVER BUDGET OPTIONS:\n"
-            elif has_nationality_filter:
-                suggestions_context += "\n\nALTERNATIVE OPTIONS (different criteria):\n"
-            else:
-                suggestions_context += "\n\nADDITIONAL SUGGESTIONS:\n"
-            
-            for idx, (_, player) in enumerate(suggestions.iterrows()):
-                stats = self.convert_stats_to_text(player)
-                
-                suggestions_context += f"Option {idx + 1}: {player['Name']}\n"
-                suggestions_context += f"- Team: {player.get('Team', 'Unknown')} ({player.get('League', 'Unknown')})\n"
-                suggestions_context += f"- Age: {int(player.get('Age', 25))} years\n"
-                suggestions_context += f"- Position: {player.get('Position', 'Unknown')}\n"
-                suggestions_context += f"- Nation: {player.get('Nation', 'Unknown')}\n"
-                suggestions_context += f"- Market Value: €{player.get('market_value', 0):.1f}M\n"
-                suggestions_context += f"- Overall Rating: {player.get('OVR', 75):.1f}/100\n"
-                
-                for stat_name, description in stats.items():
-                    suggestions_context += f"- {stat_name.title()}: {description}\n"
-                
-                suggestions_context += f"\n"
+        has_price_threshold = self.extract_price_threshold(query) is not None
+        has_nationality_filter = self.extract_nationality_filter(query) is not None
+        
+        if has_price_threshold:
+            suggestions_header = "SLIGHTLY OVER BUDGET OPTIONS:"
+        elif has_nationality_filter:
+            suggestions_header = "ALTERNATIVE OPTIONS (different criteria):"
+        else:
+            suggestions_header = "ADDITIONAL SUGGESTIONS:"
         
         # Create comparison table for comparison queries
         comparison_table = ""
         if query_type == "comparison":
             comparison_table = self.create_comparison_table(main_results)
         
+        self.answer_mode_counts[answer_mode] += 1
+        
+        if answer_mode == "template":
+            # Deterministic answer straight from the filtered, sorted table
+            answer = render_template_answer(
+                query, query_type, main_results, suggestions, self.convert_stats_to_text, suggestions_header
+            )
+            result = {"answer": answer, "sources": sources[:5], "mode": "template"}
+            if enrich:
+                prompt, prompt_info = self.build_answer_prompt(query_type, query, main_players, suggestions,
+                                                               comparison_table, suggestions_header)
+                result["enrichment_id"] = self.start_enrichment(prompt, prompt_info["num_predict"])
+            return result
+        
+        prompt, prompt_info = self.build_answer_prompt(query_type, query, main_players, suggestions,
+                                                       comparison_table, suggestions_header)
+        print(f"🧾 Prompt ~{prompt_info['prompt_tokens_estimate']} tokens "
+              f"({prompt_info['main_players']} players, {prompt_info['main_encoding']} encoding)")
+        
         # Call enhanced LLM
-        response = await self.call_enhanced_llm(
-            context, 
-            suggestions_context, 
-            comparison_table,
-            query, 
-            query_type, 
-            self.extract_price_threshold(query) is not None,
-            self.extract_nationality_filter(query) is not None
-        )
+        response = await self.call_enhanced_llm(prompt, num_predict=prompt_info["num_predict"])
         
         return {
             "answer": response,
-            "sources": sources[:5]
+            "sources": sources[:5],
+            "mode": "llm"
         }
@@ -0,0 +1,91 @@
+# backend/template_answers.py - DETERMINISTIC ANSWERS FOR LOOKUPS THE DATAFRAME ALREADY ANSWERS
+import re
+
+import pandas as pd
+
+# Phrases that ask for judgement or prose rather than a ranked list
+LLM_PATTERNS = [
+    r'\bwhy\b', r'\bexplain\b', r'\banaly[sz]', r'\brecommend', r'\bshould\b', r'\badvice\b',
+    r'\btell me about\b', r'\bdescribe\b', r'\breport\b', r'\bstrengths?\b', r'\bweakness',
+    r'\bsimilar\b', r'\breplace', r'\bfit\b', r'\btactic', r'\bcompare\b', r'\bbetter\b',
+    r'\bvs\b', r'\bversus\b', r'\bpotential\b', r'correlat', r'\brelationship\b'
+]
+
+# Sort keywords the filtering stage understands, mapped to the column shown in the answer
+SORT_COLUMNS = [
+    ('fastest', 'PACE', "⚡"),
+    ('strongest', 'PHYSICAL', "💪"),
+    ('finisher', 'SHOOTING', "🎯"),
+    ('finishing', 'SHOOTING', "🎯"),
+    ('cheapest', 'market_value', "💸"),
+    ('valuable', 'market_value', "💰"),
+    ('expensive', 'market_value', "💰"),
+]
+
+# Age and price thresholds ("under €20M", "below 23", "23 and under"): only the upper bounds
+# extract_price_threshold/extract_age_threshold apply, so "over 30" is left over and goes to the LLM
+THRESHOLD_RE = re.compile(
+    r'\b(?:under|below|less than|up to|maximum|max)\s*€?\d+(?:\.\d+)?\s*(?:m|million|k)?\b'
+    r'|\b\d+\s*and under\b'
+)
+WORD_RE = re.compile(r"[a-z]+")
+
+# Words a lookup may contain besides its filters and sort keyword: question scaffolding and positions
+LOOKUP_WORDS = {
+    "a", "all", "an", "and", "any", "are", "best", "currently", "find", "for", "from", "give", "highest",
+    "in", "is", "league", "list", "me", "most", "of", "on", "overall", "player", "players", "rated", "show",
+    "the", "there", "top", "what", "which", "who", "with",
+    "forward", "forwards", "striker", "strikers", "winger", "wingers",
+    "young", "talent", "talents", "age", "aged", "old", "years", "value", "market", "rating", "ovr",
+}
+
+
+def classify_query(query, query_type, filter_terms=()):
+    """
+    'template' only for a recognised lookup: a sort keyword or hard filters (`filter_terms`
+    from the nationality/league filters, age, price), with nothing left over but question
+    scaffolding. Any other wording carries intent a ranked list cannot answer: 'llm'.
+    """
+    query_lower = query.lower()
+    if query_type == "comparison":
+        return "llm"
+    if any(re.search(pattern, query_lower) for pattern in LLM_PATTERNS):
+        return "llm"
+    sorted_by = any(word in query_lower for word, _, _ in SORT_COLUMNS)
+    rest = query_lower
+    for term in filter_terms:
+        rest = rest.replace(term, " ")
+    rest, thresholds = THRESHOLD_RE.subn(" ", rest)
+    if not (sorted_by or filter_terms or thresholds):
+        return "llm"
+    leftover = [w for w in WORD_RE.findall(rest)
+                if w not in LOOKUP_WORDS and not any(w.startswith(word) for word, _, _ in SORT_COLUMNS)]
+    return "llm" if leftover else "template"
+
+
+def render_template_answer(query, query_type, main_results, suggestions, stats_fn, suggestions_header=""):
+    """Markdown answer in the same shape as utils.format_results"""
+    query_lower = query.lower()
+    highlight = next(((col, icon) for word, col, icon in SORT_COLUMNS if word in query_lower), (None, "🏆"))
+    column, icon = highlight
+    limit = 1 if query_type == "singular" else 10
+
+    md = f"## {icon} {query.strip().rstrip('?')}\n\n"
+    for i, (_, player) in enumerate(main_results.head(limit).iterrows(), 1):
+        stats = stats_fn(player)
+        md += (f"**{i}. {player['Name']}** ({player.get('Team', 'Unknown')})  \n"
+               f"• League: {player.get('League', 'Unknown')} | Age: {int(player.get('Age', 25))} | "
+               f"Position: {player.get('Position', 'Unknown')}  \n"
+               f"• OVR: {player.get('OVR', 0):.1f}/100 | Value: €{player.get('market_value', 0):.1f}M  \n")
+        if column and column.lower() in stats:
+            md += f"• {column.title()}: {stats[column.lower()]}  \n"
+        if 'play style' in player.index and pd.notna(player['play style']):
+            md += f"• Play Style: {player['play style']}  \n"
+        md += "\n"
+
+    if not suggestions.empty:
+        md += f"**{suggestions_header or 'ADDITIONAL SUGGESTIONS:'}**\n\n"
+        for _, player in suggestions.iterrows():
+            md += (f"• **{player['Name']}** ({player.get('Team', 'Unknown')}) - "
+                   f"€{player.get('market_value', 0):.1f}M, OVR {player.get('OVR', 0):.1f}/100\n")
+    return md
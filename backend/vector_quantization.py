@@ -0,0 +1,210 @@
+# backend/vector_quantization.py - COMPACT INT8 / BINARY VECTOR STORAGE WITH FLOAT RE-RANK
+import os
+
+import numpy as np
+
+QUANTIZATION_MODES = ("int8", "binary")
+
+# Float32 copy of every vector that earlier versions saved beside the codes; removed on save
+LEGACY_FLOAT32_FILE = "embeddings_f32.npy"
+
+# Binary codes are much coarser, so they need a wider candidate pool before re-rank
+DEFAULT_RERANK_FACTOR = {"int8": 4, "binary": 10}
+
+# Number of set bits for every possible byte, used for Hamming distances
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def normalize(vectors):
+    """L2-normalise rows so dot products equal cosine similarity"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def quantize_int8(vectors):
+    """Symmetric per-vector int8 quantisation, returns (codes, scales)"""
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def quantize_binary(vectors):
+    """One sign bit per dimension, packed 8 dimensions per byte"""
+    return np.packbits(vectors > 0, axis=1)
+
+
+def _staging_path(path):
+    """'x.npz' -> 'x.tmp.npz' (numpy appends the extension when it is missing)"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.tmp{ext}"
+
+
+def recall_at_k(exact_ids, approx_ids, k):
+    """Fraction of the exact top-k that the approximate search also returned"""
+    exact = set(list(exact_ids)[:k])
+    if not exact:
+        return 1.0
+    return len(exact & set(list(approx_ids)[:k])) / len(exact)
+
+
+class QuantizedIndex:
+    """Brute-force vector index over int8 or binary codes.
+
+    Only the compact codes are saved and kept in memory. The re-rank reads the
+    full-precision vectors of its candidates through `fetch_vectors(ids)` (the
+    Chroma collection, which stores them anyway), or from `full_vectors` when the
+    index was just built from them.
+    """
+
+    def __init__(self, ids, mode, codes, scales=None, full_vectors=None, fetch_vectors=None):
+        if mode not in QUANTIZATION_MODES:
+            raise ValueError(f"Unsupported quantization mode: {mode}")
+        self.ids = np.asarray(ids)
+        self.mode = mode
+        self.codes = codes
+        self.scales = scales
+        self.full_vectors = full_vectors
+        self.fetch_vectors = fetch_vectors
+
+    @classmethod
+    def build(cls, ids, vectors, mode):
+        vectors = normalize(vectors)
+        if mode == "int8":
+            codes, scales = quantize_int8(vectors)
+            return cls(ids, mode, codes, scales, vectors)
+        return cls(ids, mode, quantize_binary(vectors), None, vectors)
+
+    @staticmethod
+    def path(directory, mode):
+        return os.path.join(directory, f"quantized_{mode}.npz")
+
+    def save(self, directory):
+        # Written beside the target and renamed over it, so a concurrent load never sees half a file
+        codes_path = self.path(directory, self.mode)
+        arrays = {"ids": self.ids.astype(str), "codes": self.codes}
+        if self.scales is not None:
+            arrays["scales"] = self.scales
+        np.savez(_staging_path(codes_path), **arrays)
+        os.replace(_staging_path(codes_path), codes_path)
+        # Float32 copy written by earlier versions; Chroma already holds these vectors
+        legacy_path = os.path.join(directory, LEGACY_FLOAT32_FILE)
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
+        return codes_path
+
+    @classmethod
+    def load(cls, directory, mode, fetch_vectors=None):
+        data = np.load(cls.path(directory, mode))
+        return cls(data["ids"], mode, data["codes"], data["scales"] if "scales" in data else None,
+                   fetch_vectors=fetch_vectors)
+
+    @staticmethod
+    def exists(directory, mode):
+        return os.path.exists(QuantizedIndex.path(directory, mode))
+
+    def vectors_for(self, rows):
+        """Normalised full-precision vectors of these rows, or None when there is no source"""
+        if self.full_vectors is not None:
+            return np.asarray(self.full_vectors[rows])
+        if self.fetch_vectors is not None:
+            return normalize(self.fetch_vectors(self.ids[rows].tolist()))
+        return None
+
+    def approximate_scores(self, query):
+        """Similarity of every stored vector to the query using only the compact codes"""
+        query = normalize(np.atleast_2d(query))[0]
+        if self.mode == "int8":
+            return (self.codes.astype(np.float32) @ query) * self.scales
+        query_bits = quantize_binary(query[None, :])[0]
+        hamming = _POPCOUNT[np.bitwise_xor(self.codes, query_bits)].sum(axis=1, dtype=np.int32)
+        return 1.0 - hamming / (self.codes.shape[1] * 8)
+
+    def search(self, query, k=10, rerank_factor=None):
+        """Top-k (id, cosine similarity) with a float re-rank over k * rerank_factor candidates"""
+        rerank_factor = rerank_factor or DEFAULT_RERANK_FACTOR[self.mode]
+        scores = self.approximate_scores(query)
+        n_candidates = min(len(scores), max(k, k * rerank_factor))
+        candidates = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+
+        vectors = self.vectors_for(candidates)
+        if vectors is not None:
+            candidate_scores = vectors @ normalize(np.atleast_2d(query))[0]
+        else:
+            candidate_scores = scores[candidates]
+
+        order = np.argsort(-candidate_scores)[:k]
+        return [(str(self.ids[candidates[i]]), float(candidate_scores[i])) for i in order]
+
+    def footprint(self):
+        """In-memory size of the compact codes vs. the same vectors as float32"""
+        n, dim = len(self.ids), (self.full_vectors.shape[1] if self.full_vectors is not None else None)
+        if dim is None:
+            dim = self.codes.shape[1] * (8 if self.mode == "binary" else 1)
+        code_bytes = self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+        float_bytes = n * dim * 4
+        return {
+            "mode": self.mode,
+            "vectors": n,
+            "dimensions": dim,
+            "float32_bytes": float_bytes,
+            "quantized_bytes": code_bytes,
+            "compression_ratio": float_bytes / code_bytes if code_bytes else 0.0
+        }
+
+    def evaluate_recall(self, queries, k=10, rerank_factor=None):
+        """Mean recall@k against exact full-precision search, with and without re-rank"""
+        full = self.vectors_for(np.arange(len(self.ids)))
+        if full is None:
+            raise ValueError("Full-precision vectors are required to measure recall")
+        with_rerank, without_rerank = [], []
+        for query in normalize(queries):
+            exact = [str(self.ids[i]) for i in np.argsort(-(full @ query))[:k]]
+            approx = [str(self.ids[i]) for i in np.argsort(-self.approximate_scores(query))[:k]]
+            reranked = [pid for pid, _ in self.search(query, k, rerank_factor)]
+            without_rerank.append(recall_at_k(exact, approx, k))
+            with_rerank.append(recall_at_k(exact, reranked, k))
+        return {
+            f"recall@{k}": float(np.mean(with_rerank)),
+            f"recall@{k}_no_rerank": float(np.mean(without_rerank)),
+            "queries": len(with_rerank)
+        }
+
+
+def directory_bytes(directory, exclude=()):
+    total = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            if path not in exclude:
+                total += os.path.getsize(path)
+    return total
+
+
+def storage_report(index, queries, k=10, directory=None):
+    """
+    Footprint (memory and, given the vector DB directory, disk) plus recall@k against full
+    precision. On disk the codes come on top of the Chroma store, which keeps its float32
+    vectors (used for the re-rank): disk_total_bytes is both.
+    """
+    report = index.footprint()
+    if directory:
+        codes_path = index.path(directory, index.mode)
+        report["disk_quantized_bytes"] = os.path.getsize(codes_path) if os.path.exists(codes_path) else 0
+        codes_paths = {index.path(directory, mode) for mode in QUANTIZATION_MODES}
+        report["disk_chroma_bytes"] = directory_bytes(directory, exclude=codes_paths)
+        report["disk_total_bytes"] = report["disk_quantized_bytes"] + report["disk_chroma_bytes"]
+    report.update(index.evaluate_recall(queries, k=k))
+    return report
+
+
+def format_storage_report(report):
+    k_key = next(key for key in report if key.startswith("recall@") and not key.endswith("no_rerank"))
+    return (f"📦 {report['mode']} vectors: {report['quantized_bytes'] / 1024:.1f} KB "
+            f"vs {report['float32_bytes'] / 1024:.1f} KB float32 ({report['compression_ratio']:.1f}x smaller), "
+            f"{k_key}={report[k_key]:.3f} with re-rank, {report[k_key + '_no_rerank']:.3f} without"
+            + (f"\n💾 On disk: {report['disk_quantized_bytes'] / 1024:.1f} KB codes on top of the "
+               f"{report['disk_chroma_bytes'] / 1024:.1f} KB Chroma store (float32 vectors used for re-rank), "
+               f"{report['disk_total_bytes'] / 1024:.1f} KB in total" if "disk_total_bytes" in report else ""))
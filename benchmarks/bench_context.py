@@ -0,0 +1,37 @@
+# benchmarks/bench_context.py - LLM CONTEXT BUILDING
+from prompt_builder import DEFAULT_CONTEXT_BUDGET, build_prompt
+from rag_fixture import BENCH_QUERIES, offline_rag
+from template_answers import render_template_answer
+
+
+def setup(df, csv_path):
+    rag = offline_rag(df)
+    cases = []
+    for query in BENCH_QUERIES:
+        main_results, suggestions = rag.apply_comprehensive_filtering(query)
+        cases.append((query, rag.detect_query_type(query), main_results, suggestions))
+    return {"rag": rag, "cases": cases}
+
+
+def _prompts(ctx, budget):
+    rag = ctx["rag"]
+    for query, query_type, main_results, suggestions in ctx["cases"]:
+        table = rag.create_comparison_table(main_results) if query_type == "comparison" else ""
+        build_prompt(query_type, query, main_results.head(8), suggestions, rag.convert_stats_to_text,
+                     comparison_table=table, suggestions_header="ADDITIONAL SUGGESTIONS:",
+                     notes=rag.correlation_notes(query), context_budget=budget)
+
+
+def time_build_prompt_budgeted(ctx):
+    _prompts(ctx, DEFAULT_CONTEXT_BUDGET)
+
+
+def time_build_prompt_unbudgeted(ctx):
+    _prompts(ctx, None)
+
+
+def time_template_answers(ctx):
+    rag = ctx["rag"]
+    for query, query_type, main_results, suggestions in ctx["cases"]:
+        render_template_answer(query, query_type, main_results, suggestions, rag.convert_stats_to_text,
+                               "ADDITIONAL SUGGESTIONS:")
@@ -0,0 +1,28 @@
+# benchmarks/bench_llm.py - MOCKED LLM ROUND-TRIP
+import asyncio
+
+from fake_ollama import FakeOllama
+from rag_fixture import offline_rag
+
+ROUND_TRIP_QUERY = "Creative wingers with Finesse Shot"
+
+
+def setup(df, csv_path):
+    rag = offline_rag(df)
+    import rag_system
+    # No artificial latency: what is left is HTTP, streaming and our own parsing/prompt code
+    fake = FakeOllama(tokens=200).start()
+    rag_system.OLLAMA_URL = fake.url
+    return {"rag": rag, "fake": fake}
+
+
+def time_llm_round_trip(ctx):
+    asyncio.run(ctx["rag"].call_enhanced_llm("Describe a fast winger. " * 200))
+
+
+def time_process_query_llm(ctx):
+    asyncio.run(ctx["rag"].process_query(ROUND_TRIP_QUERY, mode="llm"))
+
+
+def teardown(ctx):
+    ctx["fake"].stop()
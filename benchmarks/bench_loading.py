@@ -0,0 +1,32 @@
+# benchmarks/bench_loading.py - DATA LOADING AND STARTUP INDEXES
+import pandas as pd
+
+from harness import SkipBenchmark
+from percentiles import PercentileCube
+from player_index import PlayerIndex
+
+
+def setup(df, csv_path):
+    return {"df": df, "csv": csv_path}
+
+
+def time_read_csv(ctx):
+    pd.read_csv(ctx["csv"])
+
+
+def time_player_index(ctx):
+    PlayerIndex(ctx["df"])
+
+
+def time_percentile_cube(ctx):
+    PercentileCube.build(ctx["df"])
+
+
+def time_clean_and_validate(ctx):
+    try:
+        from rag_system import FootballRAGSystem
+    except ImportError as e:
+        raise SkipBenchmark(f"backend dependencies missing ({e})")
+    rag = FootballRAGSystem()
+    rag.df = ctx["df"]
+    rag.clean_and_validate_data()
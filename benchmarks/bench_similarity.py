@@ -0,0 +1,25 @@
+# benchmarks/bench_similarity.py - SIMILARITY FINDER
+from player_index import PlayerIndex
+from similarity import get_top_similar_forwards, prepare_similarity_data
+
+# A handful of fixed targets so every run ranks the same players
+TARGETS = 5
+
+
+def setup(df, csv_path):
+    forwards_scaled, X_fw = prepare_similarity_data.__wrapped__(df)
+    name_to_idx = PlayerIndex(forwards_scaled).positions
+    step = max(len(forwards_scaled) // TARGETS, 1)
+    targets = forwards_scaled["Name"].iloc[::step].head(TARGETS).tolist()
+    return {"scaled": forwards_scaled, "X": X_fw, "name_to_idx": name_to_idx, "targets": targets}
+
+
+def time_top_similar(ctx):
+    for name in ctx["targets"]:
+        get_top_similar_forwards(name, ctx["scaled"], ctx["X"], ctx["name_to_idx"], top_n=10)
+
+
+def time_top_similar_ovr_weighted(ctx):
+    for name in ctx["targets"]:
+        get_top_similar_forwards(name, ctx["scaled"], ctx["X"], ctx["name_to_idx"], top_n=10,
+                                 include_ovr_weight=True)
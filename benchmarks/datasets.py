@@ -0,0 +1,28 @@
+# benchmarks/datasets.py - SYNTHETIC PLAYER TABLES AT BENCHMARK SIZES
+import os
+
+import pandas as pd
+
+from harness import BENCH_DIR, ROOT_DIR
+from synthetic_data import write_players
+
+SOURCE_CSV = os.path.join(ROOT_DIR, "forwards_clean_with_market_values_updated.csv")
+DATA_DIR = os.path.join(BENCH_DIR, ".data")
+
+SIZES = {"3k": 3_000, "30k": 30_000, "300k": 300_000}
+
+
+def dataset_path(size_label, seed=0):
+    return os.path.join(DATA_DIR, f"players_{size_label}_{seed}.csv")
+
+
+def load_dataset(size_label, seed=0):
+    """
+    Synthetic CSV for a size label (see synthetic_data.py), generated once and reused
+    across runs so every commit is measured on identical data; returns (df, csv path).
+    """
+    path = dataset_path(size_label, seed)
+    if not os.path.exists(path):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        write_players(path, SIZES[size_label], seed=seed, source=SOURCE_CSV)
+    return pd.read_csv(path), path
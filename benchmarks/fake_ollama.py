@@ -0,0 +1,111 @@
+# benchmarks/fake_ollama.py - MOCK OLLAMA SERVER FOR LLM ROUND-TRIP BENCHMARKS
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FAKE_WORDS = ("The forward combines pace with clinical finishing and would suit a pressing side . ").split()
+
+
+class FakeOllama:
+    """
+    Speaks the subset of the Ollama API the backend uses (/api/tags, streaming /api/generate).
+    Latency is simulated: prefill cost per prompt token, then a fixed delay per generated token,
+    so benchmarks exercise our client code without a model.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, tokens=60, token_ms=0.0, prefill_ms_per_1k=0.0):
+        self.tokens = tokens
+        self.token_ms = token_ms
+        self.prefill_ms_per_1k = prefill_ms_per_1k
+        self.requests = 0
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _json(self, payload, status=200):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._json({"models": [{"name": "fake:latest"}]})
+                else:
+                    self._json({"error": "not found"}, status=404)
+
+            def do_POST(self):
+                if self.path != "/api/generate":
+                    self._json({"error": "not found"}, status=404)
+                    return
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                fake.requests += 1
+                prompt_tokens = len(request.get("prompt", "")) // 4
+                num_predict = request.get("options", {}).get("num_predict", fake.tokens)
+                tokens = min(fake.tokens, num_predict)
+                prefill_ms = prompt_tokens / 1000 * fake.prefill_ms_per_1k
+                time.sleep(prefill_ms / 1000)
+
+                words = [FAKE_WORDS[i % len(FAKE_WORDS)] for i in range(tokens)]
+                final = {
+                    "done": True,
+                    "prompt_eval_count": prompt_tokens,
+                    "prompt_eval_duration": int(prefill_ms * 1e6),
+                    "eval_count": tokens,
+                }
+                if not request.get("stream", True):
+                    self._json({"response": " ".join(words), **final})
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.end_headers()
+                for word in words:
+                    if fake.token_ms:
+                        time.sleep(fake.token_ms / 1000)
+                    self.wfile.write((json.dumps({"response": word + " ", "done": False}) + "\n").encode())
+                self.wfile.write((json.dumps({"response": "", **final}) + "\n").encode())
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a fake Ollama server (point OLLAMA_URL at it)")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--tokens", type=int, default=200, help="Tokens generated per request")
+    parser.add_argument("--token-ms", type=float, default=20.0, help="Delay per generated token")
+    parser.add_argument("--prefill-ms-per-1k", type=float, default=300.0, help="Prefill delay per 1k prompt tokens")
+    args = parser.parse_args()
+
+    fake = FakeOllama(port=args.port, tokens=args.tokens, token_ms=args.token_ms,
+                      prefill_ms_per_1k=args.prefill_ms_per_1k)
+    print(f"🦙 Fake Ollama listening on {fake.url}")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
@@ -0,0 +1,124 @@
+# benchmarks/harness.py - TIMING, DISCOVERY AND RESULT STORAGE
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+# The benchmarks import app modules the same way the app and the backend do
+for path in (ROOT_DIR, os.path.join(ROOT_DIR, "backend"), os.path.join(ROOT_DIR, "pages")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+class SkipBenchmark(Exception):
+    """Raised by a module's setup() when an optional dependency or service is missing"""
+
+
+def discover(only=None):
+    """bench_*.py modules in this directory (optionally only those whose name contains `only`)"""
+    modules = []
+    for filename in sorted(os.listdir(BENCH_DIR)):
+        if filename.startswith("bench_") and filename.endswith(".py"):
+            name = filename[:-3]
+            if only and not any(part in name for part in only):
+                continue
+            modules.append(importlib.import_module(name))
+    return modules
+
+
+def benchmarks_in(module):
+    """asv-style: every time_* function of the module, in definition order"""
+    return [(name, fn) for name, fn in vars(module).items() if name.startswith("time_") and callable(fn)]
+
+
+def measure(fn, ctx, repeat=7, max_seconds=10.0):
+    """
+    Call fn(ctx) once to warm up, then up to `repeat` timed times (stopping early
+    once max_seconds is spent). App code prints progress, so stdout is silenced.
+    """
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink):
+        fn(ctx)
+        timings = []
+        budget_start = time.perf_counter()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn(ctx)
+            timings.append((time.perf_counter() - start) * 1000)
+            if time.perf_counter() - budget_start > max_seconds:
+                break
+    return {
+        "min_ms": min(timings),
+        "median_ms": statistics.median(timings),
+        "mean_ms": statistics.mean(timings),
+        "stdev_ms": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "runs": len(timings),
+    }
+
+
+def git_revision():
+    """(short sha, dirty flag) of the working tree, or ('nogit', False)"""
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT_DIR,
+                                    capture_output=True, text=True).stdout.strip())
+        return sha, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return "nogit", False
+
+
+def save_results(results, sizes, label=None):
+    """Write results to benchmarks/results/<label or sha>.json and return the path"""
+    sha, dirty = git_revision()
+    label = label or (f"{sha}-dirty" if dirty else sha)
+    payload = {
+        "label": label,
+        "commit": sha,
+        "dirty": dirty,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} cpus)",
+        "sizes": sizes,
+        "results": results,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{label}.json")
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def load_results(label_or_path):
+    path = label_or_path if label_or_path.endswith(".json") else os.path.join(RESULTS_DIR, f"{label_or_path}.json")
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(base, head, threshold=0.10):
+    """Rows of (benchmark, base ms, head ms, ratio, verdict) for benchmarks present in both runs"""
+    rows = []
+    for key in sorted(set(base["results"]) & set(head["results"])):
+        before, after = base["results"][key], head["results"][key]
+        if "median_ms" not in before or "median_ms" not in after:
+            continue
+        ratio = after["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        if ratio > 1 + threshold:
+            verdict = "🐢 slower"
+        elif ratio < 1 - threshold:
+            verdict = "🚀 faster"
+        else:
+            verdict = "≈ same"
+        rows.append((key, before["median_ms"], after["median_ms"], ratio, verdict))
+    return rows
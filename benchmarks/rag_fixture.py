@@ -0,0 +1,42 @@
+# benchmarks/rag_fixture.py - RAG SYSTEM WITHOUT CHROMA, EMBEDDER OR OLLAMA
+from harness import SkipBenchmark
+
+BENCH_QUERIES = [
+    "Who is the fastest player in Premier League?",
+    "Compare Mbappe vs Haaland",
+    "Find young French talents under €20M",
+    "Best finishers in Serie A",
+    "Creative wingers with Finesse Shot",
+    "Strongest physical players in Bundesliga",
+    "Cheapest strikers under 23 years old",
+]
+
+_built = {}
+
+
+def offline_rag(df):
+    """
+    FootballRAGSystem over `df` with the in-process indexes built (player index,
+    correlations, BM25) but no vector DB or LLM, i.e. what initialize() does minus I/O.
+    Dense retrieval inside hybrid ranking falls back to lexical only.
+    Built once per dataset and shared by the modules benchmarking it.
+    """
+    if id(df) in _built:
+        return _built[id(df)]
+    try:
+        from rag_system import FootballRAGSystem
+    except ImportError as e:
+        raise SkipBenchmark(f"backend dependencies missing ({e})")
+    from correlations import get_correlations
+    from player_index import PlayerIndex
+
+    rag = FootballRAGSystem()
+    rag.df = df
+    rag.df = rag.clean_and_validate_data()
+    rag.data_version = f"bench-{len(df)}"
+    rag.player_index = PlayerIndex(rag.df)
+    rag.correlations = get_correlations(rag.df, (rag.data_version, "all"))
+    rag.lexical_index = rag.build_lexical_index(rag.df)
+    _built.clear()
+    _built[id(df)] = rag
+    return rag
@@ -0,0 +1,84 @@
+# benchmarks/run.py - RUN THE BENCHMARK SUITE AND COMPARE RESULTS ACROSS COMMITS
+import argparse
+import contextlib
+import io
+import time
+
+from harness import SkipBenchmark, benchmarks_in, compare, discover, load_results, measure, save_results
+from datasets import SIZES, load_dataset
+
+
+def run(sizes, only=None, repeat=7, max_seconds=10.0):
+    """Run every discovered benchmark at every size; returns {"module.benchmark@size": stats}"""
+    modules = discover(only)
+    results = {}
+    for size in sizes:
+        start = time.perf_counter()
+        df, csv_path = load_dataset(size)
+        print(f"\n📊 {size}: {len(df):,} synthetic players ({(time.perf_counter() - start):.1f}s to load)")
+
+        for module in modules:
+            name = module.__name__.replace("bench_", "")
+            if SIZES[size] > getattr(module, "MAX_SIZE", float("inf")):
+                print(f"  ⏭️  {name}: skipped above {module.MAX_SIZE:,} players")
+                continue
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    ctx = module.setup(df, csv_path)
+            except SkipBenchmark as e:
+                print(f"  ⏭️  {name}: {e}")
+                continue
+
+            try:
+                for bench_name, fn in benchmarks_in(module):
+                    key = f"{name}.{bench_name[len('time_'):]}@{size}"
+                    try:
+                        stats = measure(fn, ctx, repeat, max_seconds)
+                    except SkipBenchmark as e:
+                        results[key] = {"skipped": str(e)}
+                        print(f"  ⏭️  {key}: {e}")
+                        continue
+                    results[key] = stats
+                    print(f"  ⏱️  {key:<55} median {stats['median_ms']:10.2f} ms  "
+                          f"(min {stats['min_ms']:.2f}, ±{stats['stdev_ms']:.2f}, n={stats['runs']})")
+            finally:
+                if hasattr(module, "teardown"):
+                    module.teardown(ctx)
+    return results
+
+
+def print_comparison(base_label, head_label, threshold):
+    base, head = load_results(base_label), load_results(head_label)
+    print(f"\n⚖️ {base['label']} ({base['timestamp']}) → {head['label']} ({head['timestamp']})")
+    rows = compare(base, head, threshold)
+    for key, before, after, ratio, verdict in rows:
+        print(f"  {key:<55} {before:10.2f} → {after:10.2f} ms  x{ratio:5.2f}  {verdict}")
+    slower = sum(1 for row in rows if row[4].endswith("slower"))
+    print(f"\n{len(rows)} benchmarks compared, {slower} slower by more than {threshold:.0%}")
+    return slower
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the project's hot paths on synthetic data")
+    parser.add_argument("--sizes", default="3k,30k", help=f"Comma-separated dataset sizes from {list(SIZES)}")
+    parser.add_argument("--only", default=None, help="Comma-separated module names to run (e.g. similarity,queries)")
+    parser.add_argument("--repeat", type=int, default=7, help="Timed runs per benchmark")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="Time cap per benchmark")
+    parser.add_argument("--label", default=None, help="Results file name (default: current commit)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), default=None,
+                        help="Compare two stored results instead of running")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change reported as slower/faster")
+    args = parser.parse_args()
+
+    if args.compare:
+        raise SystemExit(1 if print_comparison(*args.compare, args.threshold) else 0)
+
+    sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes {unknown}, choose from {list(SIZES)}")
+    only = args.only.split(",") if args.only else None
+
+    results = run(sizes, only, args.repeat, args.max_seconds)
+    path = save_results(results, sizes, args.label)
+    print(f"\n💾 Results saved to {path}")
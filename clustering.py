@@ -0,0 +1,185 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import copy
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import PCA
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import StandardScaler
+
+DEFAULT_FEATURES = ["PACE", "SHOOTING", "PASSING", "DRIBBLING", "PHYSICAL", "AERIAL", "MENTAL"]
+
+# Finished clusterings kept per (dataset version, feature set, K)
+MAX_CACHED_RESULTS = 32
+
+# Silhouette is O(n^2), so it is estimated on a sample
+SILHOUETTE_SAMPLE = 2000
+
+
+class ClusterResult:
+    """Labels, 3D PCA projection and centroid profiles of one clustering run (never modified once built)"""
+
+    def __init__(self, index, features, k, scaler, model, pca, labels, projection, seconds, silhouette):
+        self.index = pd.Index(index)
+        self.features = list(features)
+        self.k = k
+        self.scaler = scaler
+        self.model = model
+        self.pca = pca
+        self.labels = labels            # int32 per player, aligned with index
+        self.projection = projection    # float32 (n_players, 3)
+        self.seconds = seconds
+        self.silhouette = silhouette
+
+    @property
+    def explained_variance(self):
+        return self.pca.explained_variance_ratio_
+
+    def labels_for(self, index):
+        """Cluster label per row of `index` (-1 for players the run has not seen)"""
+        return pd.Series(self.labels, index=self.index).reindex(index).fillna(-1).astype(int).to_numpy()
+
+    def frame(self):
+        """Projection + label per player, ready for plotting"""
+        return pd.DataFrame({
+            "PC1": self.projection[:, 0], "PC2": self.projection[:, 1], "PC3": self.projection[:, 2],
+            "cluster": self.labels
+        }, index=self.index)
+
+    def profiles(self):
+        """Centroid of every cluster in the original feature units, plus its size"""
+        centers = self.scaler.inverse_transform(self.model.cluster_centers_)
+        profile = pd.DataFrame(centers, columns=self.features).round(2)
+        profile.insert(0, "Players", np.bincount(self.labels, minlength=self.k))
+        profile.index.name = "Cluster"
+        return profile
+
+    def ingested(self, new_rows: pd.DataFrame):
+        """
+        Incremental update for newly ingested players: a copy of this result after one
+        mini-batch step of its model, with the new rows labelled and projected (existing
+        labels are kept). Copy-on-write, so sessions still reading this result never see
+        labels and index of different lengths. Returns (result, rows added).
+        """
+        new_rows = new_rows.loc[~new_rows.index.isin(self.index)].dropna(subset=self.features)
+        if new_rows.empty:
+            return self, 0
+        start = time.perf_counter()
+        scaled = self.scaler.transform(new_rows[self.features].to_numpy(dtype=float))
+        model = copy.deepcopy(self.model)
+        model.partial_fit(scaled)
+        projection = self.pca.transform(scaled).astype(np.float32)
+        if projection.shape[1] < 3:
+            projection = np.hstack([projection, np.zeros((len(projection), 3 - projection.shape[1]), dtype=np.float32)])
+        result = ClusterResult(
+            self.index.append(new_rows.index), self.features, self.k, self.scaler, model, self.pca,
+            np.concatenate([self.labels, model.predict(scaled).astype(np.int32)]),
+            np.vstack([self.projection, projection]),
+            self.seconds + time.perf_counter() - start, self.silhouette
+        )
+        return result, len(new_rows)
+
+
+def run_clustering(df: pd.DataFrame, features, k, seed=42) -> ClusterResult:
+    """Standardise the features, fit mini-batch k-means and a 3D PCA projection"""
+    start = time.perf_counter()
+    data = df.dropna(subset=features)
+    scaler = StandardScaler()
+    scaled = scaler.fit_transform(data[features].to_numpy(dtype=float))
+
+    model = MiniBatchKMeans(n_clusters=k, random_state=seed, batch_size=1024, n_init=3)
+    labels = model.fit_predict(scaled).astype(np.int32)
+    pca = PCA(n_components=min(3, len(features)), random_state=seed)
+    projection = pca.fit_transform(scaled).astype(np.float32)
+    if projection.shape[1] < 3:
+        projection = np.hstack([projection, np.zeros((len(projection), 3 - projection.shape[1]), dtype=np.float32)])
+
+    silhouette = None
+    if 1 < k < len(scaled):
+        silhouette = float(silhouette_score(scaled, labels, sample_size=min(SILHOUETTE_SAMPLE, len(scaled)),
+                                            random_state=seed))
+    return ClusterResult(data.index, features, k, scaler, model, pca, labels, projection,
+                         time.perf_counter() - start, silhouette)
+
+
+class ClusteringEngine:
+    """
+    Runs clusterings on a background worker and caches them per
+    (dataset version, feature set, K), so reruns and other sessions reuse them.
+    """
+
+    def __init__(self, max_workers=1):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="clustering")
+        self.jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(version, features, k):
+        return (version, tuple(sorted(features)), int(k))
+
+    def submit(self, df, features, k, version):
+        """Start (or reuse) a clustering job; returns its cache key"""
+        key = self.key(version, features, k)
+        with self._lock:
+            if key in self.jobs:
+                self.jobs.move_to_end(key)
+                return key
+            self.jobs[key] = self.executor.submit(run_clustering, df, list(key[1]), key[2])
+            while len(self.jobs) > MAX_CACHED_RESULTS:
+                self.jobs.popitem(last=False)
+        return key
+
+    def status(self, key):
+        """'pending', 'done', 'error' or 'unknown'"""
+        future = self.jobs.get(key)
+        if future is None:
+            return "unknown"
+        if not future.done():
+            return "pending"
+        return "error" if future.exception() else "done"
+
+    def result(self, key):
+        future = self.jobs.get(key)
+        return future.result() if future is not None and future.done() and not future.exception() else None
+
+    def error(self, key):
+        future = self.jobs.get(key)
+        return future.exception() if future is not None and future.done() else None
+
+    def ingest(self, change):
+        """
+        Carry finished clusterings over a dataset reload (a dataset_watcher.DatasetChange).
+        When the reload only added players, as far as a clustering's features go, the result is
+        updated with a mini-batch step and filed under the new version key, so the page reuses
+        it instead of refitting. Removed or edited players leave the refit to the next submit().
+        Returns the number of results carried over.
+        """
+        carried = 0
+        for key in list(self.jobs):
+            features = list(key[1])
+            if key[0] != change.old.columns_version(features) or len(change.removed):
+                continue
+            if not change.changed_rows(features).empty:
+                continue
+            result = self.result(key)
+            if result is None:
+                continue
+            updated, added = result.ingested(change.new.df.loc[change.added])
+            future = Future()
+            future.set_result(updated)
+            with self._lock:
+                self.jobs.setdefault(self.key(change.new.columns_version(features), features, key[2]), future)
+            print(f"🧩 Clustering {key[1]} k={key[2]} carried over with {added} new players")
+            carried += 1
+        return carried
+
+
+@st.cache_resource(show_spinner=False)
+def get_clustering_engine() -> ClusteringEngine:
+    """One engine (worker + result cache) per server process"""
+    return ClusteringEngine()
@@ -0,0 +1,116 @@
+from collections import OrderedDict
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+METHODS = ("pearson", "spearman")
+
+# Correlation matrices kept per (dataset version, filter) key
+MAX_CACHED_MATRICES = 16
+
+
+def describe_strength(r) -> str:
+    """Same thresholds the pages already use for their correlation badges"""
+    if r is None or np.isnan(r):
+        return "Undefined"
+    if abs(r) > 0.7:
+        return "Strong"
+    if abs(r) > 0.3:
+        return "Moderate"
+    return "Weak"
+
+
+def _p_values(r, n):
+    """Two-sided p-value of a correlation coefficient with n pairwise observations (t-test)"""
+    r = np.clip(r, -0.999999, 0.999999)
+    dof = np.maximum(n - 2, 1)
+    t = r * np.sqrt(dof / (1 - r ** 2))
+    p = 2 * stats.t.sf(np.abs(t), dof)
+    return np.where(n > 2, p, np.nan)
+
+
+class CorrelationMatrix:
+    """Pearson and Spearman matrices over the numeric columns, with p-values and pairwise counts"""
+
+    def __init__(self, columns, coefficients, p_values, counts):
+        self.columns = list(columns)
+        self.coefficients = coefficients    # {method: DataFrame}
+        self.p_values = p_values            # {method: DataFrame}
+        self.counts = counts                # DataFrame of pairwise non-null counts
+
+    @classmethod
+    def compute(cls, df: pd.DataFrame, columns=None):
+        numeric = df[columns] if columns else df.select_dtypes(include=[np.number])
+        numeric = numeric.loc[:, numeric.notna().sum() > 2]
+        present = numeric.notna().to_numpy(dtype=np.int64)
+        counts = pd.DataFrame(present.T @ present, index=numeric.columns, columns=numeric.columns)
+
+        coefficients, p_values = {}, {}
+        for method in METHODS:
+            matrix = numeric.corr(method=method)
+            coefficients[method] = matrix
+            p_values[method] = pd.DataFrame(
+                _p_values(matrix.to_numpy(), counts.to_numpy()), index=matrix.index, columns=matrix.columns
+            )
+        return cls(numeric.columns, coefficients, p_values, counts)
+
+    def pair(self, a, b, method="pearson") -> dict:
+        """Coefficient, p-value, n and strength label for one pair of columns"""
+        r = float(self.coefficients[method].loc[a, b])
+        return {
+            "r": r,
+            "p": float(self.p_values[method].loc[a, b]),
+            "n": int(self.counts.loc[a, b]),
+            "strength": describe_strength(r),
+        }
+
+    def slice(self, columns, method="pearson") -> pd.DataFrame:
+        columns = [c for c in columns if c in self.columns]
+        return self.coefficients[method].loc[columns, columns]
+
+    def strongest_pairs(self, columns=None, method="pearson", top_n=5):
+        """Largest |r| pairs (each pair once), as (a, b, pair dict) tuples"""
+        columns = [c for c in (columns or self.columns) if c in self.columns]
+        pairs = []
+        for i, a in enumerate(columns):
+            for b in columns[i + 1:]:
+                pairs.append((a, b, self.pair(a, b, method)))
+        pairs.sort(key=lambda item: -abs(item[2]["r"]) if not np.isnan(item[2]["r"]) else 0)
+        return pairs[:top_n]
+
+    def to_dict(self, columns=None, method="pearson") -> dict:
+        """JSON-friendly payload for the API"""
+        columns = [c for c in (columns or self.columns) if c in self.columns]
+        clean = lambda frame: frame.loc[columns, columns].round(4).replace({np.nan: None}).values.tolist()
+        return {
+            "method": method,
+            "columns": columns,
+            "r": clean(self.coefficients[method]),
+            "p": clean(self.p_values[method]),
+            "n": self.counts.loc[columns, columns].values.tolist(),
+        }
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_correlations(df: pd.DataFrame, key, columns=None) -> CorrelationMatrix:
+    """
+    Correlation matrix for `df`, computed once per key. The key should identify the
+    dataset version and any filter applied to `df` (e.g. (version, "market_value>0")).
+    Shared by every page in the process and by the backend.
+    """
+    cache_key = (key, tuple(columns) if columns else None, len(df))
+    with _cache_lock:
+        if cache_key in _cache:
+            _cache.move_to_end(cache_key)
+            return _cache[cache_key]
+    matrix = CorrelationMatrix.compute(df, columns)
+    with _cache_lock:
+        _cache[cache_key] = matrix
+        while len(_cache) > MAX_CACHED_MATRICES:
+            _cache.popitem(last=False)
+    return matrix
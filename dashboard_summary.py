@@ -0,0 +1,111 @@
+import json
+import os
+
+import pandas as pd
+import streamlit as st
+
+from dataset_watcher import file_version
+from utils import DATA_PATH
+
+# Materialised summaries live next to the other on-disk caches, one file per CSV size + mtime
+CACHE_DIR = "cache"
+
+PREVIEW_COLUMNS = ['Name', 'Team', 'League', 'Age', 'Position', 'market_value', 'OVR']
+PREVIEW_ROWS = 10
+TOP_N = 5
+
+
+def summary_path(version: str, cache_dir: str = CACHE_DIR) -> str:
+    return os.path.join(cache_dir, f"dashboard_summary_{version}.json")
+
+
+def _number(value, digits=2):
+    return None if pd.isna(value) else round(float(value), digits)
+
+
+def compute_summary(df: pd.DataFrame, version: str = None) -> dict:
+    """Everything the landing page shows: counts, means, top-N lists and the preview slice"""
+    summary = {
+        "version": version,
+        "total_forwards": int(len(df)),
+        "leagues": int(df['League'].nunique()) if 'League' in df.columns else 0,
+        "teams": int(df['Team'].nunique()) if 'Team' in df.columns else 0,
+        "avg_market_value": _number(df['market_value'].mean()) if 'market_value' in df.columns else None,
+        "avg_overall": _number(df['OVR'].mean()) if 'OVR' in df.columns else None,
+        "top_leagues": [],
+        "top_overall": [],
+        "top_market_value": [],
+    }
+    if 'League' in df.columns:
+        counts = df['League'].value_counts().head(TOP_N)
+        summary["top_leagues"] = [{"League": league, "Players": int(n)} for league, n in counts.items()]
+    for key, column in (("top_overall", "OVR"), ("top_market_value", "market_value")):
+        if column in df.columns and 'Name' in df.columns:
+            top = df.nlargest(TOP_N, column)
+            summary[key] = [{"Name": name, column: _number(value)} for name, value in zip(top['Name'], top[column])]
+
+    preview_cols = [col for col in PREVIEW_COLUMNS if col in df.columns]
+    preview = df[preview_cols].head(PREVIEW_ROWS)
+    summary["preview"] = json.loads(preview.to_json(orient="split", index=False))
+    return summary
+
+
+def build_summary(path: str = DATA_PATH, cache_dir: str = CACHE_DIR) -> dict:
+    """Scan the CSV once, persist the summary for its version and drop summaries of older versions"""
+    # Stat before reading: a write that lands mid-read moves the mtime on, so the next render rebuilds
+    version = file_version(path)
+    summary = compute_summary(pd.read_csv(path), version)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    target = summary_path(version, cache_dir)
+    tmp = f"{target}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(summary, f)
+    os.replace(tmp, target)  # atomic, so concurrent sessions never read a half-written file
+
+    for name in os.listdir(cache_dir):
+        if name.startswith("dashboard_summary_") and name.endswith(".json") and name != os.path.basename(target):
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+    return summary
+
+
+def load_summary(path: str = DATA_PATH, cache_dir: str = CACHE_DIR) -> dict:
+    """Persisted summary for the current dataset version, built on first use"""
+    version = file_version(path)
+    try:
+        with open(summary_path(version, cache_dir)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return build_summary(path, cache_dir)
+
+
+@st.cache_data(show_spinner=False)
+def _cached_summary(version):
+    return load_summary()
+
+
+def get_dashboard_summary():
+    """
+    Dashboard KPIs for the current dataset version. Returns None when the data file is missing.
+    Keyed on the CSV's size + mtime rather than the watcher's content hash, so the check is one
+    stat; held in memory per version, and on disk so a fresh process renders without reading the CSV.
+    """
+    version = file_version(DATA_PATH)
+    if version == "missing":
+        return None
+    return _cached_summary(version)
+
+
+def preview_frame(summary: dict) -> pd.DataFrame:
+    preview = summary["preview"]
+    return pd.DataFrame(preview["data"], columns=preview["columns"])
+
+
+if __name__ == "__main__":
+    # Warm the cache ahead of a deploy: python dashboard_summary.py
+    summary = build_summary()
+    print(f"✅ Dashboard summary for version {summary['version']} written to "
+          f"{summary_path(summary['version'])} ({os.path.getsize(summary_path(summary['version']))} bytes)")
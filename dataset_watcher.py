@@ -0,0 +1,178 @@
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+
+# Seconds between size/mtime checks of the CSV (0 turns polling off; reloads then only happen on request)
+POLL_INTERVAL = float(os.environ.get("SCOUT_RELOAD_INTERVAL", 2))
+HISTORY_SIZE = 20  # change summaries kept per watcher
+READ_ATTEMPTS = 3  # re-reads when the file changes while it is being read
+
+
+def file_version(path) -> str:
+    """Cheap fingerprint of a file (size + modification time), 'missing' if it does not exist"""
+    try:
+        stat = os.stat(path)
+        return f"{stat.st_size}-{stat.st_mtime_ns}"
+    except OSError:
+        return "missing"
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def _hash_values(values) -> str:
+    return _digest(pd.util.hash_pandas_object(values, index=False).to_numpy().tobytes())
+
+
+class DatasetSnapshot:
+    """
+    One version of the player table with a content fingerprint per column and for the
+    row index, so derived structures can be keyed by just the columns they read.
+    """
+
+    def __init__(self, df: pd.DataFrame, file_version=None):
+        self.df = df
+        self.file_version = file_version
+        self.index_hash = _hash_values(df.index.to_series())
+        self.column_hashes = {column: _hash_values(df[column]) for column in df.columns}
+        self.version = "missing" if file_version == "missing" else self.columns_version(df.columns)
+
+    def columns_version(self, columns=None) -> str:
+        """Fingerprint of these columns plus the row index (None = the whole table)"""
+        if columns is None:
+            return self.version
+        parts = [self.index_hash] + [f"{c}:{self.column_hashes.get(c, '')}" for c in sorted(set(columns))]
+        return _digest("|".join(parts).encode())
+
+
+class DatasetChange:
+    """What differs between two snapshots; rows are matched by index (the player ids the vector DB uses)"""
+
+    def __init__(self, old: DatasetSnapshot, new: DatasetSnapshot):
+        self.old = old
+        self.new = new
+        self.added = new.df.index.difference(old.df.index)
+        self.removed = old.df.index.difference(new.df.index)
+        columns = list(dict.fromkeys(list(old.df.columns) + list(new.df.columns)))
+        self.changed_columns = [c for c in columns if old.column_hashes.get(c) != new.column_hashes.get(c)]
+
+    def __bool__(self):
+        return self.old.version != self.new.version
+
+    @property
+    def modified_columns(self) -> list:
+        """Changed columns whose values differ on rows present in both snapshots (not just added/removed rows)"""
+        if not hasattr(self, "_modified_columns"):
+            common = self.old.df.index.intersection(self.new.df.index)
+            self._modified_columns = [c for c in self.changed_columns
+                                      if c in self.old.df.columns and c in self.new.df.columns
+                                      and not self.old.df.loc[common, c].equals(self.new.df.loc[common, c])]
+        return self._modified_columns
+
+    def touches(self, columns=None) -> bool:
+        """Whether anything derived from these columns (None = the whole table) is now stale"""
+        return self.old.columns_version(columns) != self.new.columns_version(columns)
+
+    def changed_rows(self, columns=None) -> pd.Index:
+        """Rows in both snapshots whose values in `columns` (None = any column) differ"""
+        columns = [c for c in (self.changed_columns if columns is None else columns) if c in self.changed_columns]
+        common = self.old.df.index.intersection(self.new.df.index)
+        if not columns or common.empty:
+            return common[:0]
+        old = pd.util.hash_pandas_object(self.old.df.reindex(index=common, columns=columns), index=False)
+        new = pd.util.hash_pandas_object(self.new.df.reindex(index=common, columns=columns), index=False)
+        return common[old.to_numpy() != new.to_numpy()]
+
+    def summary(self) -> dict:
+        return {
+            "old_version": self.old.version,
+            "new_version": self.new.version,
+            "changed_columns": self.changed_columns,
+            "added_rows": len(self.added),
+            "removed_rows": len(self.removed),
+            "changed_rows": len(self.changed_rows()),
+        }
+
+    def describe(self) -> str:
+        """'12 changed, 3 added, 1 removed players (market_value, OVR)'"""
+        modified = self.modified_columns
+        columns = ", ".join(modified[:5]) + (", ..." if len(modified) > 5 else "")
+        return (f"{len(self.changed_rows())} changed, {len(self.added)} added, {len(self.removed)} removed players"
+                + (f" ({columns})" if columns else ""))
+
+
+class DatasetWatcher:
+    """
+    Watches the CSV behind the app. When its size/mtime changes the file is re-read, diffed
+    against the current snapshot and swapped in with one reference assignment, so a reader
+    that takes `watcher.snapshot` once always sees a consistent table.
+    """
+
+    def __init__(self, path, interval=POLL_INTERVAL, reader=pd.read_csv):
+        self.path = path
+        self.interval = interval
+        self.reader = reader
+        self.history = deque(maxlen=HISTORY_SIZE)
+        self._lock = threading.Lock()
+        self._last_poll = time.monotonic()
+        self.snapshot = self.load()
+
+    def load(self) -> DatasetSnapshot:
+        """Read the file into a snapshot, re-reading if it changed underneath (a writer still busy)"""
+        for _ in range(READ_ATTEMPTS):
+            version = file_version(self.path)
+            if version == "missing":
+                return DatasetSnapshot(pd.DataFrame(), version)
+            df = self.reader(self.path)
+            if file_version(self.path) == version:
+                break
+        return DatasetSnapshot(df, version)
+
+    def poll(self):
+        """check(), at most once per `interval` seconds: cheap enough to call on every rerun"""
+        now = time.monotonic()
+        if self.interval <= 0 or now - self._last_poll < self.interval:
+            return None
+        self._last_poll = now
+        return self.check()
+
+    def check(self, force=False):
+        """
+        Swap in the file if its size/mtime changed (force: re-read and diff regardless).
+        Returns the DatasetChange, or None when the content is unchanged.
+        """
+        if not force and file_version(self.path) == self.snapshot.file_version:
+            return None
+        with self._lock:
+            if not force and file_version(self.path) == self.snapshot.file_version:
+                return None
+            try:
+                new = self.load()
+            except Exception as e:
+                # Most likely a writer is half-way through the file: keep the current table, retry next check
+                print(f"⚠️ Could not read {self.path}, keeping the current dataset: {e}")
+                return None
+            if new.version == "missing" and self.snapshot.version != "missing":
+                # Deleted (or being replaced): keep serving the last good table until a file is back
+                self.snapshot.file_version = new.file_version
+                return None
+            change = DatasetChange(self.snapshot, new)
+            if not change:
+                # Touched but identical: keep the current table (and every cache keyed by it)
+                self.snapshot.file_version = new.file_version
+                return None
+            self.snapshot = new
+            self.history.append(change.summary())
+        print(f"🔄 Dataset reloaded: {change.describe()}")
+        return change
+
+    def revert(self, change: DatasetChange):
+        """Put the previous snapshot back after a consumer failed to apply `change`; the next check retries"""
+        with self._lock:
+            if self.snapshot is change.new:
+                self.snapshot = change.old
@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from aggregations import apply_filters, filter_key
+from utils import dataset_version
+
+DEFAULT_BINS = 20
+
+# Resolution of the fine grid the KDE is smoothed on, and of the curve sent to the browser
+KDE_GRID = 512
+KDE_POINTS = 128
+
+# Outliers shown per group in box plots (the most extreme ones), so payload stays bounded
+MAX_OUTLIERS = 25
+
+
+def histogram(values, bins=DEFAULT_BINS, value_range=None) -> dict:
+    """Counts per bin plus the centres/widths a bar chart needs"""
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    counts, edges = np.histogram(values, bins=bins, range=value_range)
+    return {
+        "edges": edges,
+        "centers": (edges[:-1] + edges[1:]) / 2,
+        "widths": np.diff(edges),
+        "counts": counts,
+        "n": int(len(values)),
+    }
+
+
+def kde_curve(values, points=KDE_POINTS, value_range=None) -> dict:
+    """
+    Gaussian KDE evaluated by binning onto a fine grid and convolving with the kernel,
+    so the cost is O(n + grid) instead of O(n * points). Bandwidth follows Scott's rule.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if len(values) < 2 or np.ptp(values) == 0:
+        return {"x": np.array([]), "density": np.array([])}
+
+    std = values.std(ddof=1)
+    bandwidth = 1.06 * std * len(values) ** (-1 / 5)
+    low, high = value_range or (values.min(), values.max())
+    low, high = low - 3 * bandwidth, high + 3 * bandwidth
+
+    counts, edges = np.histogram(values, bins=KDE_GRID, range=(low, high))
+    step = edges[1] - edges[0]
+    half_width = int(np.ceil(4 * bandwidth / step))
+    offsets = np.arange(-half_width, half_width + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    kernel /= kernel.sum() * step
+    # Centred on the grid even when the kernel is wider than it (few players, wide bandwidth),
+    # where mode="same" would return the kernel's length instead
+    density = np.convolve(counts, kernel)[half_width:half_width + KDE_GRID] / len(values)
+
+    centers = (edges[:-1] + edges[1:]) / 2
+    x = np.linspace(centers[0], centers[-1], points)
+    return {"x": x, "density": np.interp(x, centers, density)}
+
+
+def box_stats(values, names=None, max_outliers=MAX_OUTLIERS) -> dict:
+    """Quartiles, Tukey fences, mean and the most extreme outliers (with names when given)"""
+    values = np.asarray(values, dtype=float)
+    mask = ~np.isnan(values)
+    values = values[mask]
+    names = np.asarray(names)[mask] if names is not None else None
+    if len(values) == 0:
+        return {"n": 0}
+
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    lower, upper = (inside.min(), inside.max()) if len(inside) else (q1, q3)
+
+    outlier_idx = np.flatnonzero((values < lower) | (values > upper))
+    if len(outlier_idx) > max_outliers:
+        distance = np.abs(values[outlier_idx] - median)
+        outlier_idx = outlier_idx[np.argsort(-distance)[:max_outliers]]
+    return {
+        "n": int(len(values)),
+        "q1": float(q1), "median": float(median), "q3": float(q3),
+        "lowerfence": float(lower), "upperfence": float(upper),
+        "mean": float(values.mean()),
+        "outliers": values[outlier_idx],
+        "outlier_names": names[outlier_idx] if names is not None else None,
+    }
+
+
+def compute_distributions(df: pd.DataFrame, metric: str, by: str = None, bins: int = DEFAULT_BINS) -> dict:
+    """
+    Histogram, KDE and box statistics for one metric, overall and per group.
+    Groups share the overall bin edges so their histograms are comparable.
+    """
+    data = df.dropna(subset=[metric])
+    values = data[metric].to_numpy(dtype=float)
+    names = data["Name"].to_numpy() if "Name" in data.columns else None
+    value_range = (float(values.min()), float(values.max())) if len(values) else None
+
+    result = {
+        "metric": metric,
+        "overall": {
+            "hist": histogram(values, bins, value_range),
+            "kde": kde_curve(values, value_range=value_range),
+            "box": box_stats(values, names),
+        },
+        "groups": {},
+    }
+    if by:
+        for group, part in data.groupby(by, sort=True):
+            part_values = part[metric].to_numpy(dtype=float)
+            part_names = part["Name"].to_numpy() if names is not None else None
+            result["groups"][group] = {
+                "hist": histogram(part_values, bins, value_range),
+                "kde": kde_curve(part_values, value_range=value_range),
+                "box": box_stats(part_values, part_names),
+            }
+    return result
+
+
+@st.cache_data(show_spinner=False)
+def _cached_distributions(_df, version, metric, by, key, bins):
+    return compute_distributions(apply_filters(_df, key), metric, by, bins)
+
+
+def get_distributions(df: pd.DataFrame, metric: str, by: str = None, filters=None,
+                      bins: int = DEFAULT_BINS, version: str = None) -> dict:
+    """Cached distributions keyed by dataset version, metric, grouping and active filter set"""
+    return _cached_distributions(df, version or dataset_version(), metric, by, filter_key(filters), bins)
+
+
+def histogram_figure(dist: dict, color: str = '#00c6ff', show_kde: bool = True) -> go.Figure:
+    """Bar chart from precomputed bins, with the KDE scaled to counts as an overlay"""
+    hist = dist["hist"]
+    fig = go.Figure(go.Bar(
+        x=hist["centers"], y=hist["counts"], width=hist["widths"],
+        marker=dict(color=color, line=dict(width=1, color='rgba(0,0,0,0.4)')),
+        name="Players",
+        hovertemplate="%{x:.2f}: %{y} players<extra></extra>"
+    ))
+    kde = dist["kde"]
+    if show_kde and len(kde["x"]):
+        scale = hist["n"] * float(np.mean(hist["widths"]))
+        fig.add_trace(go.Scatter(
+            x=kde["x"], y=kde["density"] * scale, mode="lines", name="Density",
+            line=dict(color='white', width=2), hoverinfo="skip"
+        ))
+    fig.update_layout(bargap=0.02, showlegend=False)
+    return fig
+
+
+def box_figure(groups: dict, colors=None) -> go.Figure:
+    """Box plot from precomputed quartiles/fences, outliers drawn as named points"""
+    fig = go.Figure()
+    for i, (group, dist) in enumerate(groups.items()):
+        box = dist["box"]
+        if not box.get("n"):
+            continue
+        color = colors[i % len(colors)] if colors else None
+        fig.add_trace(go.Box(
+            x=[group], q1=[box["q1"]], median=[box["median"]], q3=[box["q3"]],
+            lowerfence=[box["lowerfence"]], upperfence=[box["upperfence"]], mean=[box["mean"]],
+            name=str(group), marker_color=color, boxpoints=False
+        ))
+        if len(box["outliers"]):
+            fig.add_trace(go.Scatter(
+                x=[group] * len(box["outliers"]), y=box["outliers"], mode="markers",
+                text=box["outlier_names"], marker=dict(color=color, size=6),
+                hovertemplate="<b>%{text}</b><br>%{y:.2f}<extra></extra>", showlegend=False
+            ))
+    return fig
+
+
+def density_figure(groups: dict, colors=None) -> go.Figure:
+    """One KDE curve per group (the violin-style view without shipping raw samples)"""
+    fig = go.Figure()
+    for i, (group, dist) in enumerate(groups.items()):
+        kde = dist["kde"]
+        if not len(kde["x"]):
+            continue
+        fig.add_trace(go.Scatter(
+            x=kde["x"], y=kde["density"], mode="lines", name=str(group),
+            line=dict(width=3, color=colors[i % len(colors)] if colors else None)
+        ))
+    return fig
@@ -0,0 +1,162 @@
+import json
+import os
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import plotly.io as pio
+import streamlit as st
+
+import telemetry
+from dashboard_summary import CACHE_DIR
+from utils import dataset_version
+
+# Bounds of the figure cache: whichever is hit first evicts the least recently used figure
+MAX_ENTRIES = 256
+MAX_BYTES = 64 * 1024 * 1024
+
+# Player view counts survive restarts so the most-viewed players can be pre-warmed straight away
+VIEWS_PATH = os.path.join(CACHE_DIR, "figure_views.json")
+PREWARM_PLAYERS = 10  # most-viewed players whose figures are built ahead of time
+SAVE_VIEWS_EVERY = 20  # views between writes of VIEWS_PATH
+
+
+def figure_key(page, chart, inputs, version=None):
+    """(page, chart type, inputs, dataset version); inputs are any JSON-able value, normalised to a string"""
+    return (page, chart, json.dumps(inputs, sort_keys=True, default=str), version or dataset_version())
+
+
+class FigureCache:
+    """
+    LRU cache of built Plotly figures, keyed by figure_key(), bounded by entry count
+    and total serialised (JSON) size. Figures are handed to st.plotly_chart as they are:
+    a dict would be re-validated into a go.Figure, which costs about as much as building it.
+    Also counts player views and pre-warms the figures of the most-viewed players on a
+    background worker. Cached figures are shared between sessions and must not be mutated.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES, views_path=VIEWS_PATH):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.views_path = views_path
+        self.figures = OrderedDict()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = self.prewarmed = 0
+        self.views = self._load_views()
+        self._unsaved_views = 0
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="figure-prewarm")
+
+    def get(self, key):
+        """(figure, payload bytes), or None"""
+        with self._lock:
+            entry = self.figures.get(key)
+            if entry is not None:
+                self.figures.move_to_end(key)
+            return entry
+
+    def put(self, key, fig):
+        """Cache a built figure, sized by its JSON; returns the (figure, payload bytes) entry"""
+        entry = (fig, len(pio.to_json(fig, validate=False)))
+        with self._lock:
+            if key in self.figures:
+                self.bytes -= self.figures.pop(key)[1]
+            self.figures[key] = entry
+            self.bytes += entry[1]
+            while self.figures and (len(self.figures) > self.max_entries or self.bytes > self.max_bytes):
+                _, evicted = self.figures.popitem(last=False)
+                self.bytes -= evicted[1]
+                self.evictions += 1
+        return entry
+
+    def get_or_build(self, key, build):
+        """Cached (figure, payload bytes), or build() the go.Figure and cache it"""
+        entry = self.get(key)
+        hit = entry is not None
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        telemetry.cache_event(f"figure:{key[0]}.{key[1]}", hit)
+        if not hit:
+            entry = self.put(key, build())
+        return entry
+
+    def record_view(self, *players):
+        """Count views of players; the most viewed get their figures pre-warmed"""
+        with self._lock:
+            self.views.update(p for p in players if p)
+            self._unsaved_views += len(players)
+            if self._unsaved_views < SAVE_VIEWS_EVERY:
+                return
+            self._unsaved_views = 0
+            views = dict(self.views)
+        self._save_views(views)
+
+    def most_viewed(self, n=PREWARM_PLAYERS):
+        with self._lock:
+            return [player for player, _ in self.views.most_common(n)]
+
+    def prewarm(self, entries):
+        """
+        Build and cache figures in the background. `entries` are (key, build) pairs; builds
+        must not call Streamlit. Keys already cached or queued are skipped. Returns the number queued.
+        """
+        queued = 0
+        for key, build in entries:
+            with self._lock:
+                if key in self.figures or key in self._pending:
+                    continue
+                self._pending.add(key)
+            self.executor.submit(self._prewarm_one, key, build)
+            queued += 1
+        return queued
+
+    def _prewarm_one(self, key, build):
+        try:
+            self.put(key, build())
+            with self._lock:
+                self.prewarmed += 1
+        except Exception as e:
+            print(f"⚠️ Pre-warming figure {key[:2]} failed: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def _load_views(self):
+        try:
+            with open(self.views_path) as f:
+                return Counter(json.load(f))
+        except (OSError, ValueError):
+            return Counter()
+
+    def _save_views(self, views):
+        try:
+            os.makedirs(os.path.dirname(self.views_path) or ".", exist_ok=True)
+            with open(self.views_path, "w") as f:
+                json.dump(views, f)
+        except OSError as e:
+            print(f"⚠️ Could not save player views: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self.figures), "bytes": self.bytes, "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions, "prewarmed": self.prewarmed, "pending": len(self._pending)}
+
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache() -> FigureCache:
+    """One figure cache per server process, shared by every session"""
+    return FigureCache()
+
+
+def cached_chart(page, chart, inputs, build, version=None, **kwargs):
+    """
+    st.plotly_chart of a memoised figure: identical inputs on the same dataset skip build()
+    and reuse the cached go.Figure. Returns the payload size in bytes.
+    """
+    fig, payload = get_figure_cache().get_or_build(figure_key(page, chart, inputs, version), build)
+    st.plotly_chart(fig, **kwargs)
+    return payload
@@ -0,0 +1,343 @@
+# loadtest/api_load.py - OPEN-LOOP LOAD GENERATOR AND SLO REPORT FOR THE /query ENDPOINT
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+from report import ROOT_DIR, percentiles, save_report
+
+sys.path.insert(0, os.path.join(ROOT_DIR, "benchmarks"))
+
+from fake_ollama import FakeOllama
+
+# Query shapes the Scout Assistant sees, filled from the player CSV
+QUERY_TEMPLATES = [
+    "Who is the fastest player in {league}?",
+    "Best finishers in {league}",
+    "Strongest physical players in {league}",
+    "Find young {nationality} talents under €{price}M",
+    "Cheapest strikers under {age} years old",
+    "Creative wingers with {trait}",
+    "Tell me about {player}",
+    "Compare {player} vs {other}",
+]
+NATIONALITIES = ["French", "Brazilian", "Argentinian", "Spanish", "English", "German", "Italian", "Portuguese", "Dutch"]
+
+# Latency is measured from each request's scheduled send time, so a saturated client cannot hide queueing
+DEFAULT_SLOS = {"p50_ms": 1500.0, "p95_ms": 4000.0, "p99_ms": 8000.0, "error_rate": 0.01}
+
+
+def template_corpus(n, seed=0, csv_path=None):
+    """n queries generated from QUERY_TEMPLATES with leagues, players and play styles from the CSV"""
+    df = pd.read_csv(csv_path or os.environ.get(
+        "SCOUT_DATA_PATH", os.path.join(ROOT_DIR, "forwards_clean_with_market_values_updated.csv")))
+    rng = random.Random(seed)
+    leagues = df["League"].dropna().unique().tolist()
+    players = df["Name"].dropna().tolist()
+    traits = sorted({t.strip().rstrip("+") for styles in df["play style"].dropna() for t in styles.split(",") if t.strip()})
+    corpus = []
+    for _ in range(n):
+        corpus.append({"query": rng.choice(QUERY_TEMPLATES).format(
+            league=rng.choice(leagues), nationality=rng.choice(NATIONALITIES), price=rng.choice([5, 10, 20, 40]),
+            age=rng.choice([21, 23, 25]), trait=rng.choice(traits), player=rng.choice(players),
+            other=rng.choice(players))})
+    return corpus
+
+
+def load_corpus(path):
+    """
+    Queries to replay: a JSONL file of /query request bodies ({"query": ..., "mode": ...})
+    or plain text with one query per line.
+    """
+    corpus = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                entry = json.loads(line)
+                if entry.get("query"):
+                    corpus.append({k: entry[k] for k in ("query", "mode", "enrich") if k in entry})
+            else:
+                corpus.append({"query": line})
+    if not corpus:
+        raise ValueError(f"No queries found in {path}")
+    return corpus
+
+
+def arrival_offsets(rate, duration, process="poisson", seed=0):
+    """Send times (seconds from start) for a fixed mean arrival rate, independent of responses"""
+    rng = random.Random(seed)
+    offsets, t = [], 0.0
+    while True:
+        t += rng.expovariate(rate) if process == "poisson" else 1.0 / rate
+        if t >= duration:
+            return offsets
+        offsets.append(t)
+
+
+async def post_json(host, port, path, payload, timeout):
+    """
+    Minimal HTTP/1.1 POST over asyncio streams (one connection per request), returning
+    (status, headers, body, connect seconds, time to first byte in seconds)
+    """
+    start = time.perf_counter()
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    connected = time.perf_counter()
+    try:
+        body = json.dumps(payload).encode()
+        writer.write((f"POST {path} HTTP/1.1\r\nHost: {host}:{port}\r\nContent-Type: application/json\r\n"
+                      f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode() + body)
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        first_byte = time.perf_counter()
+        if not status_line:
+            raise ConnectionError("connection closed before the response")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if "content-length" in headers:
+            data = await asyncio.wait_for(reader.readexactly(int(headers["content-length"])), timeout)
+        else:
+            data = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+    return status, headers, data, connected - start, first_byte - start
+
+
+class InFlight:
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+
+    def __enter__(self):
+        self.current += 1
+        self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc):
+        self.current -= 1
+
+
+async def one_request(host, port, payload, scheduled, timeout, in_flight):
+    """
+    Latency split into client lag (send later than scheduled), connect, server queueing
+    (accepted but not yet handled, from X-Process-Time) and service time
+    """
+    sent = time.perf_counter()
+    record = {"query": payload["query"], "lag_ms": (sent - scheduled) * 1000}
+    with in_flight:
+        try:
+            status, headers, data, connect, ttfb = await post_json(host, port, "/query", payload, timeout)
+            record["status"] = status
+            record["connect_ms"] = connect * 1000
+            if "x-process-time" in headers:
+                record["service_ms"] = float(headers["x-process-time"])
+                record["queue_ms"] = max(0.0, (ttfb - connect) * 1000 - record["service_ms"])
+            if status == 200:
+                record["mode"] = json.loads(data).get("mode")
+            else:
+                record["error"] = f"HTTP {status}: {data[:120].decode(errors='replace')}"
+        except asyncio.TimeoutError:
+            record["error"] = "timeout"
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"[:200]
+    record["end"] = time.perf_counter()
+    record["latency_ms"] = (record["end"] - scheduled) * 1000
+    return record
+
+
+async def run_load(url, corpus, rate, duration, process="poisson", seed=0, timeout=60.0, mode=None):
+    """Fire corpus queries (cycled) at `rate` requests/s for `duration` seconds, open loop"""
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    offsets = arrival_offsets(rate, duration, process, seed)
+    in_flight = InFlight()
+    tasks = []
+    start = time.perf_counter()
+    for i, offset in enumerate(offsets):
+        delay = start + offset - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        payload = dict(corpus[i % len(corpus)])
+        if mode:
+            payload["mode"] = mode
+        tasks.append(asyncio.create_task(one_request(host, port, payload, start + offset, timeout, in_flight)))
+    records = await asyncio.gather(*tasks)
+    for record, offset in zip(records, offsets):
+        record["offset_s"] = offset
+        record["end_s"] = record.pop("end") - start
+    return records, in_flight.peak
+
+
+def summarize(records, rate, duration, warmup, peak_in_flight, slos):
+    """Latency percentiles, throughput, errors, queueing breakdown and SLO verdicts (warmup excluded)"""
+    measured = [r for r in records if r["offset_s"] >= warmup]
+    ok = [r for r in measured if "error" not in r]
+    errors = defaultdict(int)
+    for r in measured:
+        if "error" in r:
+            errors[r["error"].split(":")[0]] += 1
+    window = max((r["end_s"] for r in measured), default=warmup) - warmup
+    error_rate = (len(measured) - len(ok)) / len(measured) if measured else 0.0
+
+    latency = percentiles([r["latency_ms"] for r in ok])
+    by_mode = defaultdict(list)
+    for r in ok:
+        by_mode[r.get("mode") or "unknown"].append(r["latency_ms"])
+
+    verdicts = {}
+    for name, limit in slos.items():
+        actual = error_rate if name == "error_rate" else latency.get(name)
+        verdicts[name] = {"limit": limit, "actual": actual, "ok": actual is not None and actual <= limit}
+
+    return {
+        "offered_rps": rate,
+        "duration_s": duration,
+        "warmup_s": warmup,
+        "requests": len(measured),
+        "ok": len(ok),
+        "error_rate": error_rate,
+        "errors": dict(errors),
+        "throughput_rps": len(ok) / window if window > 0 else 0.0,
+        "peak_in_flight": peak_in_flight,
+        "latency": latency,
+        "breakdown": {
+            part: percentiles([r[f"{part}_ms"] for r in ok if f"{part}_ms" in r])
+            for part in ("lag", "connect", "queue", "service")
+        },
+        "by_mode": {mode: percentiles(values) for mode, values in by_mode.items()},
+        "slos": verdicts,
+        "slo_passed": all(v["ok"] for v in verdicts.values()),
+    }
+
+
+def print_report(summary):
+    print(f"\n📊 {summary['requests']} requests at {summary['offered_rps']:.1f} req/s offered: "
+          f"{summary['throughput_rps']:.1f} req/s served, {summary['error_rate']:.1%} errors, "
+          f"peak {summary['peak_in_flight']} in flight")
+    print(f"\n  {'':<12}{'n':>7}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    rows = [("latency", summary["latency"])] + list(summary["breakdown"].items()) + \
+           [(f"mode={mode}", stats) for mode, stats in summary["by_mode"].items()]
+    for name, stats in rows:
+        if not stats["n"]:
+            continue
+        print(f"  {name:<12}{stats['n']:>7}{stats['p50_ms']:>8.0f}ms{stats['p95_ms']:>8.0f}ms"
+              f"{stats['p99_ms']:>8.0f}ms{stats['max_ms']:>8.0f}ms")
+    for error, count in summary["errors"].items():
+        print(f"  ❌ {error}: {count}")
+    print()
+    for name, verdict in summary["slos"].items():
+        actual = verdict["actual"]
+        shown = "-" if actual is None else f"{actual:.2%}" if name == "error_rate" else f"{actual:.0f}ms"
+        limit = f"{verdict['limit']:.2%}" if name == "error_rate" else f"{verdict['limit']:.0f}ms"
+        print(f"  {'✅' if verdict['ok'] else '❌'} SLO {name}: {shown} (limit {limit})")
+
+
+def parse_slos(text):
+    """'p95_ms=3000,error_rate=0.01' on top of DEFAULT_SLOS"""
+    slos = dict(DEFAULT_SLOS)
+    for item in filter(None, (part.strip() for part in (text or "").split(","))):
+        name, _, value = item.partition("=")
+        if name not in DEFAULT_SLOS:
+            raise ValueError(f"Unknown SLO {name!r}, choose from {list(DEFAULT_SLOS)}")
+        slos[name] = float(value)
+    return slos
+
+
+def wait_until_ready(url, timeout, process=None):
+    """Poll /health until the RAG system is up (model loading can take a while)"""
+    import requests
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Backend exited with code {process.returncode}")
+        try:
+            if requests.get(f"{url}/health", timeout=2).json().get("rag_ready"):
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(1)
+    raise TimeoutError(f"Backend at {url} not ready after {timeout:.0f}s")
+
+
+def spawn_backend(port, ollama_url):
+    """Start backend/main.py under uvicorn, talking to the given (fake) Ollama"""
+    env = {**os.environ, "OLLAMA_URL": ollama_url}
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=os.path.join(ROOT_DIR, "backend"), env=env, stdout=subprocess.DEVNULL,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the FastAPI /query endpoint at a fixed arrival rate")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Backend to test (ignored with --spawn)")
+    parser.add_argument("--spawn", action="store_true", help="Start the backend locally against a fake Ollama")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the spawned backend")
+    parser.add_argument("--corpus", help="JSONL of /query bodies or text file of queries (default: templates)")
+    parser.add_argument("--rate", type=float, default=2.0, help="Requests per second")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds of load")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Leading seconds excluded from the stats")
+    parser.add_argument("--arrivals", choices=["poisson", "constant"], default="poisson")
+    parser.add_argument("--mode", choices=["auto", "template", "llm"], help="Force an answer mode on every query")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--slo", help="Override SLOs, e.g. p95_ms=3000,error_rate=0.005")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tokens", type=int, default=200, help="Fake Ollama: tokens per answer")
+    parser.add_argument("--token-ms", type=float, default=20.0, help="Fake Ollama: delay per token")
+    parser.add_argument("--prefill-ms-per-1k", type=float, default=300.0, help="Fake Ollama: prefill per 1k prompt tokens")
+    args = parser.parse_args()
+
+    slos = parse_slos(args.slo)
+    corpus = load_corpus(args.corpus) if args.corpus else template_corpus(500, args.seed)
+
+    fake = backend = None
+    url = args.url
+    try:
+        if args.spawn:
+            fake = FakeOllama(tokens=args.tokens, token_ms=args.token_ms,
+                              prefill_ms_per_1k=args.prefill_ms_per_1k).start()
+            backend = spawn_backend(args.port, fake.url)
+            url = f"http://127.0.0.1:{args.port}"
+            print(f"🦙 Fake Ollama on {fake.url}, starting backend on {url}...")
+        wait_until_ready(url, timeout=300 if args.spawn else 10, process=backend)
+
+        print(f"🚀 {args.rate:.1f} req/s for {args.duration:.0f}s against {url}/query ({len(corpus)} queries)")
+        records, peak = asyncio.run(run_load(url, corpus, args.rate, args.duration, args.arrivals,
+                                             args.seed, args.timeout, args.mode))
+    finally:
+        if backend is not None:
+            backend.terminate()
+            backend.wait()
+        if fake is not None:
+            fake.stop()
+
+    summary = summarize(records, args.rate, args.duration, args.warmup, peak, slos)
+    print_report(summary)
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "url": url,
+        "arrivals": args.arrivals,
+        "fake_ollama": {"tokens": args.tokens, "token_ms": args.token_ms,
+                        "prefill_ms_per_1k": args.prefill_ms_per_1k} if args.spawn else None,
+        **summary,
+        "requests_log": records,
+    }
+    path = save_report(report, "api")
+    print(f"\n💾 Report saved to {path}")
+    sys.exit(0 if summary["slo_passed"] else 1)
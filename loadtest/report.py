@@ -0,0 +1,33 @@
+# loadtest/report.py - SHARED LATENCY STATS AND REPORT FILES FOR THE LOAD TESTS
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+LOADTEST_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(LOADTEST_DIR)
+RESULTS_DIR = os.path.join(LOADTEST_DIR, "results")
+
+
+def percentiles(values):
+    """n, p50/p95/p99 and max of a list of millisecond timings"""
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return {"n": 0, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    return {
+        "n": int(len(values)),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "max_ms": float(values.max()),
+    }
+
+
+def save_report(report, prefix):
+    """Write a report to loadtest/results/<prefix>-<timestamp>.json and return its path"""
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{prefix}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return path
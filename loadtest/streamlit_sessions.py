@@ -0,0 +1,312 @@
+# loadtest/streamlit_sessions.py - CONCURRENT SCRIPTED SESSIONS AGAINST THE STREAMLIT APP
+import argparse
+import ast
+import os
+import random
+import resource
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from report import ROOT_DIR, percentiles, save_report
+
+# The root stays on sys.path so Streamlit's per-run insert/remove of the script dir
+# cannot race between sessions, just like `streamlit run app.py` from the repo root
+sys.path[:0] = [ROOT_DIR, os.path.join(ROOT_DIR, "benchmarks")]
+
+from streamlit.testing.v1 import AppTest
+
+from fake_ollama import FakeOllama
+
+PAGES = ["dashboard", "forward_profile", "comparison", "similarity", "scouting_metrics",
+         "performance_trends", "exploration_3d", "scout_assistant"]
+
+CHAT_QUESTIONS = [
+    "Who are the fastest Premier League forwards?",
+    "Find young French talents under €20M",
+    "Best finishers in Serie A",
+    "Cheapest strikers under 23 years old",
+]
+
+
+class CacheCounter:
+    """
+    Counts st.cache_data / st.cache_resource hits and misses per cached function by
+    wrapping Streamlit's CachedFunc hit/miss handlers (internal API, so optional).
+    A session that waited on another session's computation counts as a miss.
+    """
+
+    def __init__(self):
+        self.counts = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self.lock = threading.Lock()
+        self.installed = False
+
+    def install(self):
+        try:
+            from streamlit.runtime.caching.cache_utils import CachedFunc
+        except ImportError:
+            return self
+        counter = self
+        original_hit, original_miss = CachedFunc._handle_cache_hit, CachedFunc._handle_cache_miss
+
+        def handle_hit(self, result):
+            counter._count(self, "hits")
+            return original_hit(self, result)
+
+        def handle_miss(self, *args, **kwargs):
+            counter._count(self, "misses")
+            return original_miss(self, *args, **kwargs)
+
+        CachedFunc._handle_cache_hit, CachedFunc._handle_cache_miss = handle_hit, handle_miss
+        self.installed = True
+        return self
+
+    def _count(self, cached_func, outcome):
+        func = cached_func._info.func
+        name = f"{func.__module__}.{func.__qualname__}"
+        with self.lock:
+            self.counts[name][outcome] += 1
+
+    def report(self):
+        rows = {}
+        for name, counts in sorted(self.counts.items()):
+            total = counts["hits"] + counts["misses"]
+            rows[name] = {**counts, "hit_rate": counts["hits"] / total if total else None}
+        return rows
+
+
+def serialize_script_parsing():
+    """
+    AppTest re-parses app.py on every rerun, and concurrent ast.parse calls can fail with
+    "AST constructor recursion depth mismatch" on CPython 3.11; parse one script at a time.
+    """
+    lock = threading.Lock()
+    original_parse = ast.parse
+
+    def parse(*args, **kwargs):
+        with lock:
+            return original_parse(*args, **kwargs)
+
+    ast.parse = parse
+
+
+def share_apptest_globals():
+    """
+    AppTest assumes one test at a time and resets process-wide state around every run,
+    which breaks sessions still running in other threads. Keep that state stable:
+    - the mock Runtime singleton it installs and then clears stays visible;
+    - `global.appTest` (which records widget values for the test) stays on;
+    - its reset of PagesManager.uses_pages_directory lands on a private subclass, so
+      every run keeps executing the app the same way and widget ids stay consistent.
+    """
+    from streamlit import config
+    from streamlit.runtime.runtime import Runtime
+    from streamlit.testing.v1 import app_test
+    latest = []
+
+    def current(cls):
+        if cls._instance is not None:
+            latest[:] = [cls._instance]
+        return cls._instance or (latest[0] if latest else None)
+
+    def instance(cls):
+        runtime = current(cls)
+        if runtime is None:
+            raise RuntimeError("Runtime hasn't been created!")
+        return runtime
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: current(cls) is not None)
+    config.set_option("global.appTest", True)
+    app_test.PagesManager = type("PagesManager", (app_test.PagesManager,), {})
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _find(elements, label=None):
+    for element in elements:
+        if label is None or element.label == label:
+            return element
+    raise LookupError(f"widget {label!r} not found")
+
+
+class ScoutSession:
+    """One simulated scout: navigates every page and uses its main controls, timing each rerun"""
+
+    def __init__(self, session_id, leagues, pages, seed, timeout):
+        self.id = session_id
+        self.rng = random.Random(seed)
+        self.leagues = leagues
+        self.pages = pages
+        self.timeout = timeout
+        self.timings = []   # (page, action, ms, error)
+        self.at = None
+
+    def _rerun(self, page, action, interact=None):
+        start = time.perf_counter()
+        error = None
+        try:
+            if interact is not None:
+                interact(self.at)
+            self.at.run(timeout=self.timeout)
+            if self.at.exception:
+                error = self.at.exception[0].message[:200]
+            elif self.at.error:
+                # app.py reports page failures with st.error and falls back to the dashboard
+                error = self.at.error[0].value[:200]
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"[:200]
+        self.timings.append((page, action, (time.perf_counter() - start) * 1000, error))
+
+    def _navigate(self, page):
+        self._rerun(page, "open", lambda at: at.button(key=f"sidebar_{page}").click())
+
+    def run(self):
+        self.at = AppTest.from_file(os.path.join(ROOT_DIR, "app.py"), default_timeout=self.timeout)
+        self._rerun("dashboard", "open")
+        for page in self.pages:
+            if page == "dashboard":
+                self._rerun(page, "preview", lambda at: _find(at.checkbox, "📋 Preview Database").check())
+                continue
+            self._navigate(page)
+            getattr(self, f"_use_{page}")(page)
+        return self.timings
+
+    def _pick(self, widget, k=None):
+        """Random option(s) of a player picker (labels disambiguate namesakes, so use the widget's own)"""
+        options = [option for option in widget.options if option]
+        return self.rng.sample(options, k) if k else self.rng.choice(options)
+
+    def _select(self, widget):
+        widget.set_value(self._pick(widget))
+
+    def _use_forward_profile(self, page):
+        self._rerun(page, "select player", lambda at: self._select(_find(at.selectbox, "Choose a player:")))
+        self._rerun(page, "peer group", lambda at: at.radio(key="fp_peer_group").set_value("league"))
+
+    def _use_comparison(self, page):
+        self._rerun(page, "player 1", lambda at: self._select(at.selectbox(key="p1")))
+        self._rerun(page, "player 2", lambda at: self._select(at.selectbox(key="p2")))
+        self._rerun(page, "shortlist mode", lambda at: at.radio(key="compare_mode").set_value("📋 Shortlist (up to 20)"))
+        self._rerun(page, "shortlist", lambda at: at.multiselect(key="shortlist").set_value(
+            self._pick(at.multiselect(key="shortlist"), 5)))
+
+    def _use_similarity(self, page):
+        self._rerun(page, "select player", lambda at: self._select(
+            _find(at.selectbox, "Choose a player to find similar players:")))
+        self._rerun(page, "top n", lambda at: _find(at.slider, "🔢 Number of similar players").set_value(15))
+
+    def _use_scouting_metrics(self, page):
+        self._rerun(page, "x metric", lambda at: self._select(_find(at.selectbox, "📈 X-Axis Metric")))
+
+    def _use_performance_trends(self, page):
+        def pick_leagues(at):
+            _find(at.multiselect, "Choose leagues to compare:").set_value(self.rng.sample(self.leagues, 3))
+            _find(at.button, "🚀 Analyze Trends").click()
+        self._rerun(page, "analyze leagues", pick_leagues)
+
+    def _use_exploration_3d(self, page):
+        self._rerun(page, "league mode", lambda at: at.button(key="mode2").click())
+        self._rerun(page, "x feature", lambda at: at.selectbox(key="x_feat").set_value("SHOOTING"))
+
+    def _use_scout_assistant(self, page):
+        def ask(at):
+            at.text_input[0].input(self.rng.choice(CHAT_QUESTIONS))
+            _find(at.button, "🚀 Send").click()
+        self._rerun(page, "chat message", ask)
+
+
+def run_load(sessions, iterations, pages, seed, timeout):
+    df = pd.read_csv(os.environ.get("SCOUT_DATA_PATH", os.path.join(ROOT_DIR, "forwards_clean_with_market_values_updated.csv")))
+    leagues = df["League"].dropna().unique().tolist()
+
+    # Chat goes to a local stub LLM when the RAG backend is available
+    fake = FakeOllama(tokens=120, token_ms=5.0).start()
+    os.environ["OLLAMA_URL"] = fake.url
+    cache_counter = CacheCounter().install()
+    serialize_script_parsing()
+    share_apptest_globals()
+
+    start = time.perf_counter()
+    timings = []
+    try:
+        with ThreadPoolExecutor(max_workers=sessions) as pool:
+            futures = [
+                pool.submit(ScoutSession(i, leagues, pages, seed + i, timeout).run)
+                for i in range(sessions * iterations)
+            ]
+            for future in futures:
+                timings.extend(future.result())
+    finally:
+        fake.stop()
+    wall = time.perf_counter() - start
+
+    by_page = defaultdict(list)
+    errors = defaultdict(list)
+    for page, action, ms, error in timings:
+        by_page[page].append(ms)
+        if error:
+            errors[page].append(f"{action}: {error}")
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "concurrent_sessions": sessions,
+        "total_sessions": sessions * iterations,
+        "rows": len(df),
+        "wall_seconds": wall,
+        "reruns": len(timings),
+        "reruns_per_second": len(timings) / wall,
+        "peak_rss_mb": peak_rss_mb(),
+        "pages": {page: {**percentiles(values), "errors": len(errors[page])} for page, values in by_page.items()},
+        "error_samples": {page: messages[:3] for page, messages in errors.items()},
+        "cache": cache_counter.report() if cache_counter.installed else None,
+    }
+
+
+def print_report(report):
+    print(f"\n📊 {report['total_sessions']} sessions ({report['concurrent_sessions']} concurrent) on "
+          f"{report['rows']:,} players: {report['reruns']} reruns in {report['wall_seconds']:.1f}s "
+          f"({report['reruns_per_second']:.1f}/s), peak RSS {report['peak_rss_mb']:.0f} MB")
+    print(f"\n  {'page':<20}{'reruns':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}{'errors':>8}")
+    for page, stats in report["pages"].items():
+        print(f"  {page:<20}{stats['n']:>8}{stats['p50_ms']:>9.0f}ms{stats['p95_ms']:>8.0f}ms"
+              f"{stats['p99_ms']:>8.0f}ms{stats['max_ms']:>8.0f}ms{stats['errors']:>8}")
+    for page, messages in report["error_samples"].items():
+        for message in messages:
+            print(f"  ❌ {page}: {message}")
+    if report["cache"]:
+        print(f"\n  {'cached function':<55}{'hits':>8}{'misses':>8}{'hit rate':>10}")
+        for name, stats in report["cache"].items():
+            rate = f"{stats['hit_rate']:.0%}" if stats["hit_rate"] is not None else "-"
+            print(f"  {name[-55:]:<55}{stats['hits']:>8}{stats['misses']:>8}{rate:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the Streamlit app with concurrent scripted sessions")
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent sessions")
+    parser.add_argument("--iterations", type=int, default=2, help="Sessions run per concurrent slot")
+    parser.add_argument("--pages", default=",".join(PAGES), help="Comma-separated pages each session visits")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds allowed per rerun")
+    args = parser.parse_args()
+
+    pages = [page.strip() for page in args.pages.split(",") if page.strip()]
+    unknown = [page for page in pages if page not in PAGES]
+    if unknown:
+        parser.error(f"unknown pages {unknown}, choose from {PAGES}")
+
+    # Pages open the data file relative to the repository root
+    os.chdir(ROOT_DIR)
+    report = run_load(args.sessions, args.iterations, pages, args.seed, args.timeout)
+    print_report(report)
+
+    path = save_report(report, "streamlit")
+    print(f"\n💾 Report saved to {path}")
@@ -0,0 +1,178 @@
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+import streamlit as st
+
+# Level-of-detail modes for large scatter plots
+LOD_MODES = {
+    "off": "Off (every player)",
+    "grid": "Grid thinning",
+    "density": "Density-aware sampling",
+    "aggregate": "Hexbin / voxel summary",
+}
+
+DEFAULT_POINT_BUDGET = 3000
+
+
+def _cell_ids(coords, cells_per_axis):
+    """Integer cell id of every point on a regular grid spanning the data"""
+    low = coords.min(axis=0)
+    span = np.ptp(coords, axis=0)
+    span[span == 0] = 1.0
+    cells = np.minimum(((coords - low) / span * cells_per_axis).astype(np.int64), cells_per_axis - 1)
+    ids = np.zeros(len(coords), dtype=np.int64)
+    for axis in range(coords.shape[1]):
+        ids = ids * cells_per_axis + cells[:, axis]
+    return ids
+
+
+def grid_sample(coords, budget, keep=None, seed=0):
+    """
+    One representative per occupied grid cell, with the grid sized so the number
+    of occupied cells lands near the budget. Points in `keep` are always returned.
+    """
+    n, dims = coords.shape
+    keep = np.asarray(keep if keep is not None else [], dtype=np.int64)
+    remaining = max(budget - len(keep), 0)
+    if n <= budget or remaining == 0:
+        return np.union1d(keep, np.arange(n)) if n <= budget else keep
+
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(n)
+    cells_per_axis = max(2, int(np.ceil(remaining ** (1 / dims))))
+    # Refine the grid until enough cells are occupied (data rarely fills the whole grid)
+    for _ in range(12):
+        ids = _cell_ids(coords[order], cells_per_axis)
+        _, first = np.unique(ids, return_index=True)
+        if len(first) >= remaining:
+            break
+        cells_per_axis = int(cells_per_axis * 1.5) + 1
+    picked = order[first]
+    if len(picked) > remaining:
+        picked = rng.choice(picked, remaining, replace=False)
+    return np.union1d(keep, picked)
+
+
+def density_sample(coords, budget, keep=None, seed=0, alpha=1.0):
+    """
+    Random sample weighted by 1 / local density (cell count ** alpha), so sparse
+    regions and outliers survive while dense clusters are thinned.
+    """
+    n, dims = coords.shape
+    keep = np.asarray(keep if keep is not None else [], dtype=np.int64)
+    remaining = max(budget - len(keep), 0)
+    if n <= budget:
+        return np.arange(n)
+    if remaining == 0:
+        return keep
+
+    cells_per_axis = max(2, int(np.ceil(np.sqrt(n) ** (1 / dims))))
+    ids = _cell_ids(coords, cells_per_axis)
+    _, inverse, counts = np.unique(ids, return_inverse=True, return_counts=True)
+    weights = 1.0 / counts[inverse] ** alpha
+    weights[keep] = 0.0
+    weights /= weights.sum()
+    rng = np.random.default_rng(seed)
+    picked = rng.choice(n, size=min(remaining, int(np.count_nonzero(weights))), replace=False, p=weights)
+    return np.union1d(keep, picked)
+
+
+def hexbin(x, y, gridsize):
+    """Hexagonal binning: (centre_x, centre_y, count) for every occupied hexagon"""
+    x0, y0 = x.min(), y.min()
+    sx = (np.ptp(x) or 1.0) / gridsize
+    sy = (np.ptp(y) or 1.0) / gridsize * np.sqrt(3)
+    px, py = (x - x0) / sx, (y - y0) / sy
+
+    # Two offset rectangular lattices; each point goes to the nearer lattice centre
+    ix1, iy1 = np.rint(px), np.rint(py)
+    ix2, iy2 = np.floor(px) + 0.5, np.floor(py) + 0.5
+    d1 = (px - ix1) ** 2 + 3 * (py - iy1) ** 2
+    d2 = (px - ix2) ** 2 + 3 * (py - iy2) ** 2
+    use_first = d1 <= d2
+    cx = np.where(use_first, ix1, ix2)
+    cy = np.where(use_first, iy1, iy2)
+
+    centres, counts = np.unique(np.column_stack([cx, cy]), axis=0, return_counts=True)
+    return centres[:, 0] * sx + x0, centres[:, 1] * sy + y0, counts
+
+
+def voxel_aggregate(coords, budget):
+    """Mean position and count of the points in every occupied voxel (grid sized to the budget)"""
+    cells_per_axis = max(2, int(np.ceil(budget ** (1 / coords.shape[1]))))
+    ids = _cell_ids(coords, cells_per_axis)
+    _, inverse, counts = np.unique(ids, return_inverse=True, return_counts=True)
+    sums = np.zeros((len(counts), coords.shape[1]))
+    np.add.at(sums, inverse, coords)
+    return sums / counts[:, None], counts
+
+
+def reduce_points(df, columns, budget=DEFAULT_POINT_BUDGET, mode="grid", keep_index=None, seed=0):
+    """
+    Thin or aggregate a frame for plotting.
+
+    Returns (points, summary, info): `points` is the subset of rows to draw as
+    individual markers (always including `keep_index`), `summary` is a frame of
+    aggregated cells with a 'count' column in aggregate mode (None otherwise).
+    """
+    keep_index = [idx for idx in (keep_index or []) if idx in df.index]
+    info = {"mode": mode, "input_points": len(df), "budget": budget}
+    if mode == "off" or len(df) <= budget or len(columns) < 2:
+        info.update(output_points=len(df), summary_cells=0)
+        return df, None, info
+
+    coords = df[columns].to_numpy(dtype=float)
+    keep = df.index.get_indexer(keep_index)
+
+    summary = None
+    if mode == "aggregate":
+        if len(columns) == 2:
+            gridsize = max(10, int(np.sqrt(budget)))
+            cx, cy, counts = hexbin(coords[:, 0], coords[:, 1], gridsize)
+            summary = pd.DataFrame({columns[0]: cx, columns[1]: cy, "count": counts})
+        else:
+            centres, counts = voxel_aggregate(coords, budget)
+            summary = pd.DataFrame(centres, columns=columns)
+            summary["count"] = counts
+        points = df.iloc[np.sort(keep)].copy()
+    elif mode == "density":
+        points = df.iloc[density_sample(coords, budget, keep, seed)].copy()
+    else:
+        points = df.iloc[grid_sample(coords, budget, keep, seed)].copy()
+
+    info.update(output_points=len(points), summary_cells=0 if summary is None else len(summary))
+    return points, summary, info
+
+
+def render_lod_controls(key, labels, default_budget=DEFAULT_POINT_BUDGET):
+    """Expander with LOD mode, point budget and players to always keep; returns (mode, budget, highlighted labels)"""
+    with st.expander("⚙️ Level of Detail", expanded=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            mode = st.selectbox("Mode", list(LOD_MODES), format_func=LOD_MODES.get, key=f"{key}_lod_mode")
+        with col2:
+            budget = st.slider("Point budget", 500, 50000, default_budget, 500, key=f"{key}_lod_budget",
+                               help="Maximum markers sent to the browser; dense regions are thinned or aggregated")
+        highlighted = st.multiselect("Always show (highlight) players", labels, key=f"{key}_lod_highlight",
+                                     max_selections=25)
+    return mode, budget, highlighted
+
+
+def figure_payload_bytes(fig):
+    """Size of the figure JSON that Streamlit ships to the browser (`fig` may already be that size)"""
+    if isinstance(fig, int):
+        return fig
+    return len(pio.to_json(fig, validate=False))
+
+
+def render_lod_report(info, fig, started):
+    """One-line report of points drawn, payload size and build/render time"""
+    payload = figure_payload_bytes(fig)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    cells = f" + {info['summary_cells']} aggregated cells" if info.get("summary_cells") else ""
+    st.caption(
+        f"🔬 LOD {LOD_MODES[info['mode']].lower()}: {info['output_points']:,} of {info['input_points']:,} "
+        f"players drawn{cells} · payload {payload / 1024:.0f} KB · built and rendered in {elapsed_ms:.0f} ms"
+    )
@@ -4,15 +4,204 @@ import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
+import plotly.express as px
+import time
+from percentiles import get_percentile_cube, PEER_GROUPS, ordinal
+from utils import dataset_version, get_player_index, read_table
+import telemetry
+import figure_cache
+
+PAGE = "comparison"
 
-@st.cache_data
 def load_data():
+    """The player table of the dataset snapshot this session is pinned to"""
     try:
-        return pd.read_csv('forwards_clean_with_market_values_updated.csv')
+        return read_table()
     except FileNotFoundError:
         st.error("Data file not found.")
         return pd.DataFrame()
 
+SKILLS = ["PACE","SHOOTING","PASSING","DRIBBLING","PHYSICAL","AERIAL","MENTAL"]
+MAX_SHORTLIST = 20
+TRACE_COLORS = px.colors.qualitative.Plotly + px.colors.qualitative.D3
+
+def compare_players(df, rows, attrs):
+    """
+    Vectorised N-player comparison in one pass over an (n_players, n_attrs) matrix.
+    Returns the matrix, deltas to the shortlist best and per-attribute ranks (1 = best).
+    """
+    matrix = df.loc[rows, attrs].to_numpy(dtype=float)
+    filled = np.where(np.isnan(matrix), -np.inf, matrix)
+    order = np.argsort(-filled, axis=0, kind="stable")
+    ranks = np.empty_like(order)
+    ranks[order, np.arange(len(attrs))] = np.arange(1, len(rows) + 1)[:, None]
+    return {
+        "matrix": matrix,
+        "delta_best": matrix - np.nanmax(matrix, axis=0),
+        "ranks": ranks
+    }
+
+def shortlist_figure(selected, skills, percentiles):
+    """One multi-trace radar of skill percentiles for the whole shortlist"""
+    theta = skills + [skills[0]]
+    closed = np.hstack([percentiles, percentiles[:, :1]])
+    fig = go.Figure()
+    for i, label in enumerate(selected):
+        color = TRACE_COLORS[i % len(TRACE_COLORS)]
+        fig.add_trace(go.Scatterpolar(
+            r=closed[i], theta=theta, name=label, fill='toself', opacity=0.55 if len(selected) <= 5 else 0.35,
+            line=dict(color=color, width=3), marker=dict(size=6, color=color)
+        ))
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(visible=True, range=[0, 100], tickfont=dict(size=12, color='white'),
+                            gridcolor='rgba(255,255,255,0.3)', dtick=20),
+            angularaxis=dict(tickfont=dict(size=14, color='white', family='Inter'),
+                             gridcolor='rgba(255,255,255,0.3)'),
+            bgcolor='rgba(10,10,11,0.8)'
+        ),
+        template="plotly_dark",
+        legend=dict(orientation="h", yanchor="bottom", y=-0.25, xanchor="center", x=0.5,
+                    font=dict(size=12, color='white', family='Inter')),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=650,
+        margin=dict(t=40, b=140, l=50, r=50)
+    )
+    return fig
+
+def head_to_head_figure(p1, p2, skills, pct_a, pct_b):
+    """Two-player radar of skill percentiles, each against their own peer group"""
+    vals_a_scaled = [pct_a[s] for s in skills] + [pct_a[skills[0]]]
+    vals_b_scaled = [pct_b[s] for s in skills] + [pct_b[skills[0]]]
+
+    fig = go.Figure()
+
+    # Player 1 - Enhanced styling
+    fig.add_trace(go.Scatterpolar(
+        r=vals_a_scaled,
+        theta=skills + [skills[0]],
+        fill='toself',
+        name=p1,
+        line=dict(color='#00c6ff', width=4),
+        fillcolor='rgba(0,198,255,0.4)',
+        marker=dict(size=8, color='#00c6ff', symbol='circle')
+    ))
+
+    # Player 2 - Enhanced styling
+    fig.add_trace(go.Scatterpolar(
+        r=vals_b_scaled,
+        theta=skills + [skills[0]],
+        fill='toself',
+        name=p2,
+        line=dict(color='#ff4757', width=4),
+        fillcolor='rgba(255,71,87,0.4)',
+        marker=dict(size=8, color='#ff4757', symbol='circle')
+    ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 100],
+                tickfont=dict(size=14, color='white'),
+                gridcolor='rgba(255,255,255,0.3)',
+                linecolor='rgba(255,255,255,0.4)',
+                tickmode='linear',
+                tick0=0,
+                dtick=20,  # 0, 20, 40, 60, 80, 100
+                showticklabels=True
+            ),
+            angularaxis=dict(
+                tickfont=dict(size=16, color='white', family='Inter'),
+                linecolor='rgba(255,255,255,0.4)',
+                gridcolor='rgba(255,255,255,0.3)'
+            ),
+            bgcolor='rgba(10,10,11,0.8)'
+        ),
+        template="plotly_dark",
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=-0.15,
+            xanchor="center",
+            x=0.5,
+            font=dict(size=14, color='white', family='Inter'),
+            bgcolor='rgba(0,0,0,0.5)',
+            bordercolor='rgba(255,255,255,0.2)',
+            borderwidth=1
+        ),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=600,
+        margin=dict(t=50, b=100, l=50, r=50)
+    )
+    return fig
+
+@telemetry.timed("shortlist comparison")
+def render_shortlist_comparison(df, cube, player_index, position=None):
+    """Compare a shortlist of up to MAX_SHORTLIST players with one radar and one sortable table"""
+    st.markdown("### 👥 Build a Shortlist")
+    labels = player_index.labels_for(position)
+    selected = st.multiselect(
+        f"Players (2-{MAX_SHORTLIST})", labels, key="shortlist", max_selections=MAX_SHORTLIST,
+        placeholder="Start typing a player name..."
+    )
+    if len(selected) < 2:
+        st.info("Select at least two players to compare.")
+        return
+
+    peer_group = st.radio(
+        "Percentiles relative to:", list(PEER_GROUPS), horizontal=True,
+        format_func=lambda g: PEER_GROUPS[g].title(), key="shortlist_peer_group"
+    )
+
+    start = time.perf_counter()
+    rows = [player_index.row(label) for label in selected]
+    skills = [s for s in SKILLS if s in df.columns]
+    ranked_attrs = skills + [c for c in ["OVR"] if c in df.columns]
+
+    result = compare_players(df, rows, ranked_attrs)
+    percentiles = cube.matrix(rows, peer_group, skills)
+
+    # One multi-trace radar for the whole shortlist
+    st.markdown("### 📊 Shortlist Radar")
+    figure_cache.cached_chart(
+        PAGE, "shortlist_radar", {"players": selected, "peer_group": peer_group, "skills": skills},
+        lambda: shortlist_figure(selected, skills, percentiles), use_container_width=True
+    )
+    figure_cache.get_figure_cache().record_view(*selected)
+
+    # One sortable table: identity, values, percentiles, deltas and shortlist ranks
+    st.markdown("### 📋 Shortlist Table")
+    info = df.loc[rows]
+    table = pd.DataFrame({
+        "Player": selected,
+        "Team": info.get("Team", pd.Series("N/A", index=info.index)).to_numpy(),
+        "Age": info["Age"].to_numpy() if "Age" in info else np.nan,
+        "Value (€M)": info["market_value"].round(1).to_numpy() if "market_value" in info else np.nan,
+    })
+    for j, attr in enumerate(ranked_attrs):
+        table[attr] = result["matrix"][:, j].round(2)
+    for j, skill in enumerate(skills):
+        table[f"{skill} pct"] = percentiles[:, j]
+    table["OVR Δ best"] = result["delta_best"][:, ranked_attrs.index("OVR")].round(2) if "OVR" in ranked_attrs else np.nan
+    table["Avg Rank"] = result["ranks"].mean(axis=1).round(2)
+    table["Wins"] = (result["ranks"] == 1).sum(axis=1)
+    table = table.sort_values("Avg Rank").reset_index(drop=True)
+
+    st.dataframe(
+        table,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Avg Rank": st.column_config.NumberColumn("Avg Rank", help="Mean rank within the shortlist across skills and OVR (1 = best)"),
+            "Wins": st.column_config.NumberColumn("Wins", help="Attributes where the player is best in the shortlist"),
+            "OVR Δ best": st.column_config.NumberColumn("OVR Δ best", help="Gap to the highest OVR in the shortlist"),
+        }
+    )
+    st.caption(f"⚡ {len(selected)} players compared and charted in {(time.perf_counter() - start) * 1000:.0f} ms")
+
 def main():
     # Enhanced CSS for comparison page
     st.markdown("""
@@ -159,6 +348,7 @@ def main():
     }
     </style>
     """, unsafe_allow_html=True)
+    telemetry.mark("css")
     
     # Page Header
     st.markdown('''
@@ -169,6 +359,7 @@ def main():
     ''', unsafe_allow_html=True)
     
     df = load_data()
+    telemetry.mark("load data")
     if df.empty:
         return
 
@@ -177,6 +368,12 @@ def main():
         st.error("Required columns (Position, Name) missing.")
         return
 
+    # Percentiles and the name index are precomputed once for the full dataset (before any filtering)
+    version = dataset_version()
+    cube = get_percentile_cube(df)
+    player_index = get_player_index(df)
+    telemetry.mark("indexes")
+
     # Enhanced filter section
     st.markdown("### 🎯 Select Position")
     with st.form("comp_filters", clear_on_submit=False):
@@ -189,245 +386,197 @@ def main():
         st.warning("No players found for the selected position.")
         return
 
-    # Player selection with FIXED VS indicator
-    st.markdown("### 👥 Select Players to Compare")
+    compare_mode = st.radio(
+        "Comparison mode", ["⚔️ Head-to-Head", "📋 Shortlist (up to 20)"], horizontal=True, key="compare_mode"
+    )
+
+    if compare_mode.startswith("📋"):
+        render_shortlist_comparison(df, cube, player_index, pos if submitted else None)
+    else:
+        # Player selection with FIXED VS indicator
+        st.markdown("### 👥 Select Players to Compare")
     
-    col1, col2, col3 = st.columns([2, 1, 2])
+        col1, col2, col3 = st.columns([2, 1, 2])
     
-    names = [""] + list(df["Name"].sort_values())
+        names = [""] + player_index.labels_for(pos if submitted else None)
     
-    with col1:
-        p1 = st.selectbox("First Player", names, key="p1", label_visibility="collapsed")
+        with col1:
+            p1 = st.selectbox("First Player", names, key="p1", label_visibility="collapsed")
     
-    with col2:
-        st.markdown('''
-        <div class="vs-indicator">
-            <span style="font-size: 1.5rem;">⚡</span>
-            <span class="vs-text">VS</span>
-            <span style="font-size: 1.5rem;">⚡</span>
-        </div>
-        ''', unsafe_allow_html=True)
+        with col2:
+            st.markdown('''
+            <div class="vs-indicator">
+                <span style="font-size: 1.5rem;">⚡</span>
+                <span class="vs-text">VS</span>
+                <span style="font-size: 1.5rem;">⚡</span>
+            </div>
+            ''', unsafe_allow_html=True)
     
-    with col3:
-        p2 = st.selectbox("Second Player", names, key="p2", label_visibility="collapsed")
+        with col3:
+            p2 = st.selectbox("Second Player", names, key="p2", label_visibility="collapsed")
 
-    if p1 and p2:
-        if p1 == p2:
-            st.warning("⚠️ Please choose two different players for comparison.")
-        else:
-            a = df[df["Name"] == p1].iloc[0]
-            b = df[df["Name"] == p2].iloc[0]
+        if p1 and p2:
+            if p1 == p2:
+                st.warning("⚠️ Please choose two different players for comparison.")
+            else:
+                a = df.loc[player_index.row(p1)]
+                b = df.loc[player_index.row(p2)]
             
-            # Enhanced Player Cards
-            st.markdown("### 🏆 Player Overview")
-            col1, col2 = st.columns(2)
+                # Enhanced Player Cards
+                st.markdown("### 🏆 Player Overview")
+                col1, col2 = st.columns(2)
             
-            with col1:
-                ovr_a = a.get('OVR', 0)
-                mv_a = a.get('market_value', 0)
-                age_a = a.get('Age', 'N/A')
-                st.markdown(f'''
-                <div class="player-card">
-                    <div class="player-name">{p1}</div>
-                    <div class="player-stats">
-                        <div class="stat-item">
-                            <div class="stat-value">{ovr_a:.2f}</div>
-                            <div class="stat-label">Overall</div>
-                        </div>
-                        <div class="stat-item">
-                            <div class="stat-value">€{mv_a:.1f}M</div>
-                            <div class="stat-label">Value</div>
-                        </div>
-                        <div class="stat-item">
-                            <div class="stat-value">{age_a}</div>
-                            <div class="stat-label">Age</div>
+                with col1:
+                    ovr_a = a.get('OVR', 0)
+                    mv_a = a.get('market_value', 0)
+                    age_a = a.get('Age', 'N/A')
+                    st.markdown(f'''
+                    <div class="player-card">
+                        <div class="player-name">{p1}</div>
+                        <div class="player-stats">
+                            <div class="stat-item">
+                                <div class="stat-value">{ovr_a:.2f}</div>
+                                <div class="stat-label">Overall</div>
+                            </div>
+                            <div class="stat-item">
+                                <div class="stat-value">€{mv_a:.1f}M</div>
+                                <div class="stat-label">Value</div>
+                            </div>
+                            <div class="stat-item">
+                                <div class="stat-value">{age_a}</div>
+                                <div class="stat-label">Age</div>
+                            </div>
                         </div>
                     </div>
-                </div>
-                ''', unsafe_allow_html=True)
+                    ''', unsafe_allow_html=True)
                     
-            with col2:
-                ovr_b = b.get('OVR', 0)
-                mv_b = b.get('market_value', 0)
-                age_b = b.get('Age', 'N/A')
-                st.markdown(f'''
-                <div class="player-card">
-                    <div class="player-name">{p2}</div>
-                    <div class="player-stats">
-                        <div class="stat-item">
-                            <div class="stat-value">{ovr_b:.2f}</div>
-                            <div class="stat-label">Overall</div>
-                        </div>
-                        <div class="stat-item">
-                            <div class="stat-value">€{mv_b:.1f}M</div>
-                            <div class="stat-label">Value</div>
-                        </div>
-                        <div class="stat-item">
-                            <div class="stat-value">{age_b}</div>
-                            <div class="stat-label">Age</div>
+                with col2:
+                    ovr_b = b.get('OVR', 0)
+                    mv_b = b.get('market_value', 0)
+                    age_b = b.get('Age', 'N/A')
+                    st.markdown(f'''
+                    <div class="player-card">
+                        <div class="player-name">{p2}</div>
+                        <div class="player-stats">
+                            <div class="stat-item">
+                                <div class="stat-value">{ovr_b:.2f}</div>
+                                <div class="stat-label">Overall</div>
+                            </div>
+                            <div class="stat-item">
+                                <div class="stat-value">€{mv_b:.1f}M</div>
+                                <div class="stat-label">Value</div>
+                            </div>
+                            <div class="stat-item">
+                                <div class="stat-value">{age_b}</div>
+                                <div class="stat-label">Age</div>
+                            </div>
                         </div>
                     </div>
-                </div>
-                ''', unsafe_allow_html=True)
+                    ''', unsafe_allow_html=True)
 
-            # CORRECTLY SCALED Radar Chart
-            base_skills = ["PACE","SHOOTING","PASSING","DRIBBLING","PHYSICAL","AERIAL","MENTAL"]
-            skills = [s for s in base_skills if s in df.columns]
+                # CORRECTLY SCALED Radar Chart
+                base_skills = ["PACE","SHOOTING","PASSING","DRIBBLING","PHYSICAL","AERIAL","MENTAL"]
+                skills = [s for s in base_skills if s in df.columns]
 
-            if skills:
-                st.markdown("### 📊 Skills Comparison Radar")
-                
-                # Get raw standardized values (already scaled by StandardScaler)
-                vals_a_raw = [a[s] for s in skills]
-                vals_b_raw = [b[s] for s in skills]
-                
-                # Transform standardized values to 0-100 scale for better visualization
-                # StandardScaler typically produces values roughly in [-3, +3] range
-                # We'll map [-3, +3] to [0, 100] for better radar chart visualization
-                def scale_standardized_to_radar(val):
-                    # Clamp to reasonable range and scale to 0-100
-                    clamped = max(-3.5, min(3.5, val))  # Clamp to [-3.5, 3.5]
-                    return ((clamped + 3.5) / 7.0) * 100  # Map to [0, 100]
-                
-                vals_a_scaled = [scale_standardized_to_radar(val) for val in vals_a_raw] + [scale_standardized_to_radar(vals_a_raw[0])]
-                vals_b_scaled = [scale_standardized_to_radar(val) for val in vals_b_raw] + [scale_standardized_to_radar(vals_b_raw[0])]
-                
-                fig = go.Figure()
+                if skills:
+                    st.markdown("### 📊 Skills Comparison Radar")
                 
-                # Player 1 - Enhanced styling
-                fig.add_trace(go.Scatterpolar(
-                    r=vals_a_scaled,
-                    theta=skills + [skills[0]],
-                    fill='toself',
-                    name=p1,
-                    line=dict(color='#00c6ff', width=4),
-                    fillcolor='rgba(0,198,255,0.4)',
-                    marker=dict(size=8, color='#00c6ff', symbol='circle')
-                ))
-                
-                # Player 2 - Enhanced styling
-                fig.add_trace(go.Scatterpolar(
-                    r=vals_b_scaled,
-                    theta=skills + [skills[0]],
-                    fill='toself',
-                    name=p2,
-                    line=dict(color='#ff4757', width=4),
-                    fillcolor='rgba(255,71,87,0.4)',
-                    marker=dict(size=8, color='#ff4757', symbol='circle')
-                ))
+                    peer_group = st.radio(
+                        "Percentiles relative to:", list(PEER_GROUPS), horizontal=True,
+                        format_func=lambda g: PEER_GROUPS[g].title(), key="comp_peer_group"
+                    )
                 
-                fig.update_layout(
-                    polar=dict(
-                        radialaxis=dict(
-                            visible=True,
-                            range=[0, 100],
-                            tickfont=dict(size=14, color='white'),
-                            gridcolor='rgba(255,255,255,0.3)',
-                            linecolor='rgba(255,255,255,0.4)',
-                            tickmode='linear',
-                            tick0=0,
-                            dtick=20,  # 0, 20, 40, 60, 80, 100
-                            showticklabels=True
-                        ),
-                        angularaxis=dict(
-                            tickfont=dict(size=16, color='white', family='Inter'),
-                            linecolor='rgba(255,255,255,0.4)',
-                            gridcolor='rgba(255,255,255,0.3)'
-                        ),
-                        bgcolor='rgba(10,10,11,0.8)'
-                    ),
-                    template="plotly_dark",
-                    legend=dict(
-                        orientation="h",
-                        yanchor="bottom",
-                        y=-0.15,
-                        xanchor="center",
-                        x=0.5,
-                        font=dict(size=14, color='white', family='Inter'),
-                        bgcolor='rgba(0,0,0,0.5)',
-                        bordercolor='rgba(255,255,255,0.2)',
-                        borderwidth=1
-                    ),
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    height=600,
-                    margin=dict(t=50, b=100, l=50, r=50)
-                )
+                    # Raw standardized values (already scaled by StandardScaler)
+                    vals_a_raw = [a[s] for s in skills]
+                    vals_b_raw = [b[s] for s in skills]
                 
-                st.plotly_chart(fig, use_container_width=True)
+                    # Radar plots each player's percentile within their own peer group (precomputed, O(1) lookup)
+                    pct_a = cube.profile(a.name, peer_group, skills)
+                    pct_b = cube.profile(b.name, peer_group, skills)
+                    figure_cache.cached_chart(
+                        PAGE, "head_to_head_radar", {"players": [p1, p2], "peer_group": peer_group, "skills": skills},
+                        lambda: head_to_head_figure(p1, p2, skills, pct_a, pct_b),
+                        version, use_container_width=True
+                    )
+                    figure_cache.get_figure_cache().record_view(p1, p2)
                 
-                # Explanation of scaling
-                st.markdown('''
-                <div class="radar-info">
-                    <strong>📘 Radar Chart Scale:</strong> Values are StandardScaler normalized (mean=0, std=1) then mapped to 0-100 for visualization.
-                    Center (50) = Average, Outer edge (100) = Excellent, Inner (0) = Below average
-                </div>
-                ''', unsafe_allow_html=True)
+                    # Explanation of scaling
+                    st.markdown(f'''
+                    <div class="radar-info">
+                        <strong>📘 Radar Chart Scale:</strong> Percentile of each player within {PEER_GROUPS[peer_group]}
+                        ({cube.group_label(a.name, peer_group) if peer_group != "global" else "all forwards"} for {p1},
+                        {cube.group_label(b.name, peer_group) if peer_group != "global" else "all forwards"} for {p2}).
+                        50 = peer median, 100 = best in group
+                    </div>
+                    ''', unsafe_allow_html=True)
                 
-                # Show actual standardized values in a table
-                st.markdown("**📋 Standardized Values (Z-scores):**")
-                skills_data = {
-                    "Skill": skills,
-                    p1: [f"{val:.2f}" for val in vals_a_raw],
-                    p2: [f"{val:.2f}" for val in vals_b_raw]
-                }
-                skills_df = pd.DataFrame(skills_data)
-                st.dataframe(skills_df, use_container_width=True, hide_index=True)
+                    # Show actual standardized values in a table
+                    st.markdown("**📋 Standardized Values (Z-scores) and Peer Percentiles:**")
+                    skills_data = {
+                        "Skill": skills,
+                        p1: [f"{val:.2f}" for val in vals_a_raw],
+                        f"{p1} pct": [ordinal(pct_a[s]) for s in skills],
+                        p2: [f"{val:.2f}" for val in vals_b_raw],
+                        f"{p2} pct": [ordinal(pct_b[s]) for s in skills]
+                    }
+                    skills_df = pd.DataFrame(skills_data)
+                    st.dataframe(skills_df, use_container_width=True, hide_index=True)
 
-            # Enhanced Comparison Table
-            st.markdown("### 📋 Detailed Comparison")
+                # Enhanced Comparison Table
+                st.markdown("### 📋 Detailed Comparison")
             
-            # Comparison attributes
-            attrs = ["Age","Height","Weight","OVR","market_value"] + skills
+                # Comparison attributes
+                attrs = ["Age","Height","Weight","OVR","market_value"] + skills
             
-            # Create comparison table using Streamlit's native dataframe
-            comparison_data = []
-            for attr in attrs:
-                if attr in df.columns:
-                    val_a = a.get(attr, 'N/A')
-                    val_b = b.get(attr, 'N/A')
+                # Create comparison table using Streamlit's native dataframe
+                comparison_data = []
+                for attr in attrs:
+                    if attr in df.columns:
+                        val_a = a.get(attr, 'N/A')
+                        val_b = b.get(attr, 'N/A')
                     
-                    # Format values
-                    if attr == "market_value":
-                        val_a_display = f"€{val_a:.1f}M" if isinstance(val_a, (int, float)) else str(val_a)
-                        val_b_display = f"€{val_b:.1f}M" if isinstance(val_b, (int, float)) else str(val_b)
-                    elif attr in ["Age", "Height", "Weight"]:
-                        val_a_display = f"{val_a:.0f}" if isinstance(val_a, (int, float)) else str(val_a)
-                        val_b_display = f"{val_b:.0f}" if isinstance(val_b, (int, float)) else str(val_b)
-                    else:
-                        val_a_display = f"{val_a:.2f}" if isinstance(val_a, (int, float)) else str(val_a)
-                        val_b_display = f"{val_b:.2f}" if isinstance(val_b, (int, float)) else str(val_b)
-                    
-                    # Determine winner
-                    winner = ""
-                    if isinstance(val_a, (int, float)) and isinstance(val_b, (int, float)):
-                        if val_a > val_b:
-                            winner = f"{p1} 👑"
-                        elif val_b > val_a:
-                            winner = f"{p2} 👑"
+                        # Format values
+                        if attr == "market_value":
+                            val_a_display = f"€{val_a:.1f}M" if isinstance(val_a, (int, float)) else str(val_a)
+                            val_b_display = f"€{val_b:.1f}M" if isinstance(val_b, (int, float)) else str(val_b)
+                        elif attr in ["Age", "Height", "Weight"]:
+                            val_a_display = f"{val_a:.0f}" if isinstance(val_a, (int, float)) else str(val_a)
+                            val_b_display = f"{val_b:.0f}" if isinstance(val_b, (int, float)) else str(val_b)
                         else:
-                            winner = "Tie"
+                            val_a_display = f"{val_a:.2f}" if isinstance(val_a, (int, float)) else str(val_a)
+                            val_b_display = f"{val_b:.2f}" if isinstance(val_b, (int, float)) else str(val_b)
+                    
+                        # Determine winner
+                        winner = ""
+                        if isinstance(val_a, (int, float)) and isinstance(val_b, (int, float)):
+                            if val_a > val_b:
+                                winner = f"{p1} 👑"
+                            elif val_b > val_a:
+                                winner = f"{p2} 👑"
+                            else:
+                                winner = "Tie"
                     
-                    comparison_data.append({
-                        "Attribute": attr,
-                        p1: val_a_display,
-                        p2: val_b_display,
-                        "Winner": winner
-                    })
+                        comparison_data.append({
+                            "Attribute": attr,
+                            p1: val_a_display,
+                            p2: val_b_display,
+                            "Winner": winner
+                        })
             
-            comparison_df = pd.DataFrame(comparison_data)
+                comparison_df = pd.DataFrame(comparison_data)
             
-            st.dataframe(
-                comparison_df,
-                use_container_width=True,
-                hide_index=True,
-                column_config={
-                    "Winner": st.column_config.TextColumn(
-                        "Winner",
-                        help="Player with better value"
-                    )
-                }
-            )
+                st.dataframe(
+                    comparison_df,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "Winner": st.column_config.TextColumn(
+                            "Winner",
+                            help="Player with better value"
+                        )
+                    }
+                )
+    telemetry.mark("comparison")
 
     # Back button
     st.markdown("---")
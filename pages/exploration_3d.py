@@ -5,15 +5,550 @@ import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
+import time
+from lod import reduce_points, render_lod_controls, render_lod_report
+from correlations import get_correlations
+from clustering import DEFAULT_FEATURES, get_clustering_engine
+from utils import dataset_version, get_player_index, read_table
+import telemetry
+import figure_cache
+
+PAGE = "exploration_3d"
 
-@st.cache_data
 def load_data():
+    """The player table of the dataset snapshot this session is pinned to"""
     try:
-        return pd.read_csv('forwards_clean_with_market_values_updated.csv')
+        return read_table()
     except FileNotFoundError:
         st.error("Data file not found.")
         return pd.DataFrame()
 
+VALUE_TIERS = ['Budget', 'Affordable', 'Mid-Range', 'Premium', 'Elite']
+
+@st.cache_data(show_spinner=False)
+def value_tier_edges(_df, version):
+    """Quintile edges of the valued players' market values, computed once per dataset version"""
+    values = _df.loc[_df["market_value"] > 0, "market_value"]
+    return values.quantile([0.2, 0.4, 0.6, 0.8]).to_numpy()
+
+CLUSTER_COLORS = ["#00c6ff", "#ff6b6b", "#00e676", "#f59e0b", "#8b5cf6", "#ec4899",
+                  "#4ecdc4", "#ffd93d", "#a0a0a0", "#ff9ff3", "#54a0ff", "#5f27cd"]
+
+def render_cluster_controls(df):
+    """Clustering options for Performance Cluster mode; returns (result or None, show embedding)"""
+    with st.expander("🧬 Clustering", expanded=False):
+        color_by = st.radio("Color players by", ["Performance level (OVR)", "K-means clusters"],
+                            horizontal=True, key="cluster_color_by")
+        if color_by == "Performance level (OVR)":
+            return None, False
+
+        available = [f for f in DEFAULT_FEATURES + ["OVR", "Age"] if f in df.columns]
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            cluster_features = st.multiselect("Cluster on", available,
+                                              default=[f for f in DEFAULT_FEATURES if f in df.columns],
+                                              key="cluster_features")
+        with col2:
+            k = st.slider("Clusters (K)", 2, 12, 5, key="cluster_k")
+        show_embedding = st.checkbox("Show 3D PCA embedding of the clustering features", value=True,
+                                     key="cluster_embedding")
+        if len(cluster_features) < 2:
+            st.warning("⚠️ Select at least 2 features to cluster on.")
+            return None, False
+
+        # Runs on the shared background worker; finished results are reused across reruns and sessions
+        engine = get_clustering_engine()
+        job = engine.submit(df, cluster_features, k, dataset_version(columns=cluster_features))
+        status = engine.status(job)
+        if status == "pending":
+            st.info(f"⏳ Clustering {len(df):,} players into {k} groups in the background...")
+            st.button("🔄 Refresh clusters", key="cluster_refresh")
+            return None, False
+        if status == "error":
+            st.error(f"❌ Clustering failed: {engine.error(job)}")
+            return None, False
+
+        result = engine.result(job)
+        silhouette = f" · silhouette {result.silhouette:.2f}" if result.silhouette is not None else ""
+        st.caption(f"🧬 K={result.k} on {len(result.features)} features{silhouette} · "
+                   f"PCA explains {result.explained_variance.sum():.0%} of variance · fitted in {result.seconds * 1000:.0f} ms")
+        return result, show_embedding
+
+@telemetry.timed("cluster embedding")
+def render_cluster_embedding(result, df, show_embedding, lod_mode, lod_budget):
+    """PCA projection of the clustering features coloured by cluster, plus centroid profiles"""
+    st.markdown("### 🧬 Cluster Embedding")
+    if show_embedding:
+        embedding = result.frame().join(df[["Name"]])
+        # Same LOD budget as the main chart; aggregate mode falls back to grid thinning here
+        embedding, _, _ = reduce_points(embedding, ["PC1", "PC2", "PC3"], lod_budget,
+                                        "grid" if lod_mode == "aggregate" else lod_mode)
+        variance = result.explained_variance
+        fig = go.Figure()
+        for cluster, members in embedding.groupby("cluster", sort=True):
+            fig.add_trace(go.Scatter3d(
+                x=members["PC1"], y=members["PC2"], z=members["PC3"],
+                mode='markers',
+                marker=dict(size=4, color=CLUSTER_COLORS[cluster % len(CLUSTER_COLORS)], opacity=0.8),
+                text=members["Name"],
+                hovertemplate="<b>%{text}</b><br>" + f"Cluster {cluster}" + "<extra></extra>",
+                name=f"Cluster {cluster}"
+            ))
+        fig.update_layout(
+            scene=dict(
+                xaxis_title=f"PC1 ({variance[0]:.0%})",
+                yaxis_title=f"PC2 ({variance[1]:.0%})" if len(variance) > 1 else "PC2",
+                zaxis_title=f"PC3 ({variance[2]:.0%})" if len(variance) > 2 else "PC3",
+                bgcolor="rgba(0,0,0,0)"
+            ),
+            template="plotly_dark",
+            height=600,
+            paper_bgcolor='rgba(0,0,0,0)',
+            legend=dict(font=dict(color="white"), bgcolor="rgba(0,0,0,0.5)"),
+            margin=dict(t=30, b=30, l=30, r=30)
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("**📋 Cluster Profiles** (centroid averages)")
+    st.dataframe(result.profiles(), use_container_width=True)
+
+def add_cluster_traces(fig, df, full_df, cluster_result, x_feature, y_feature, z_feature):
+    """Performance Cluster mode: one trace per K-means cluster, or every player coloured by OVR"""
+    # Fix size values - transform to positive range
+    if "OVR" in df.columns:
+        # Transform OVR values to positive range for size
+        ovr_values = df["OVR"].values
+        # Scale to 5-25 range for marker size
+        min_ovr, max_ovr = full_df["OVR"].min(), full_df["OVR"].max()
+        size_values = 5 + ((ovr_values - min_ovr) / (max_ovr - min_ovr)) * 20
+    else:
+        size_values = [10] * len(df)  # Default size
+
+    # Color by performance level
+    if "OVR" in df.columns:
+        color_values = df["OVR"]
+        colorscale = "viridis"
+    else:
+        color_values = df[x_feature]
+        colorscale = "plasma"
+
+    if cluster_result is not None:
+        # One trace per cluster so each can be toggled from the legend
+        labels = cluster_result.labels_for(df.index)
+        size_values = np.asarray(size_values)
+        for cluster in range(cluster_result.k):
+            in_cluster = labels == cluster
+            if not in_cluster.any():
+                continue
+            members = df[in_cluster]
+            fig.add_trace(go.Scatter3d(
+                x=members[x_feature],
+                y=members[y_feature],
+                z=members[z_feature],
+                mode='markers',
+                marker=dict(
+                    size=size_values[in_cluster],
+                    color=CLUSTER_COLORS[cluster % len(CLUSTER_COLORS)],
+                    opacity=0.8,
+                    line=dict(width=1, color='rgba(255,255,255,0.5)')
+                ),
+                text=members["Name"],
+                hovertemplate=
+                "<b>%{text}</b><br>" +
+                f"Cluster {cluster}<br>" +
+                f"{x_feature}: %{{x:.2f}}<br>" +
+                f"{y_feature}: %{{y:.2f}}<br>" +
+                f"{z_feature}: %{{z:.2f}}<br>" +
+                "<extra></extra>",
+                name=f"Cluster {cluster}"
+            ))
+    else:
+        fig.add_trace(go.Scatter3d(
+            x=df[x_feature],
+            y=df[y_feature],
+            z=df[z_feature],
+            mode='markers',
+            marker=dict(
+                size=size_values,
+                color=color_values,
+                colorscale=colorscale,
+                opacity=0.8,
+                colorbar=dict(title="Performance Level"),
+                line=dict(width=1, color='rgba(255,255,255,0.5)')
+            ),
+            text=df["Name"],
+            hovertemplate=
+            "<b>%{text}</b><br>" +
+            f"{x_feature}: %{{x:.2f}}<br>" +
+            f"{y_feature}: %{{y:.2f}}<br>" +
+            f"{z_feature}: %{{z:.2f}}<br>" +
+            "<extra></extra>",
+            name="Players"
+        ))
+
+def add_league_traces(fig, df, full_df, x_feature, y_feature, z_feature):
+    """League Analysis mode: one trace per league (at most 8), sized by market value"""
+    # Get unique leagues and assign colors
+    leagues = full_df["League"].unique()[:8]  # Limit to 8 leagues for clarity
+    colors = ['#00c6ff', '#ff4757', '#2ed573', '#ffa502', '#8b5cf6', '#ec4899', '#f59e0b', '#06d6a0']
+
+    # Sizes for every drawn player at once, then one groupby over league codes builds the traces
+    league_codes = pd.Categorical(df["League"], categories=leagues).codes
+    if "market_value" in df.columns and df["market_value"].notna().any():
+        # Use market_value if available, fill NaN with the league mean
+        mv_values = df["market_value"].fillna(df.groupby("League")["market_value"].transform("mean"))
+        mv_values = np.maximum(mv_values.fillna(0.1).values, 0.1)  # Ensure positive values
+        all_sizes = 5 + (mv_values / full_df["market_value"].max()) * 15
+    elif "Age" in df.columns:
+        # Use Age as backup for sizing
+        age_values = df["Age"].fillna(25).values  # Fill NaN with 25
+        all_sizes = 5 + ((age_values - 15) / 25) * 15  # Scale age 15-40 to size 5-20
+    else:
+        # Default uniform size
+        all_sizes = np.full(len(df), 10)
+
+    for code, positions in pd.Series(np.arange(len(df))).groupby(league_codes, sort=True):
+        if code < 0:
+            continue
+        league = leagues[code]
+        league_data = df.iloc[positions.values]
+
+        fig.add_trace(go.Scatter3d(
+            x=league_data[x_feature],
+            y=league_data[y_feature],
+            z=league_data[z_feature],
+            mode='markers',
+            marker=dict(
+                size=all_sizes[positions.values],
+                color=colors[code % len(colors)],
+                opacity=0.7,
+                line=dict(width=1, color='rgba(255,255,255,0.3)')
+            ),
+            text=league_data["Name"],
+            name=f"{league} ({len(league_data)} players)",
+            hovertemplate=
+            "<b>%{text}</b><br>" +
+            f"League: {league}<br>" +
+            f"{x_feature}: %{{x:.2f}}<br>" +
+            f"{y_feature}: %{{y:.2f}}<br>" +
+            f"{z_feature}: %{{z:.2f}}<br>" +
+            "<extra></extra>"
+        ))
+
+def add_value_traces(fig, df, df_with_value, edges, x_feature, y_feature, z_feature):
+    """Market Value mode: one trace per value tier, cut on every valued player"""
+    # Quantile tiers: searchsorted on the cached quintile edges (value <= q20 -> Budget, ...)
+    tier_codes = np.searchsorted(edges, df_with_value['market_value'].to_numpy(), side='left')
+
+    tier_colors = {
+        'Budget': '#6c757d',
+        'Affordable': '#28a745', 
+        'Mid-Range': '#ffc107',
+        'Premium': '#fd7e14',
+        'Elite': '#dc3545'
+    }
+
+    # Tiers are cut on every valued player; only the LOD-reduced rows are drawn
+    tier_means = df_with_value.groupby(tier_codes)['market_value'].mean()
+    max_value = df_with_value["market_value"].max()
+    drawn = df_with_value.index.isin(df.index)
+    drawn_with_value = df_with_value[drawn]
+    for code, tier_data in drawn_with_value.groupby(tier_codes[drawn], sort=True):
+        tier = VALUE_TIERS[code]
+
+        mv_values = tier_data["market_value"].values
+        size_values = 8 + (mv_values / max_value) * 20
+
+        fig.add_trace(go.Scatter3d(
+            x=tier_data[x_feature],
+            y=tier_data[y_feature],
+            z=tier_data[z_feature],
+            mode='markers',
+            marker=dict(
+                size=size_values,
+                color=tier_colors.get(tier, '#6c757d'),
+                opacity=0.8,
+                line=dict(width=1, color='rgba(255,255,255,0.4)')
+            ),
+            text=tier_data["Name"],
+            name=f"{tier} (€{tier_means[code]:.1f}M avg)",
+            hovertemplate=
+            "<b>%{text}</b><br>" +
+            "Value: €%{customdata:.1f}M<br>" +
+            f"{x_feature}: %{{x:.2f}}<br>" +
+            f"{y_feature}: %{{y:.2f}}<br>" +
+            f"{z_feature}: %{{z:.2f}}<br>" +
+            "<extra></extra>",
+            customdata=mv_values
+        ))
+
+def explorer_figure(add_traces, voxel_summary, highlight_df, x_feature, y_feature, z_feature):
+    """The 3D explorer chart: the mode's traces, LOD voxel summary, highlighted players and layout"""
+    fig = go.Figure()
+    add_traces(fig)
+
+    if voxel_summary is not None:
+        # Voxel summary of the players not drawn individually
+        fig.add_trace(go.Scatter3d(
+            x=voxel_summary[x_feature],
+            y=voxel_summary[y_feature],
+            z=voxel_summary[z_feature],
+            mode='markers',
+            marker=dict(
+                size=3 + 12 * np.sqrt(voxel_summary["count"] / voxel_summary["count"].max()),
+                color=voxel_summary["count"],
+                colorscale="Blues",
+                opacity=0.6,
+                symbol="square"
+            ),
+            customdata=voxel_summary["count"],
+            hovertemplate="%{customdata} players<extra></extra>",
+            name="Player density"
+        ))
+
+    if highlight_df is not None:
+        fig.add_trace(go.Scatter3d(
+            x=highlight_df[x_feature],
+            y=highlight_df[y_feature],
+            z=highlight_df[z_feature],
+            mode='markers+text',
+            text=highlight_df["Name"],
+            marker=dict(size=12, color='#ffd700', symbol='diamond', opacity=0.9),
+            hovertemplate="<b>%{text}</b><extra></extra>",
+            name="Highlighted"
+        ))
+
+    # Enhanced 3D layout
+    fig.update_layout(
+        scene=dict(
+            xaxis_title=f"📊 {x_feature}",
+            yaxis_title=f"📈 {y_feature}",
+            zaxis_title=f"🎯 {z_feature}",
+            bgcolor="rgba(0,0,0,0)",
+            xaxis=dict(
+                backgroundcolor="rgba(0,0,0,0)",
+                gridcolor="rgba(255,255,255,0.2)",
+                showbackground=True,
+                zerolinecolor="rgba(255,255,255,0.3)",
+                tickfont=dict(color="white")
+            ),
+            yaxis=dict(
+                backgroundcolor="rgba(0,0,0,0)",
+                gridcolor="rgba(255,255,255,0.2)",
+                showbackground=True,
+                zerolinecolor="rgba(255,255,255,0.3)",
+                tickfont=dict(color="white")
+            ),
+            zaxis=dict(
+                backgroundcolor="rgba(0,0,0,0)",
+                gridcolor="rgba(255,255,255,0.2)",
+                showbackground=True,
+                zerolinecolor="rgba(255,255,255,0.3)",
+                tickfont=dict(color="white")
+            ),
+            camera=dict(
+                eye=dict(x=1.5, y=1.5, z=1.5)
+            )
+        ),
+        template="plotly_dark",
+        height=700,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        legend=dict(
+            font=dict(color="white"),
+            bgcolor="rgba(0,0,0,0.5)"
+        ),
+        margin=dict(t=50, b=50, l=50, r=50)
+    )
+    return fig
+
+@st.fragment
+@telemetry.fragment_run("3d explorer")
+def render_3d_explorer(df):
+    """Mode, features, 3D chart, clusters and insights; a fragment, so its widgets rerun only this"""
+    # Find available features
+    possible_features = ["PACE", "SHOOTING", "DRIBBLING", "PASSING", "PHYSICAL", "AERIAL", "MENTAL", "OVR", "Age"]
+    features = [f for f in possible_features if f in df.columns]
+    
+    if len(features) < 3:
+        st.error(f"Need at least 3 numeric features; found: {features}")
+        return
+
+    # Enhanced Control Panel
+    st.markdown("### 🎨 Visualization Mode")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        mode_scatter = st.button("🌟 Performance Cluster", key="mode1", use_container_width=True)
+    with col2:
+        mode_league = st.button("🏆 League Analysis", key="mode2", use_container_width=True)
+    with col3:
+        mode_value = st.button("💰 Market Value", key="mode3", use_container_width=True)
+    
+    # Feature Selection
+    st.markdown("### 📊 Select 3 Features for Analysis")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        x_feature = st.selectbox("X-Axis", features, index=0, key="x_feat")
+    with col2:
+        y_feature = st.selectbox("Y-Axis", features, index=1 if len(features) > 1 else 0, key="y_feat")
+    with col3:
+        z_feature = st.selectbox("Z-Axis", features, index=2 if len(features) > 2 else 0, key="z_feat")
+    
+    # Validate feature selection
+    if len(set([x_feature, y_feature, z_feature])) != 3:
+        st.warning("⚠️ Please select 3 different features for meaningful 3D visualization.")
+        return
+
+    player_index = get_player_index(df)
+    lod_mode, lod_budget, highlighted = render_lod_controls("explore", player_index.labels_for())
+    highlight_rows = [player_index.row(label) for label in highlighted]
+
+    # Level of detail: traces draw the reduced frame, scales and insights use every player
+    lod_started = time.perf_counter()
+    full_df = df
+    df, voxel_summary, lod_info = reduce_points(
+        full_df.dropna(subset=[x_feature, y_feature, z_feature]),
+        [x_feature, y_feature, z_feature], lod_budget, lod_mode, highlight_rows
+    )
+
+    # Generate 3D Visualization based on mode
+    if mode_scatter or (not mode_league and not mode_value):
+        # Performance Cluster Mode (default)
+        st.markdown("### 🌟 Performance Cluster Analysis")
+        cluster_result, show_embedding = render_cluster_controls(full_df)
+        
+        # Create enhanced scatter plot
+        chart = "cluster_scatter"
+        add_traces = lambda fig: add_cluster_traces(fig, df, full_df, cluster_result, x_feature, y_feature, z_feature)
+        clusters = None if cluster_result is None else {
+            "features": cluster_result.features, "k": cluster_result.k, "players": len(cluster_result.index)
+        }
+
+    elif mode_league:
+        # League Analysis Mode - FIXED
+        st.markdown("### 🏆 League Comparison Analysis")
+        
+        if "League" not in df.columns:
+            st.error("League column not found in data")
+            return
+        
+        chart = "league_scatter"
+        add_traces = lambda fig: add_league_traces(fig, df, full_df, x_feature, y_feature, z_feature)
+        clusters = None
+
+    elif mode_value:
+        # Market Value Analysis Mode - FIXED
+        st.markdown("### 💰 Market Value Analysis")
+        
+        if "market_value" not in df.columns:
+            st.error("Market value column not found in data")
+            return
+        
+        # FIXED: Filter out players without market value
+        df_with_value = full_df[full_df["market_value"].notna() & (full_df["market_value"] > 0)].copy()
+        
+        if df_with_value.empty:
+            st.error("No players with valid market value found")
+            return
+        
+        # Show data info
+        st.markdown(f'''
+        <div class="data-info">
+            <strong>📊 Data Info:</strong> Analyzing {len(df_with_value)} players with valid market values 
+            (filtered from {len(full_df)} total players)
+        </div>
+        ''', unsafe_allow_html=True)
+        
+        # Quantile tiers: searchsorted on the cached quintile edges (value <= q20 -> Budget, ...)
+        edges = value_tier_edges(full_df, dataset_version(columns=["market_value"]))
+        chart = "value_scatter"
+        add_traces = lambda fig: add_value_traces(fig, df, df_with_value, edges, x_feature, y_feature, z_feature)
+        clusters = None
+
+    # Identical mode, axes, LOD settings, highlights and clustering on the same dataset reuse the cached figure
+    fig_inputs = {"features": [x_feature, y_feature, z_feature], "lod_mode": lod_mode, "lod_budget": lod_budget,
+                  "highlighted": highlighted, "clusters": clusters}
+    highlight_df = full_df.loc[highlight_rows] if highlight_rows else None
+    payload = figure_cache.cached_chart(
+        PAGE, chart, fig_inputs,
+        lambda: explorer_figure(add_traces, voxel_summary, highlight_df, x_feature, y_feature, z_feature),
+        use_container_width=True
+    )
+    telemetry.mark("plot")
+    render_lod_report(lod_info, payload, lod_started)
+
+    if not (mode_league or mode_value) and cluster_result is not None:
+        render_cluster_embedding(cluster_result, full_df, show_embedding, lod_mode, lod_budget)
+
+    # Statistical Insights Panel
+    st.markdown("### 🔍 Statistical Insights")
+    
+    # Use appropriate dataset based on mode
+    analysis_df = df_with_value if mode_value else full_df
+    
+    # Generate insights based on selected features
+    col1, col2, col3 = st.columns(3)
+    
+    selected_features = [x_feature, y_feature, z_feature]
+    
+    for i, (feature, col) in enumerate(zip(selected_features, [col1, col2, col3])):
+        feature_data = analysis_df[feature].dropna()
+        
+        with col:
+            st.markdown(f"**📊 {feature} Analysis**")
+            st.markdown(f"- **Mean**: {feature_data.mean():.3f}")
+            st.markdown(f"- **Std Dev**: {feature_data.std():.2f}")
+            st.markdown(f"- **Range**: {feature_data.min():.2f} to {feature_data.max():.2f}")
+            
+            # Find top performer
+            if not feature_data.empty:
+                top_player_idx = feature_data.idxmax()
+                top_player = analysis_df.loc[top_player_idx, "Name"]
+                top_value = feature_data.max()
+                st.markdown(f"- **Top**: {top_player} ({top_value:.2f})")
+
+    # Correlation Analysis
+    st.markdown("### 🔗 Feature Correlation Analysis")
+    
+    # Sliced from the cached all-columns matrix for this dataset/filter instead of recomputed per rerun
+    numeric_columns = full_df.select_dtypes(include=[np.number]).columns
+    correlation_key = (dataset_version(columns=numeric_columns), "market_value>0" if mode_value else "all")
+    correlation_matrix = get_correlations(analysis_df, correlation_key)
+    corr_data = correlation_matrix.slice(selected_features)
+    
+    col1, col2, col3 = st.columns(3)
+    
+    correlations = [
+        (f"{x_feature} ↔ {y_feature}", corr_data.loc[x_feature, y_feature], correlation_matrix.pair(x_feature, y_feature)),
+        (f"{x_feature} ↔ {z_feature}", corr_data.loc[x_feature, z_feature], correlation_matrix.pair(x_feature, z_feature)),
+        (f"{y_feature} ↔ {z_feature}", corr_data.loc[y_feature, z_feature], correlation_matrix.pair(y_feature, z_feature))
+    ]
+    
+    for (pair, corr_val, pair_stats), col in zip(correlations, [col1, col2, col3]):
+        with col:
+            # Determine correlation strength
+            if abs(corr_val) > 0.7:
+                strength = "Strong"
+                color = "#2ed573" if corr_val > 0 else "#ff4757"
+            elif abs(corr_val) > 0.3:
+                strength = "Moderate"
+                color = "#ffa502"
+            else:
+                strength = "Weak"
+                color = "#6c757d"
+            
+            st.markdown(f"""
+            <div style="background: {color}20; border: 1px solid {color}40; border-radius: 8px; padding: 1rem; text-align: center;">
+                <div style="font-weight: 600; margin-bottom: 0.5rem;">{pair}</div>
+                <div style="font-size: 1.2rem; color: {color};">{corr_val:.3f}</div>
+                <div style="font-size: 0.8rem; color: var(--text-muted);">{strength} · p={pair_stats["p"]:.2g} · n={pair_stats["n"]}</div>
+            </div>
+            """, unsafe_allow_html=True)
+    telemetry.mark("insights")
+
 def main():
     # Enhanced CSS for 3D Exploration page
     st.markdown("""
@@ -132,6 +667,7 @@ def main():
     }
     </style>
     """, unsafe_allow_html=True)
+    telemetry.mark("css")
     
     # Page Header
     st.markdown('''
@@ -142,342 +678,11 @@ def main():
     ''', unsafe_allow_html=True)
     
     df = load_data()
+    telemetry.mark("load data")
     if df.empty:
         return
 
-    # Find available features
-    possible_features = ["PACE", "SHOOTING", "DRIBBLING", "PASSING", "PHYSICAL", "AERIAL", "MENTAL", "OVR", "Age"]
-    features = [f for f in possible_features if f in df.columns]
-    
-    if len(features) < 3:
-        st.error(f"Need at least 3 numeric features; found: {features}")
-        return
-
-    # Enhanced Control Panel
-    st.markdown("### 🎨 Visualization Mode")
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        mode_scatter = st.button("🌟 Performance Cluster", key="mode1", use_container_width=True)
-    with col2:
-        mode_league = st.button("🏆 League Analysis", key="mode2", use_container_width=True)
-    with col3:
-        mode_value = st.button("💰 Market Value", key="mode3", use_container_width=True)
-    
-    # Feature Selection
-    st.markdown("### 📊 Select 3 Features for Analysis")
-    
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        x_feature = st.selectbox("X-Axis", features, index=0, key="x_feat")
-    with col2:
-        y_feature = st.selectbox("Y-Axis", features, index=1 if len(features) > 1 else 0, key="y_feat")
-    with col3:
-        z_feature = st.selectbox("Z-Axis", features, index=2 if len(features) > 2 else 0, key="z_feat")
-    
-    # Validate feature selection
-    if len(set([x_feature, y_feature, z_feature])) != 3:
-        st.warning("⚠️ Please select 3 different features for meaningful 3D visualization.")
-        return
-
-    # Generate 3D Visualization based on mode
-    if mode_scatter or (not mode_league and not mode_value):
-        # Performance Cluster Mode (default)
-        st.markdown("### 🌟 Performance Cluster Analysis")
-        
-        # Create enhanced scatter plot
-        fig = go.Figure()
-        
-        # Fix size values - transform to positive range
-        if "OVR" in df.columns:
-            # Transform OVR values to positive range for size
-            ovr_values = df["OVR"].values
-            # Scale to 5-25 range for marker size
-            min_ovr, max_ovr = ovr_values.min(), ovr_values.max()
-            size_values = 5 + ((ovr_values - min_ovr) / (max_ovr - min_ovr)) * 20
-        else:
-            size_values = [10] * len(df)  # Default size
-        
-        # Color by performance level
-        if "OVR" in df.columns:
-            color_values = df["OVR"]
-            colorscale = "viridis"
-        else:
-            color_values = df[x_feature]
-            colorscale = "plasma"
-        
-        fig.add_trace(go.Scatter3d(
-            x=df[x_feature],
-            y=df[y_feature],
-            z=df[z_feature],
-            mode='markers',
-            marker=dict(
-                size=size_values,
-                color=color_values,
-                colorscale=colorscale,
-                opacity=0.8,
-                colorbar=dict(title="Performance Level"),
-                line=dict(width=1, color='rgba(255,255,255,0.5)')
-            ),
-            text=df["Name"],
-            hovertemplate=
-            "<b>%{text}</b><br>" +
-            f"{x_feature}: %{{x:.2f}}<br>" +
-            f"{y_feature}: %{{y:.2f}}<br>" +
-            f"{z_feature}: %{{z:.2f}}<br>" +
-            "<extra></extra>",
-            name="Players"
-        ))
-        
-    elif mode_league:
-        # League Analysis Mode - FIXED
-        st.markdown("### 🏆 League Comparison Analysis")
-        
-        if "League" not in df.columns:
-            st.error("League column not found in data")
-            return
-        
-        fig = go.Figure()
-        
-        # Get unique leagues and assign colors
-        leagues = df["League"].unique()[:8]  # Limit to 8 leagues for clarity
-        colors = ['#00c6ff', '#ff4757', '#2ed573', '#ffa502', '#8b5cf6', '#ec4899', '#f59e0b', '#06d6a0']
-        
-        for i, league in enumerate(leagues):
-            league_data = df[df["League"] == league]
-            
-            # FIXED: Handle size values properly - use Age or OVR as fallback
-            if "market_value" in df.columns and not league_data["market_value"].isna().all():
-                # Use market_value if available, fill NaN with mean
-                mv_values = league_data["market_value"].fillna(league_data["market_value"].mean())
-                mv_values = np.maximum(mv_values.values, 0.1)  # Ensure positive values
-                size_values = 5 + (mv_values / df["market_value"].max()) * 15
-            elif "Age" in df.columns:
-                # Use Age as backup for sizing
-                age_values = league_data["Age"].fillna(25).values  # Fill NaN with 25
-                size_values = 5 + ((age_values - 15) / 25) * 15  # Scale age 15-40 to size 5-20
-            else:
-                # Default uniform size
-                size_values = [10] * len(league_data)
-            
-            fig.add_trace(go.Scatter3d(
-                x=league_data[x_feature],
-                y=league_data[y_feature],
-                z=league_data[z_feature],
-                mode='markers',
-                marker=dict(
-                    size=size_values,
-                    color=colors[i % len(colors)],
-                    opacity=0.7,
-                    line=dict(width=1, color='rgba(255,255,255,0.3)')
-                ),
-                text=league_data["Name"],
-                name=f"{league} ({len(league_data)} players)",
-                hovertemplate=
-                "<b>%{text}</b><br>" +
-                f"League: {league}<br>" +
-                f"{x_feature}: %{{x:.2f}}<br>" +
-                f"{y_feature}: %{{y:.2f}}<br>" +
-                f"{z_feature}: %{{z:.2f}}<br>" +
-                "<extra></extra>"
-            ))
-        
-    elif mode_value:
-        # Market Value Analysis Mode - FIXED
-        st.markdown("### 💰 Market Value Analysis")
-        
-        if "market_value" not in df.columns:
-            st.error("Market value column not found in data")
-            return
-        
-        # FIXED: Filter out players without market value
-        df_with_value = df[df["market_value"].notna() & (df["market_value"] > 0)].copy()
-        
-        if df_with_value.empty:
-            st.error("No players with valid market value found")
-            return
-        
-        # Show data info
-        st.markdown(f'''
-        <div class="data-info">
-            <strong>📊 Data Info:</strong> Analyzing {len(df_with_value)} players with valid market values 
-            (filtered from {len(df)} total players)
-        </div>
-        ''', unsafe_allow_html=True)
-        
-        fig = go.Figure()
-        
-        # Create value tiers - FIXED
-        try:
-            df_with_value['value_tier'] = pd.cut(
-                df_with_value['market_value'], 
-                bins=5, 
-                labels=['Budget', 'Affordable', 'Mid-Range', 'Premium', 'Elite'],
-                duplicates='drop'  # Handle duplicate edges
-            )
-        except ValueError:
-            # If cut fails, create manual tiers
-            mv_values = df_with_value['market_value']
-            q20, q40, q60, q80 = mv_values.quantile([0.2, 0.4, 0.6, 0.8])
-            
-            def assign_tier(value):
-                if value <= q20:
-                    return 'Budget'
-                elif value <= q40:
-                    return 'Affordable'
-                elif value <= q60:
-                    return 'Mid-Range'
-                elif value <= q80:
-                    return 'Premium'
-                else:
-                    return 'Elite'
-            
-            df_with_value['value_tier'] = df_with_value['market_value'].apply(assign_tier)
-        
-        tier_colors = {
-            'Budget': '#6c757d',
-            'Affordable': '#28a745', 
-            'Mid-Range': '#ffc107',
-            'Premium': '#fd7e14',
-            'Elite': '#dc3545'
-        }
-        
-        for tier in df_with_value['value_tier'].unique():
-            tier_data = df_with_value[df_with_value['value_tier'] == tier]
-            
-            # FIXED: Proper size calculation
-            mv_values = tier_data["market_value"].values
-            size_values = 8 + (mv_values / df_with_value["market_value"].max()) * 20
-            
-            fig.add_trace(go.Scatter3d(
-                x=tier_data[x_feature],
-                y=tier_data[y_feature],
-                z=tier_data[z_feature],
-                mode='markers',
-                marker=dict(
-                    size=size_values,
-                    color=tier_colors.get(tier, '#6c757d'),
-                    opacity=0.8,
-                    line=dict(width=1, color='rgba(255,255,255,0.4)')
-                ),
-                text=tier_data["Name"],
-                name=f"{tier} (€{tier_data['market_value'].mean():.1f}M avg)",
-                hovertemplate=
-                "<b>%{text}</b><br>" +
-                "Value: €%{customdata:.1f}M<br>" +
-                f"{x_feature}: %{{x:.2f}}<br>" +
-                f"{y_feature}: %{{y:.2f}}<br>" +
-                f"{z_feature}: %{{z:.2f}}<br>" +
-                "<extra></extra>",
-                customdata=tier_data["market_value"]
-            ))
-
-    # Enhanced 3D layout
-    fig.update_layout(
-        scene=dict(
-            xaxis_title=f"📊 {x_feature}",
-            yaxis_title=f"📈 {y_feature}",
-            zaxis_title=f"🎯 {z_feature}",
-            bgcolor="rgba(0,0,0,0)",
-            xaxis=dict(
-                backgroundcolor="rgba(0,0,0,0)",
-                gridcolor="rgba(255,255,255,0.2)",
-                showbackground=True,
-                zerolinecolor="rgba(255,255,255,0.3)",
-                tickfont=dict(color="white")
-            ),
-            yaxis=dict(
-                backgroundcolor="rgba(0,0,0,0)",
-                gridcolor="rgba(255,255,255,0.2)",
-                showbackground=True,
-                zerolinecolor="rgba(255,255,255,0.3)",
-                tickfont=dict(color="white")
-            ),
-            zaxis=dict(
-                backgroundcolor="rgba(0,0,0,0)",
-                gridcolor="rgba(255,255,255,0.2)",
-                showbackground=True,
-                zerolinecolor="rgba(255,255,255,0.3)",
-                tickfont=dict(color="white")
-            ),
-            camera=dict(
-                eye=dict(x=1.5, y=1.5, z=1.5)
-            )
-        ),
-        template="plotly_dark",
-        height=700,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        legend=dict(
-            font=dict(color="white"),
-            bgcolor="rgba(0,0,0,0.5)"
-        ),
-        margin=dict(t=50, b=50, l=50, r=50)
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-
-    # Statistical Insights Panel
-    st.markdown("### 🔍 Statistical Insights")
-    
-    # Use appropriate dataset based on mode
-    analysis_df = df_with_value if mode_value else df
-    
-    # Generate insights based on selected features
-    col1, col2, col3 = st.columns(3)
-    
-    selected_features = [x_feature, y_feature, z_feature]
-    
-    for i, (feature, col) in enumerate(zip(selected_features, [col1, col2, col3])):
-        feature_data = analysis_df[feature].dropna()
-        
-        with col:
-            st.markdown(f"**📊 {feature} Analysis**")
-            st.markdown(f"- **Mean**: {feature_data.mean():.3f}")
-            st.markdown(f"- **Std Dev**: {feature_data.std():.2f}")
-            st.markdown(f"- **Range**: {feature_data.min():.2f} to {feature_data.max():.2f}")
-            
-            # Find top performer
-            if not feature_data.empty:
-                top_player_idx = feature_data.idxmax()
-                top_player = analysis_df.loc[top_player_idx, "Name"]
-                top_value = feature_data.max()
-                st.markdown(f"- **Top**: {top_player} ({top_value:.2f})")
-
-    # Correlation Analysis
-    st.markdown("### 🔗 Feature Correlation Analysis")
-    
-    corr_data = analysis_df[selected_features].corr()
-    
-    col1, col2, col3 = st.columns(3)
-    
-    correlations = [
-        (f"{x_feature} ↔ {y_feature}", corr_data.loc[x_feature, y_feature]),
-        (f"{x_feature} ↔ {z_feature}", corr_data.loc[x_feature, z_feature]),
-        (f"{y_feature} ↔ {z_feature}", corr_data.loc[y_feature, z_feature])
-    ]
-    
-    for (pair, corr_val), col in zip(correlations, [col1, col2, col3]):
-        with col:
-            # Determine correlation strength
-            if abs(corr_val) > 0.7:
-                strength = "Strong"
-                color = "#2ed573" if corr_val > 0 else "#ff4757"
-            elif abs(corr_val) > 0.3:
-                strength = "Moderate"
-                color = "#ffa502"
-            else:
-                strength = "Weak"
-                color = "#6c757d"
-            
-            st.markdown(f"""
-            <div style="background: {color}20; border: 1px solid {color}40; border-radius: 8px; padding: 1rem; text-align: center;">
-                <div style="font-weight: 600; margin-bottom: 0.5rem;">{pair}</div>
-                <div style="font-size: 1.2rem; color: {color};">{corr_val:.3f}</div>
-                <div style="font-size: 0.8rem; color: var(--text-muted);">{strength}</div>
-            </div>
-            """, unsafe_allow_html=True)
+    render_3d_explorer(df)
 
     # Back button
     st.markdown("---")
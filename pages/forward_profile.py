@@ -4,15 +4,81 @@ import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
+from percentiles import get_percentile_cube, PEER_GROUPS, ordinal
+from utils import dataset_version, get_player_index, read_table
+import telemetry
+import figure_cache
+
+PAGE = "forward_profile"
 
-@st.cache_data
 def load_data():
+    """The player table of the dataset snapshot this session is pinned to"""
     try:
-        return pd.read_csv('forwards_clean_with_market_values_updated.csv')
+        return read_table()
     except FileNotFoundError:
         st.error("Data file not found.")
         return pd.DataFrame()
 
+def radar_figure(player, skills, percentiles):
+    """Skill radar of one player: percentiles (0-100) against the chosen peer group"""
+    radar_values = [percentiles[s] for s in skills] + [percentiles[skills[0]]]
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatterpolar(
+        r=radar_values,
+        theta=skills + [skills[0]],
+        fill='toself',
+        name=player,
+        line=dict(color='#00c6ff', width=4),
+        fillcolor='rgba(0,198,255,0.4)',
+        marker=dict(size=10, color='#00c6ff', symbol='circle')
+    ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 100],
+                tickfont=dict(size=14, color='white'),
+                gridcolor='rgba(255,255,255,0.3)',
+                linecolor='rgba(255,255,255,0.4)',
+                tickmode='linear',
+                tick0=0,
+                dtick=20
+            ),
+            angularaxis=dict(
+                tickfont=dict(size=16, color='white', family='Inter'),
+                linecolor='rgba(255,255,255,0.4)',
+                gridcolor='rgba(255,255,255,0.3)'
+            ),
+            bgcolor='rgba(10,10,11,0.8)'
+        ),
+        template="plotly_dark",
+        showlegend=False,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=500,
+        margin=dict(t=20, b=20, l=20, r=20)
+    )
+    return fig
+
+def prewarm_radars(cube, player_index, skills, version):
+    """Queue radars of the most-viewed players, for every peer group, on the figure cache worker"""
+    figures = figure_cache.get_figure_cache()
+    entries = []
+    for label in figures.most_viewed():
+        row = player_index.row(label)
+        if row is None:
+            continue
+        for group in PEER_GROUPS:
+            inputs = {"player": label, "peer_group": group, "skills": skills}
+            entries.append((
+                figure_cache.figure_key(PAGE, "radar", inputs, version),
+                lambda label=label, row=row, group=group: radar_figure(label, skills, cube.profile(row, group, skills))
+            ))
+    return figures.prewarm(entries)
+
 def main():
     # Enhanced CSS for Forward Profile page
     st.markdown("""
@@ -356,6 +422,7 @@ def main():
     }
     </style>
     """, unsafe_allow_html=True)
+    telemetry.mark("css")
     
     # Page Header
     st.markdown('''
@@ -366,6 +433,7 @@ def main():
     ''', unsafe_allow_html=True)
     
     df = load_data()
+    telemetry.mark("load data")
     if df.empty:
         return
 
@@ -376,6 +444,12 @@ def main():
         st.error(f"Missing columns: {missing}")
         return
 
+    # Percentiles and the name index are precomputed once for the full dataset (before any filtering)
+    version = dataset_version()
+    cube = get_percentile_cube(df)
+    player_index = get_player_index(df)
+    telemetry.mark("indexes")
+
     # Enhanced filter section
     st.markdown("### 🎯 Player Selection")
     
@@ -409,10 +483,19 @@ def main():
         return
 
     # Player selection
-    player = st.selectbox("Choose a player:", [""] + list(df["Name"].sort_values()))
+    if submitted:
+        names = player_index.labels_for(pos, rows=df.index if styles else None)
+    else:
+        names = player_index.labels_for()
+    player = st.selectbox("Choose a player:", [""] + names)
     
     if player:
-        p = df[df["Name"] == player].iloc[0]
+        p = df.loc[player_index.row(player)]
+        peer_group = st.radio(
+            "Compare against:", list(PEER_GROUPS), horizontal=True,
+            format_func=lambda g: PEER_GROUPS[g].title(), key="fp_peer_group"
+        )
+        peer_label = "All Forwards" if peer_group == "global" else cube.group_label(p.name, peer_group)
         
         # Enhanced Player Hero Section
         st.markdown(f'''
@@ -485,6 +568,9 @@ def main():
                                 margin-bottom: 0.5rem;">{ovr_value:.2f}</div>
                     <div style="color: var(--text-muted); margin-bottom: 1rem;">Overall Rating</div>
                     <span class="performance-badge {badge_class}">{level}</span>
+                    <div style="color: var(--text-muted); margin-top: 0.75rem; font-size: 0.9rem;">
+                        {cube.describe(p.name, "OVR", peer_group)}
+                    </div>
                 </div>
                 ''', unsafe_allow_html=True)
         
@@ -495,6 +581,9 @@ def main():
                 <div class="market-value-display">
                     <div class="market-value">€{mv_value:.1f}M</div>
                     <div class="market-label">Market Value</div>
+                    <div style="color: var(--text-muted); margin-top: 0.5rem; font-size: 0.9rem;">
+                        {cube.describe(p.name, "market_value", peer_group)}
+                    </div>
                 </div>
                 ''', unsafe_allow_html=True)
             else:
@@ -516,57 +605,16 @@ def main():
             </div>
             ''', unsafe_allow_html=True)
             
-            # Get raw standardized values and scale for radar
+            # Raw standardized values; the radar (percentiles against the peer group) comes from the figure cache
             skill_values = [p[s] for s in skills]
-            
-            # Transform standardized values to 0-100 scale for radar visualization
-            def scale_for_radar(val):
-                # Map standardized values (roughly -3 to +3) to 0-100 scale
-                clamped = max(-3.5, min(3.5, val))
-                return ((clamped + 3.5) / 7.0) * 100
-            
-            radar_values = [scale_for_radar(val) for val in skill_values] + [scale_for_radar(skill_values[0])]
-            
-            fig = go.Figure()
-            
-            fig.add_trace(go.Scatterpolar(
-                r=radar_values,
-                theta=skills + [skills[0]],
-                fill='toself',
-                name=player,
-                line=dict(color='#00c6ff', width=4),
-                fillcolor='rgba(0,198,255,0.4)',
-                marker=dict(size=10, color='#00c6ff', symbol='circle')
-            ))
-            
-            fig.update_layout(
-                polar=dict(
-                    radialaxis=dict(
-                        visible=True,
-                        range=[0, 100],
-                        tickfont=dict(size=14, color='white'),
-                        gridcolor='rgba(255,255,255,0.3)',
-                        linecolor='rgba(255,255,255,0.4)',
-                        tickmode='linear',
-                        tick0=0,
-                        dtick=20
-                    ),
-                    angularaxis=dict(
-                        tickfont=dict(size=16, color='white', family='Inter'),
-                        linecolor='rgba(255,255,255,0.4)',
-                        gridcolor='rgba(255,255,255,0.3)'
-                    ),
-                    bgcolor='rgba(10,10,11,0.8)'
-                ),
-                template="plotly_dark",
-                showlegend=False,
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                height=500,
-                margin=dict(t=20, b=20, l=20, r=20)
+            figure_cache.cached_chart(
+                PAGE, "radar", {"player": player, "peer_group": peer_group, "skills": skills},
+                lambda: radar_figure(player, skills, cube.profile(p.name, peer_group, skills)),
+                version, use_container_width=True
             )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            figure_cache.get_figure_cache().record_view(player)
+            prewarm_radars(cube, player_index, skills, version)
+            st.caption(f"Radar shows percentiles among {peer_label} (50 = peer median, 100 = best in group)")
             
             # Enhanced Strengths & Weaknesses
             skill_data = pd.Series(skill_values, index=skills)
@@ -598,16 +646,16 @@ def main():
             skill_breakdown = []
             for skill in skills:
                 raw_val = p[skill]
-                radar_val = scale_for_radar(raw_val)
+                pct, rank, size, _ = cube.lookup(p.name, skill, peer_group)
                 
                 # Determine grade
-                if radar_val >= 80:
+                if pct >= 80:
                     grade = "A"
-                elif radar_val >= 65:
+                elif pct >= 65:
                     grade = "B"
-                elif radar_val >= 50:
+                elif pct >= 50:
                     grade = "C"
-                elif radar_val >= 35:
+                elif pct >= 35:
                     grade = "D"
                 else:
                     grade = "F"
@@ -615,7 +663,8 @@ def main():
                 skill_breakdown.append({
                     "Skill": skill,
                     "Raw Score": f"{raw_val:.3f}",
-                    "Percentile": f"{radar_val:.1f}%",
+                    "Percentile": ordinal(pct),
+                    "Rank": f"#{rank} of {size}",
                     "Grade": grade
                 })
             
@@ -624,6 +673,7 @@ def main():
         
         else:
             st.info("No skill data available for radar chart.")
+    telemetry.mark("profile")
 
     # Back button
     st.markdown("---")
@@ -5,15 +5,71 @@ import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
+from aggregations import get_group_stats, long_format
+from distributions import get_distributions, box_figure, density_figure
+from utils import get_season_store, read_table
+import telemetry
 
-@st.cache_data
 def load_data():
+    """The player table of the dataset snapshot this session is pinned to"""
     try:
-        return pd.read_csv('forwards_clean_with_market_values_updated.csv')
+        return read_table()
     except FileNotFoundError:
         st.error("Data file not found.")
         return pd.DataFrame()
 
+# Attributes offered in the over-time charts
+TIME_METRICS = ["OVR", "market_value", "PACE", "SHOOTING", "PASSING", "DRIBBLING", "PHYSICAL", "AERIAL", "MENTAL", "Age"]
+
+def style_time_figure(fig, y_title):
+    fig.update_traces(line=dict(width=3), marker=dict(size=8))
+    fig.update_layout(
+        template="plotly_dark",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=420,
+        xaxis=dict(tickfont=dict(size=12, color='white'), title=dict(text="Snapshot", font=dict(size=14, color='white'))),
+        yaxis=dict(tickfont=dict(size=12, color='white'), title=dict(text=y_title, font=dict(size=14, color='white'))),
+        legend=dict(font=dict(size=12, color='white'), bgcolor='rgba(0,0,0,0.5)'),
+        hovermode='x unified'
+    )
+    return fig
+
+def render_time_trends(leagues):
+    """League medians and one player's attributes across the snapshots of the season store"""
+    st.markdown("### 📅 Trends Over Time")
+    store = get_season_store()
+    if len(store.snapshots) < 2:
+        st.info("Trends over time need at least two snapshots in the season store. Add one per date with "
+                "`python season_store.py ingest <players.csv> --date YYYY-MM-DD`.")
+        return
+    st.caption(f"{len(store.snapshots)} snapshots, seasons {', '.join(store.seasons())}")
+    
+    latest = store.as_of()
+    metrics = [m for m in TIME_METRICS if m in latest.columns]
+    tab1, tab2 = st.tabs(["🏆 Leagues", "👤 Player"])
+    
+    with tab1:
+        metric = st.selectbox("Metric:", metrics, key="time_metric")
+        # Medians per snapshot are memoised in the store, so only a new ingestion recomputes them
+        by_league = store.trend(metric, by="League")
+        shown = [lg for lg in (leagues or latest["League"].value_counts().head(5).index) if lg in by_league.columns]
+        long = by_league[shown].reset_index().melt(id_vars="date", var_name="League", value_name=metric)
+        fig = px.line(long, x="date", y=metric, color="League", markers=True)
+        st.plotly_chart(style_time_figure(fig, f"Median {metric}"), use_container_width=True)
+    
+    with tab2:
+        labels = (latest["Name"].astype(str) + " (" + latest["Team"].astype(str) + ")").sort_values()
+        key = st.selectbox("Player:", labels.index, format_func=labels.get, key="time_player")
+        chosen = st.multiselect("Attributes:", metrics, default=metrics[:1], key="time_attributes")
+        # One slice of the version table, however many snapshots have accumulated
+        history = store.player_history(key, ["Team", "League"] + chosen)
+        if chosen and not history.empty:
+            long = history[chosen].reset_index().melt(id_vars="date", var_name="Attribute", value_name="Value")
+            fig = px.line(long, x="date", y="Value", color="Attribute", markers=True)
+            st.plotly_chart(style_time_figure(fig, "Value"), use_container_width=True)
+        st.dataframe(history, use_container_width=True)
+
 def main():
     # Enhanced CSS for Performance Trends page
     st.markdown("""
@@ -315,6 +371,7 @@ def main():
     }
     </style>
     """, unsafe_allow_html=True)
+    telemetry.mark("css")
     
     # Enhanced Page Header
     st.markdown('''
@@ -325,6 +382,7 @@ def main():
     ''', unsafe_allow_html=True)
     
     df = load_data()
+    telemetry.mark("load data")
     if df.empty:
         return
 
@@ -369,19 +427,22 @@ def main():
             st.warning("No data found for selected leagues.")
             return
 
+        # One cached groupby over the selected leagues feeds the cards, all three tabs and the insights
+        league_stats_table = get_group_stats(df, "League", filters={"League": leagues}).reindex(leagues)
+        
         # Enhanced League Statistics
         st.markdown("### 📊 League Statistics")
         
         # League stats cards
         stats_data = []
         for league in leagues:
-            league_data = filtered[filtered["League"] == league]
+            row = league_stats_table.loc[league]
             stats_data.append({
                 "League": league,
-                "Players": len(league_data),
-                "Avg_Age": league_data["Age"].mean() if "Age" in league_data.columns else 0,
-                "Avg_OVR": league_data["OVR"].mean() if "OVR" in league_data.columns else 0,
-                "Avg_Value": league_data["market_value"].mean() if "market_value" in league_data.columns else 0
+                "Players": int(row[("Players", "count")]),
+                "Avg_Age": row[("Age", "mean")] if "Age" in filtered.columns else 0,
+                "Avg_OVR": row[("OVR", "mean")] if "OVR" in filtered.columns else 0,
+                "Avg_Value": row[("market_value", "mean")] if "market_value" in filtered.columns else 0
             })
         
         # Display league cards
@@ -413,20 +474,8 @@ def main():
                 st.error("No numeric columns found for analysis.")
                 return
 
-            # Create trend data
-            trend_data = []
-            for lg in leagues:
-                group = filtered[filtered["League"] == lg]
-                for m in metrics[:6]:  # Limit to 6 metrics for clarity
-                    trend_data.append({
-                        "League": lg,
-                        "Metric": m,
-                        "Median": group[m].median(),
-                        "Mean": group[m].mean(),
-                        "Players": len(group)
-                    })
-            
-            trend_df = pd.DataFrame(trend_data)
+            # Create trend data (limit to 6 metrics for clarity)
+            trend_df = long_format(league_stats_table, metrics[:6], ("median", "mean"))
             
             # Enhanced line chart
             fig = px.line(
@@ -473,15 +522,17 @@ def main():
             
             metric = st.selectbox("Choose metric for distribution analysis:", metrics, key="dist_metric")
             
-            # Enhanced box plot
-            fig = px.box(
-                filtered, 
-                x="League", 
-                y=metric, 
-                color="League",
-                title="",
-                hover_data=["Name"] if "Name" in filtered.columns else None
-            )
+            view = st.radio("View", ["📦 Box plot", "🌊 Density curves"], horizontal=True, key="dist_view")
+            
+            # Quartiles, fences, outliers and KDE curves are precomputed per league, so the
+            # chart payload no longer grows with the number of players
+            dists = get_distributions(df, metric, by="League", filters={"League": leagues})
+            groups = {lg: dists["groups"][lg] for lg in leagues if lg in dists["groups"]}
+            colors = px.colors.qualitative.Plotly
+            if view.startswith("📦"):
+                fig = box_figure(groups, colors)
+            else:
+                fig = density_figure(groups, colors)
             
             fig.update_layout(
                 template="plotly_dark",
@@ -499,6 +550,12 @@ def main():
                 ),
                 showlegend=False
             )
+            if not view.startswith("📦"):
+                fig.update_layout(
+                    showlegend=True,
+                    xaxis=dict(title=dict(text=f"{metric} Score", font=dict(size=16, color='white')), tickangle=0),
+                    yaxis=dict(title=dict(text="Density", font=dict(size=16, color='white')))
+                )
             
             st.plotly_chart(fig, use_container_width=True)
 
@@ -508,17 +565,18 @@ def main():
             # Create comprehensive statistics table
             detailed_stats = []
             for lg in leagues:
-                grp = filtered[filtered["League"] == lg]
-                row = {"League": lg, "Players": len(grp)}
+                grp = league_stats_table.loc[lg]
+                row = {"League": lg, "Players": int(grp[("Players", "count")])}
                 
                 for m in metrics:
-                    series = grp[m].dropna()
-                    if not series.empty:
-                        row[f"{m}_Mean"] = f"{series.mean():.2f}"
-                        row[f"{m}_Median"] = f"{series.median():.2f}"
-                        row[f"{m}_Std"] = f"{series.std():.2f}"
-                        row[f"{m}_Max"] = f"{series.max():.2f}"
-                        row[f"{m}_Min"] = f"{series.min():.2f}"
+                    if grp[(m, "count")] > 0:
+                        row[f"{m}_Mean"] = f"{grp[(m, 'mean')]:.2f}"
+                        row[f"{m}_Median"] = f"{grp[(m, 'median')]:.2f}"
+                        row[f"{m}_Std"] = f"{grp[(m, 'std')]:.2f}"
+                        row[f"{m}_Q1"] = f"{grp[(m, 'q25')]:.2f}"
+                        row[f"{m}_Q3"] = f"{grp[(m, 'q75')]:.2f}"
+                        row[f"{m}_Max"] = f"{grp[(m, 'max')]:.2f}"
+                        row[f"{m}_Min"] = f"{grp[(m, 'min')]:.2f}"
                 
                 detailed_stats.append(row)
             
@@ -543,7 +601,7 @@ def main():
         
         # Best performing league
         if "OVR" in filtered.columns:
-            league_ovr = filtered.groupby("League")["OVR"].mean()
+            league_ovr = league_stats_table[("OVR", "mean")]
             best_league = league_ovr.idxmax()
             best_score = league_ovr.max()
             insights.append({
@@ -552,7 +610,7 @@ def main():
             })
         
         # Most players
-        player_counts = filtered["League"].value_counts()
+        player_counts = league_stats_table[("Players", "count")]
         biggest_league = player_counts.idxmax()
         biggest_count = player_counts.max()
         insights.append({
@@ -562,8 +620,8 @@ def main():
         
         # Age analysis
         if "Age" in filtered.columns:
-            youngest_league = filtered.groupby("League")["Age"].mean().idxmin()
-            youngest_age = filtered.groupby("League")["Age"].mean().min()
+            youngest_league = league_stats_table[("Age", "mean")].idxmin()
+            youngest_age = league_stats_table[("Age", "mean")].min()
             insights.append({
                 "metric": f"{youngest_age:.1f}",
                 "desc": f"Average age in {youngest_league} (youngest league)"
@@ -571,10 +629,10 @@ def main():
         
         # Market value analysis
         if "market_value" in filtered.columns:
-            mv_data = filtered[filtered["market_value"].notna()]
-            if not mv_data.empty:
-                highest_value_league = mv_data.groupby("League")["market_value"].mean().idxmax()
-                highest_value = mv_data.groupby("League")["market_value"].mean().max()
+            league_value = league_stats_table[("market_value", "mean")].dropna()
+            if not league_value.empty:
+                highest_value_league = league_value.idxmax()
+                highest_value = league_value.max()
                 insights.append({
                     "metric": f"€{highest_value:.1f}M",
                     "desc": f"Average market value in {highest_value_league}"
@@ -590,6 +648,10 @@ def main():
                     <div class="insight-desc">{insight["desc"]}</div>
                 </div>
                 ''', unsafe_allow_html=True)
+    telemetry.mark("league analysis")
+    
+    render_time_trends(leagues)
+    telemetry.mark("time trends")
 
     # Back button
     st.markdown("---")
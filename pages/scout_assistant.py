@@ -8,6 +8,9 @@ import random
 import asyncio
 import sys
 import os
+import threading
+from utils import read_table
+import telemetry
 
 # Add the backend directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
@@ -18,10 +21,10 @@ try:
 except ImportError:
     RAG_AVAILABLE = False
 
-@st.cache_data
 def load_data():
+    """The player table of the dataset snapshot this session is pinned to"""
     try:
-        return pd.read_csv('forwards_clean_with_market_values_updated.csv')
+        return read_table()
     except FileNotFoundError:
         st.error("Data file not found.")
         return pd.DataFrame()
@@ -51,10 +54,33 @@ def initialize_rag_system():
         # Graceful fallback - don't show error in cloud deployment
         return None
 
-async def get_rag_response(rag_system, query):
+# Sessions rerun on their own threads and event loops; one reload at a time keeps the
+# RAG system's asyncio lock uncontended, so it never binds to any one of those loops
+_reload_guard = threading.Lock()
+
+def refresh_rag_dataset(rag_system):
+    """Pick up a changed CSV in the cached RAG system - the backend's polling task, run per rerun"""
+    if not _reload_guard.acquire(blocking=False):
+        return None  # another session is already reloading
+    try:
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(rag_system.reload_dataset())
+        finally:
+            loop.close()
+    except Exception as e:
+        print(f"⚠️ Dataset reload failed, keeping the current data: {e}")
+        return None
+    finally:
+        _reload_guard.release()
+
+async def get_rag_response(rag_system, query, enrich=False):
     """Get response from RAG system"""
     try:
-        result = await rag_system.process_query(query)
+        # Simple lookups come back instantly from a template; with enrich, LLM prose follows in the background
+        result = await rag_system.process_query(query, enrich=enrich)
+        if result.get("enrichment_id"):
+            st.session_state.setdefault("pending_enrichments", []).append(result["enrichment_id"])
         return result["answer"]
     except Exception as e:
         return f"❌ **Error processing query:** {str(e)}\n\nPlease check if Ollama is running and the vector database is set up correctly."
@@ -371,9 +397,15 @@ def main():
     }
     </style>
     """, unsafe_allow_html=True)
+    telemetry.mark("css")
     
     # Initialize RAG system with cloud-safe fallback
     rag_system = initialize_rag_system()
+    if rag_system:
+        reload = refresh_rag_dataset(rag_system)
+        if reload and reload["reloaded"]:
+            st.toast(f"🤖 Scout Assistant reloaded, rebuilt: {', '.join(reload['rebuilt']) or 'nothing'}")
+    telemetry.mark("rag system")
     
     # Page Header with RAG status - cloud deployment aware
     if rag_system:
@@ -392,6 +424,7 @@ def main():
     ''', unsafe_allow_html=True)
     
     df = load_data()
+    telemetry.mark("load data")
     
     # Initialize chat history with cloud-aware welcome message
     if 'messages' not in st.session_state:
@@ -402,6 +435,17 @@ def main():
             welcome_msg = "👋 **Hello! I'm running in cloud deployment mode.**\n\n☁️ Advanced AI features are available in local development. I can still help with basic scouting queries about forwards in our database!"
         st.session_state.messages.append({"role": "assistant", "content": welcome_msg})
     
+    # Attach LLM prose to template answers once the background generation finishes
+    if rag_system and st.session_state.get("pending_enrichments"):
+        still_pending = []
+        for enrichment_id in st.session_state.pending_enrichments:
+            enrichment = rag_system.get_enrichment(enrichment_id)
+            if enrichment["status"] == "pending":
+                still_pending.append(enrichment_id)
+            elif enrichment["status"] == "done":
+                st.session_state.messages.append({"role": "assistant", "content": "🦙 **Scout analysis:**\n\n" + enrichment["answer"]})
+        st.session_state.pending_enrichments = still_pending
+    
     # Enhanced Chat Interface with cloud-aware status
     status_text = "RAG + LLM Ready" if rag_system else "Cloud Mode Active"
     
@@ -432,6 +476,16 @@ def main():
     
     st.markdown('</div></div>', unsafe_allow_html=True)
     
+    if st.session_state.get("pending_enrichments"):
+        if st.button("🦙 Load detailed scout analysis", use_container_width=True):
+            st.rerun()
+    
+    # Quick lookups are answered from the table alone; LLM prose on top is opt-in, as it costs an Ollama generation
+    if rag_system:
+        st.toggle("🦙 Add LLM scout analysis to quick answers", value=False, key="enrich_answers",
+                  help="Lookups like 'fastest Premier League forwards' are answered instantly from the data. "
+                       "Turn this on to also generate a written analysis in the background.")
+    
     # Enhanced suggestion buttons based on RAG availability
     st.markdown("### 💡 Quick Suggestions")
     
@@ -483,7 +537,7 @@ def main():
                     # Get RAG response
                     loop = asyncio.new_event_loop()
                     asyncio.set_event_loop(loop)
-                    response = loop.run_until_complete(get_rag_response(rag_system, suggestion))
+                    response = loop.run_until_complete(get_rag_response(rag_system, suggestion, st.session_state.enrich_answers))
                     loop.close()
                     
                     typing_placeholder.empty()
@@ -521,7 +575,7 @@ def main():
             with st.spinner("🦙 Processing with Llama LLM..."):
                 loop = asyncio.new_event_loop()
                 asyncio.set_event_loop(loop)
-                response = loop.run_until_complete(get_rag_response(rag_system, user_input))
+                response = loop.run_until_complete(get_rag_response(rag_system, user_input, st.session_state.enrich_answers))
                 loop.close()
         else:
             with st.spinner("🤖 Processing..."):
@@ -593,6 +647,7 @@ def main():
                 welcome_msg = "👋 **Hello! I'm running in cloud deployment mode.**\n\n☁️ Advanced AI features are available in local development. I can still help with basic scouting queries!"
             st.session_state.messages.append({"role": "assistant", "content": welcome_msg})
             st.rerun()
+    telemetry.mark("chat")
     
     # Back button
     st.markdown("---")
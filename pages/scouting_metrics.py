@@ -5,15 +5,376 @@ import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
+import time
+from distributions import get_distributions, histogram_figure
+from lod import reduce_points, render_lod_controls, render_lod_report
+from correlations import get_correlations
+from utils import dataset_version, get_player_index, read_table
+import telemetry
 
-@st.cache_data
 def load_data():
+    """The player table of the dataset snapshot this session is pinned to"""
     try:
-        return pd.read_csv('forwards_clean_with_market_values_updated.csv')
+        return read_table()
     except FileNotFoundError:
         st.error("Data file not found.")
         return pd.DataFrame()
 
+@st.fragment
+@telemetry.fragment_run("metrics explorer")
+def render_metrics_explorer(df):
+    """Controls, scatter, insights and distributions; a fragment, so changing a metric reruns only this"""
+    # Enhanced Control Panel
+    st.markdown("### ⚡ Visualization Controls")
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        # Get available numeric columns
+        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+        # Remove market_value if it has too many NaN values
+        if 'market_value' in numeric_cols and df['market_value'].isna().sum() > len(df) * 0.5:
+            numeric_cols.remove('market_value')
+        
+        if len(numeric_cols) < 2:
+            st.error("Not enough numeric columns available for visualization.")
+            return
+        
+        x_metric = st.selectbox("📈 X-Axis Metric", numeric_cols, index=0)
+        y_metric = st.selectbox("📊 Y-Axis Metric", numeric_cols, 
+                               index=1 if len(numeric_cols) > 1 else 0)
+        
+        # Size metric with proper handling
+        size_options = ["None"] + [col for col in numeric_cols if col not in [x_metric, y_metric]]
+        size_metric = st.selectbox("📏 Bubble Size (Optional)", size_options)
+        
+        # Color coding options
+        color_options = ["None", "League", "Position", "Age_Group"] + numeric_cols
+        color_metric = st.selectbox("🎨 Color Coding", color_options)
+    
+    with col2:
+        st.markdown("### 📊 Quick Metrics")
+        
+        total_players = len(df)
+        avg_age = df['Age'].mean() if 'Age' in df.columns else 0
+        
+        st.markdown(f'''
+        <div class="metric-card">
+            <div class="metric-icon">👥</div>
+            <div class="metric-value">{total_players}</div>
+            <div class="metric-label">Total Players</div>
+        </div>
+        ''', unsafe_allow_html=True)
+        
+        if avg_age > 0:
+            st.markdown(f'''
+            <div class="metric-card">
+                <div class="metric-icon">📅</div>
+                <div class="metric-value">{avg_age:.1f}</div>
+                <div class="metric-label">Avg Age</div>
+            </div>
+            ''', unsafe_allow_html=True)
+
+    player_index = get_player_index(df)
+    lod_mode, lod_budget, highlighted = render_lod_controls("metrics", player_index.labels_for())
+    highlight_rows = [player_index.row(label) for label in highlighted]
+
+    # FIXED: Data preparation with proper size handling
+    plot_df = df.copy()
+    
+    # Remove rows with NaN values in selected metrics
+    plot_df = plot_df.dropna(subset=[x_metric, y_metric])
+    
+    if plot_df.empty:
+        st.markdown('''
+        <div class="warning-box">
+            <strong>⚠️ No data available</strong><br>
+            The selected metrics contain no valid data points.
+        </div>
+        ''', unsafe_allow_html=True)
+        return
+    
+    # Level of detail: thin or aggregate dense regions (highlighted players are always kept);
+    # insights below still use every player
+    lod_started = time.perf_counter()
+    stats_df = plot_df
+    plot_df, lod_summary, lod_info = reduce_points(plot_df, [x_metric, y_metric], lod_budget, lod_mode, highlight_rows)
+    
+    # FIXED: Handle size metric properly
+    size_values = None
+    if size_metric != "None":
+        # Remove rows with NaN in size metric
+        plot_df = plot_df.dropna(subset=[size_metric])
+        if not plot_df.empty:
+            # Transform size values to positive range
+            raw_size = plot_df[size_metric].values
+            
+            # Handle negative values by shifting to positive range
+            min_val = raw_size.min()
+            if min_val < 0:
+                # Shift all values to be positive, then scale
+                shifted_values = raw_size - min_val + 1  # +1 to avoid zero
+                # Scale to reasonable bubble size range (5-30)
+                max_shifted = shifted_values.max()
+                size_values = 5 + (shifted_values / max_shifted) * 25
+            else:
+                # Values are already positive, just scale them
+                max_val = raw_size.max()
+                if max_val > 0:
+                    size_values = 5 + (raw_size / max_val) * 25
+                else:
+                    size_values = [10] * len(raw_size)  # Default size
+        else:
+            size_metric = "None"  # Fallback if no valid data
+    
+    # Handle color coding
+    color_values = None
+    if color_metric != "None":
+        if color_metric == "Age_Group":
+            # Create age groups
+            if 'Age' in plot_df.columns:
+                plot_df['Age_Group'] = pd.cut(plot_df['Age'], 
+                                            bins=[0, 23, 27, 32, 50], 
+                                            labels=['Young (≤23)', 'Prime (24-27)', 'Experienced (28-32)', 'Veteran (33+)'])
+                color_values = plot_df['Age_Group']
+        else:
+            color_values = plot_df[color_metric]
+    telemetry.mark("filter")
+
+    # Enhanced Scatter Plot
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    st.markdown(f'<div class="section-title">📊 {x_metric} vs {y_metric} Analysis</div>', unsafe_allow_html=True)
+    
+    if plot_df.empty and lod_summary is None:
+        st.warning("No data points available after filtering.")
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+    
+    # Create the scatter plot
+    fig = go.Figure()
+    
+    if lod_summary is not None:
+        # Hexbin summary of the players not drawn individually
+        fig.add_trace(go.Scattergl(
+            x=lod_summary[x_metric],
+            y=lod_summary[y_metric],
+            mode='markers',
+            marker=dict(
+                size=4 + 16 * np.sqrt(lod_summary["count"] / lod_summary["count"].max()),
+                color=lod_summary["count"],
+                colorscale='Blues',
+                opacity=0.8,
+                symbol='hexagon'
+            ),
+            customdata=lod_summary["count"],
+            hovertemplate=f"{x_metric}: %{{x:.2f}}<br>{y_metric}: %{{y:.2f}}<br>%{{customdata}} players<extra></extra>",
+            name="Player density",
+            showlegend=False
+        ))
+    
+    if color_values is not None:
+        # Colored scatter plot
+        if color_metric in ['League', 'Position', 'Age_Group']:
+            # Categorical coloring
+            unique_categories = color_values.unique()
+            colors = px.colors.qualitative.Set3[:len(unique_categories)]
+            
+            for i, category in enumerate(unique_categories):
+                if pd.isna(category):
+                    continue
+                    
+                mask = color_values == category
+                category_df = plot_df[mask]
+                
+                fig.add_trace(go.Scattergl(
+                    x=category_df[x_metric],
+                    y=category_df[y_metric],
+                    mode='markers',
+                    name=str(category),
+                    marker=dict(
+                        size=size_values[mask] if size_values is not None else 10,
+                        color=colors[i % len(colors)],
+                        opacity=0.7,
+                        line=dict(width=1, color='white')
+                    ),
+                    text=category_df['Name'] if 'Name' in category_df.columns else None,
+                    hovertemplate=
+                    "<b>%{text}</b><br>" +
+                    f"{x_metric}: %{{x:.2f}}<br>" +
+                    f"{y_metric}: %{{y:.2f}}<br>" +
+                    f"{color_metric}: {category}<br>" +
+                    "<extra></extra>"
+                ))
+        else:
+            # Continuous coloring
+            fig.add_trace(go.Scattergl(
+                x=plot_df[x_metric],
+                y=plot_df[y_metric],
+                mode='markers',
+                marker=dict(
+                    size=size_values if size_values is not None else 10,
+                    color=color_values,
+                    colorscale='Viridis',
+                    opacity=0.7,
+                    colorbar=dict(title=color_metric),
+                    line=dict(width=1, color='white')
+                ),
+                text=plot_df['Name'] if 'Name' in plot_df.columns else None,
+                hovertemplate=
+                "<b>%{text}</b><br>" +
+                f"{x_metric}: %{{x:.2f}}<br>" +
+                f"{y_metric}: %{{y:.2f}}<br>" +
+                f"{color_metric}: %{{marker.color:.2f}}<br>" +
+                "<extra></extra>",
+                showlegend=False
+            ))
+    else:
+        # Single color scatter plot
+        fig.add_trace(go.Scattergl(
+            x=plot_df[x_metric],
+            y=plot_df[y_metric],
+            mode='markers',
+            marker=dict(
+                size=size_values if size_values is not None else 10,
+                color='#00c6ff',
+                opacity=0.7,
+                line=dict(width=1, color='white')
+            ),
+            text=plot_df['Name'] if 'Name' in plot_df.columns else None,
+            hovertemplate=
+            "<b>%{text}</b><br>" +
+            f"{x_metric}: %{{x:.2f}}<br>" +
+            f"{y_metric}: %{{y:.2f}}<br>" +
+            "<extra></extra>",
+            showlegend=False
+        ))
+    
+    if highlight_rows:
+        highlight_df = stats_df.loc[[idx for idx in highlight_rows if idx in stats_df.index]]
+        fig.add_trace(go.Scattergl(
+            x=highlight_df[x_metric],
+            y=highlight_df[y_metric],
+            mode='markers+text',
+            text=highlight_df['Name'],
+            textposition='top center',
+            marker=dict(size=16, color='rgba(0,0,0,0)', line=dict(width=3, color='#ffd700')),
+            hovertemplate="<b>%{text}</b><extra></extra>",
+            name="Highlighted",
+            showlegend=False
+        ))
+    
+    # Enhanced layout
+    fig.update_layout(
+        template="plotly_dark",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=600,
+        xaxis=dict(
+            title=dict(text=x_metric, font=dict(size=16, color='white')),
+            tickfont=dict(size=14, color='white'),
+            gridcolor='rgba(255,255,255,0.2)',
+            zerolinecolor='rgba(255,255,255,0.3)'
+        ),
+        yaxis=dict(
+            title=dict(text=y_metric, font=dict(size=16, color='white')),
+            tickfont=dict(size=14, color='white'),
+            gridcolor='rgba(255,255,255,0.2)',
+            zerolinecolor='rgba(255,255,255,0.3)'
+        ),
+        legend=dict(
+            font=dict(size=12, color='white'),
+            bgcolor='rgba(0,0,0,0.5)',
+            bordercolor='rgba(255,255,255,0.2)',
+            borderwidth=1
+        ),
+        margin=dict(t=20, b=20, l=20, r=20)
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    telemetry.mark("scatter")
+    render_lod_report(lod_info, fig, lod_started)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # Enhanced Statistical Insights
+    st.markdown('''
+    <div class="insight-panel">
+        <div class="insight-title">
+            <span>🔍</span>
+            <span>Statistical Insights</span>
+        </div>
+    </div>
+    ''', unsafe_allow_html=True)
+    
+    # Generate insights
+    col1, col2, col3 = st.columns(3)
+    
+    # Correlation analysis
+    # Sliced from the cached all-columns matrix instead of recomputed per rerun
+    correlations = get_correlations(df, (dataset_version(columns=df.select_dtypes(include=[np.number]).columns), "all"))
+    if len(stats_df) > 1 and x_metric in correlations.columns and y_metric in correlations.columns:
+        pair = correlations.pair(x_metric, y_metric)
+        with col1:
+            st.markdown(f'''
+            <div class="insight-item">
+                <div class="insight-metric">{pair["r"]:.3f}</div>
+                <div class="insight-desc">Correlation between {x_metric} and {y_metric}
+                ({pair["strength"].lower()}, p={pair["p"]:.2g}, n={pair["n"]})</div>
+            </div>
+            ''', unsafe_allow_html=True)
+    
+    # Top performer
+    if 'Name' in stats_df.columns:
+        top_x = stats_df.loc[stats_df[x_metric].idxmax(), 'Name']
+        top_y = stats_df.loc[stats_df[y_metric].idxmax(), 'Name']
+        
+        with col2:
+            st.markdown(f'''
+            <div class="insight-item">
+                <div class="insight-metric">{top_x}</div>
+                <div class="insight-desc">Highest {x_metric} ({stats_df[x_metric].max():.2f})</div>
+            </div>
+            ''', unsafe_allow_html=True)
+        
+        with col3:
+            st.markdown(f'''
+            <div class="insight-item">
+                <div class="insight-metric">{top_y}</div>
+                <div class="insight-desc">Highest {y_metric} ({stats_df[y_metric].max():.2f})</div>
+            </div>
+            ''', unsafe_allow_html=True)
+
+    # Distribution Analysis
+    st.markdown("### 📈 Distribution Analysis")
+    
+    tab1, tab2 = st.tabs([f"📊 {x_metric} Distribution", f"📈 {y_metric} Distribution"])
+    
+    with tab1:
+        # Pre-binned on the server: the browser gets 20 bars + a KDE curve, not every player
+        fig_hist1 = histogram_figure(get_distributions(df, x_metric)["overall"], color='#00c6ff')
+        fig_hist1.update_layout(
+            template="plotly_dark",
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            height=400,
+            xaxis_title=x_metric,
+            yaxis_title="Players"
+        )
+        st.plotly_chart(fig_hist1, use_container_width=True)
+    
+    with tab2:
+        # Pre-binned on the server: the browser gets 20 bars + a KDE curve, not every player
+        fig_hist2 = histogram_figure(get_distributions(df, y_metric)["overall"], color='#ff6b35')
+        fig_hist2.update_layout(
+            template="plotly_dark",
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            height=400,
+            xaxis_title=y_metric,
+            yaxis_title="Players"
+        )
+        st.plotly_chart(fig_hist2, use_container_width=True)
+    telemetry.mark("insights")
+
 def main():
     # Enhanced CSS for Scouting Metrics page
     st.markdown("""
@@ -337,367 +698,64 @@ def main():
         height: 100%;
         background: linear-gradient(135deg, var(--gold)10, var(--orange)10);
         opacity: 0;
-        transition: opacity 0.3s ease;
-    }
-    
-    .filter-chip:hover {
-        transform: translateY(-2px);
-        border-color: var(--gold);
-        box-shadow: 0 4px 8px rgba(255,215,0,0.2);
-    }
-    
-    .filter-chip:hover::before {
-        opacity: 1;
-    }
-    
-    .filter-chip.active {
-        background: linear-gradient(135deg, var(--gold), var(--orange));
-        color: white;
-        border-color: var(--gold);
-    }
-    
-    .warning-box {
-        background: linear-gradient(135deg, rgba(255,107,53,0.1), rgba(255,71,87,0.1));
-        border: 1px solid rgba(255,107,53,0.2);
-        border-radius: 12px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        text-align: center;
-    }
-    
-    /* Hide empty containers */
-    .element-container:empty {
-        display: none !important;
-    }
-    
-    .stContainer > div:empty {
-        display: none !important;
-    }
-    
-    div[data-testid="stVerticalBlock"]:empty {
-        display: none !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
-    # Page Header
-    st.markdown('''
-    <div class="page-header">
-        <h1 class="page-title">📊 Scouting Metrics</h1>
-        <p class="page-subtitle">Advanced performance visualization and statistical analysis</p>
-    </div>
-    ''', unsafe_allow_html=True)
-    
-    df = load_data()
-    if df.empty:
-        return
-
-    # Enhanced Control Panel
-    st.markdown("### ⚡ Visualization Controls")
-    
-    col1, col2 = st.columns([2, 1])
-    
-    with col1:
-        # Get available numeric columns
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        # Remove market_value if it has too many NaN values
-        if 'market_value' in numeric_cols and df['market_value'].isna().sum() > len(df) * 0.5:
-            numeric_cols.remove('market_value')
-        
-        if len(numeric_cols) < 2:
-            st.error("Not enough numeric columns available for visualization.")
-            return
-        
-        x_metric = st.selectbox("📈 X-Axis Metric", numeric_cols, index=0)
-        y_metric = st.selectbox("📊 Y-Axis Metric", numeric_cols, 
-                               index=1 if len(numeric_cols) > 1 else 0)
-        
-        # Size metric with proper handling
-        size_options = ["None"] + [col for col in numeric_cols if col not in [x_metric, y_metric]]
-        size_metric = st.selectbox("📏 Bubble Size (Optional)", size_options)
-        
-        # Color coding options
-        color_options = ["None", "League", "Position", "Age_Group"] + numeric_cols
-        color_metric = st.selectbox("🎨 Color Coding", color_options)
-    
-    with col2:
-        st.markdown("### 📊 Quick Metrics")
-        
-        total_players = len(df)
-        avg_age = df['Age'].mean() if 'Age' in df.columns else 0
-        
-        st.markdown(f'''
-        <div class="metric-card">
-            <div class="metric-icon">👥</div>
-            <div class="metric-value">{total_players}</div>
-            <div class="metric-label">Total Players</div>
-        </div>
-        ''', unsafe_allow_html=True)
-        
-        if avg_age > 0:
-            st.markdown(f'''
-            <div class="metric-card">
-                <div class="metric-icon">📅</div>
-                <div class="metric-value">{avg_age:.1f}</div>
-                <div class="metric-label">Avg Age</div>
-            </div>
-            ''', unsafe_allow_html=True)
-
-    # FIXED: Data preparation with proper size handling
-    plot_df = df.copy()
-    
-    # Remove rows with NaN values in selected metrics
-    plot_df = plot_df.dropna(subset=[x_metric, y_metric])
+        transition: opacity 0.3s ease;
+    }
     
-    if plot_df.empty:
-        st.markdown('''
-        <div class="warning-box">
-            <strong>⚠️ No data available</strong><br>
-            The selected metrics contain no valid data points.
-        </div>
-        ''', unsafe_allow_html=True)
-        return
+    .filter-chip:hover {
+        transform: translateY(-2px);
+        border-color: var(--gold);
+        box-shadow: 0 4px 8px rgba(255,215,0,0.2);
+    }
     
-    # FIXED: Handle size metric properly
-    size_values = None
-    if size_metric != "None":
-        # Remove rows with NaN in size metric
-        plot_df = plot_df.dropna(subset=[size_metric])
-        if not plot_df.empty:
-            # Transform size values to positive range
-            raw_size = plot_df[size_metric].values
-            
-            # Handle negative values by shifting to positive range
-            min_val = raw_size.min()
-            if min_val < 0:
-                # Shift all values to be positive, then scale
-                shifted_values = raw_size - min_val + 1  # +1 to avoid zero
-                # Scale to reasonable bubble size range (5-30)
-                max_shifted = shifted_values.max()
-                size_values = 5 + (shifted_values / max_shifted) * 25
-            else:
-                # Values are already positive, just scale them
-                max_val = raw_size.max()
-                if max_val > 0:
-                    size_values = 5 + (raw_size / max_val) * 25
-                else:
-                    size_values = [10] * len(raw_size)  # Default size
-        else:
-            size_metric = "None"  # Fallback if no valid data
+    .filter-chip:hover::before {
+        opacity: 1;
+    }
     
-    # Handle color coding
-    color_values = None
-    if color_metric != "None":
-        if color_metric == "Age_Group":
-            # Create age groups
-            if 'Age' in plot_df.columns:
-                plot_df['Age_Group'] = pd.cut(plot_df['Age'], 
-                                            bins=[0, 23, 27, 32, 50], 
-                                            labels=['Young (≤23)', 'Prime (24-27)', 'Experienced (28-32)', 'Veteran (33+)'])
-                color_values = plot_df['Age_Group']
-        else:
-            color_values = plot_df[color_metric]
-
-    # Enhanced Scatter Plot
-    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    st.markdown(f'<div class="section-title">📊 {x_metric} vs {y_metric} Analysis</div>', unsafe_allow_html=True)
+    .filter-chip.active {
+        background: linear-gradient(135deg, var(--gold), var(--orange));
+        color: white;
+        border-color: var(--gold);
+    }
     
-    if plot_df.empty:
-        st.warning("No data points available after filtering.")
-        st.markdown('</div>', unsafe_allow_html=True)
-        return
+    .warning-box {
+        background: linear-gradient(135deg, rgba(255,107,53,0.1), rgba(255,71,87,0.1));
+        border: 1px solid rgba(255,107,53,0.2);
+        border-radius: 12px;
+        padding: 1.5rem;
+        margin: 1rem 0;
+        text-align: center;
+    }
     
-    # Create the scatter plot
-    fig = go.Figure()
+    /* Hide empty containers */
+    .element-container:empty {
+        display: none !important;
+    }
     
-    if color_values is not None:
-        # Colored scatter plot
-        if color_metric in ['League', 'Position', 'Age_Group']:
-            # Categorical coloring
-            unique_categories = color_values.unique()
-            colors = px.colors.qualitative.Set3[:len(unique_categories)]
-            
-            for i, category in enumerate(unique_categories):
-                if pd.isna(category):
-                    continue
-                    
-                mask = color_values == category
-                category_df = plot_df[mask]
-                
-                fig.add_trace(go.Scattergl(
-                    x=category_df[x_metric],
-                    y=category_df[y_metric],
-                    mode='markers',
-                    name=str(category),
-                    marker=dict(
-                        size=size_values[mask] if size_values is not None else 10,
-                        color=colors[i % len(colors)],
-                        opacity=0.7,
-                        line=dict(width=1, color='white')
-                    ),
-                    text=category_df['Name'] if 'Name' in category_df.columns else None,
-                    hovertemplate=
-                    "<b>%{text}</b><br>" +
-                    f"{x_metric}: %{{x:.2f}}<br>" +
-                    f"{y_metric}: %{{y:.2f}}<br>" +
-                    f"{color_metric}: {category}<br>" +
-                    "<extra></extra>"
-                ))
-        else:
-            # Continuous coloring
-            fig.add_trace(go.Scattergl(
-                x=plot_df[x_metric],
-                y=plot_df[y_metric],
-                mode='markers',
-                marker=dict(
-                    size=size_values if size_values is not None else 10,
-                    color=color_values,
-                    colorscale='Viridis',
-                    opacity=0.7,
-                    colorbar=dict(title=color_metric),
-                    line=dict(width=1, color='white')
-                ),
-                text=plot_df['Name'] if 'Name' in plot_df.columns else None,
-                hovertemplate=
-                "<b>%{text}</b><br>" +
-                f"{x_metric}: %{{x:.2f}}<br>" +
-                f"{y_metric}: %{{y:.2f}}<br>" +
-                f"{color_metric}: %{{marker.color:.2f}}<br>" +
-                "<extra></extra>",
-                showlegend=False
-            ))
-    else:
-        # Single color scatter plot
-        fig.add_trace(go.Scattergl(
-            x=plot_df[x_metric],
-            y=plot_df[y_metric],
-            mode='markers',
-            marker=dict(
-                size=size_values if size_values is not None else 10,
-                color='#00c6ff',
-                opacity=0.7,
-                line=dict(width=1, color='white')
-            ),
-            text=plot_df['Name'] if 'Name' in plot_df.columns else None,
-            hovertemplate=
-            "<b>%{text}</b><br>" +
-            f"{x_metric}: %{{x:.2f}}<br>" +
-            f"{y_metric}: %{{y:.2f}}<br>" +
-            "<extra></extra>",
-            showlegend=False
-        ))
+    .stContainer > div:empty {
+        display: none !important;
+    }
     
-    # Enhanced layout
-    fig.update_layout(
-        template="plotly_dark",
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        height=600,
-        xaxis=dict(
-            title=dict(text=x_metric, font=dict(size=16, color='white')),
-            tickfont=dict(size=14, color='white'),
-            gridcolor='rgba(255,255,255,0.2)',
-            zerolinecolor='rgba(255,255,255,0.3)'
-        ),
-        yaxis=dict(
-            title=dict(text=y_metric, font=dict(size=16, color='white')),
-            tickfont=dict(size=14, color='white'),
-            gridcolor='rgba(255,255,255,0.2)',
-            zerolinecolor='rgba(255,255,255,0.3)'
-        ),
-        legend=dict(
-            font=dict(size=12, color='white'),
-            bgcolor='rgba(0,0,0,0.5)',
-            bordercolor='rgba(255,255,255,0.2)',
-            borderwidth=1
-        ),
-        margin=dict(t=20, b=20, l=20, r=20)
-    )
+    div[data-testid="stVerticalBlock"]:empty {
+        display: none !important;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+    telemetry.mark("css")
     
-    st.plotly_chart(fig, use_container_width=True)
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    # Enhanced Statistical Insights
+    # Page Header
     st.markdown('''
-    <div class="insight-panel">
-        <div class="insight-title">
-            <span>🔍</span>
-            <span>Statistical Insights</span>
-        </div>
+    <div class="page-header">
+        <h1 class="page-title">📊 Scouting Metrics</h1>
+        <p class="page-subtitle">Advanced performance visualization and statistical analysis</p>
     </div>
     ''', unsafe_allow_html=True)
     
-    # Generate insights
-    col1, col2, col3 = st.columns(3)
-    
-    # Correlation analysis
-    if len(plot_df) > 1:
-        correlation = plot_df[x_metric].corr(plot_df[y_metric])
-        with col1:
-            st.markdown(f'''
-            <div class="insight-item">
-                <div class="insight-metric">{correlation:.3f}</div>
-                <div class="insight-desc">Correlation between {x_metric} and {y_metric}</div>
-            </div>
-            ''', unsafe_allow_html=True)
-    
-    # Top performer
-    if 'Name' in plot_df.columns:
-        top_x = plot_df.loc[plot_df[x_metric].idxmax(), 'Name']
-        top_y = plot_df.loc[plot_df[y_metric].idxmax(), 'Name']
-        
-        with col2:
-            st.markdown(f'''
-            <div class="insight-item">
-                <div class="insight-metric">{top_x}</div>
-                <div class="insight-desc">Highest {x_metric} ({plot_df[x_metric].max():.2f})</div>
-            </div>
-            ''', unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown(f'''
-            <div class="insight-item">
-                <div class="insight-metric">{top_y}</div>
-                <div class="insight-desc">Highest {y_metric} ({plot_df[y_metric].max():.2f})</div>
-            </div>
-            ''', unsafe_allow_html=True)
+    df = load_data()
+    telemetry.mark("load data")
+    if df.empty:
+        return
 
-    # Distribution Analysis
-    st.markdown("### 📈 Distribution Analysis")
-    
-    tab1, tab2 = st.tabs([f"📊 {x_metric} Distribution", f"📈 {y_metric} Distribution"])
-    
-    with tab1:
-        fig_hist1 = px.histogram(
-            plot_df, 
-            x=x_metric, 
-            nbins=20,
-            title="",
-            color_discrete_sequence=['#00c6ff']
-        )
-        fig_hist1.update_layout(
-            template="plotly_dark",
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            height=400
-        )
-        st.plotly_chart(fig_hist1, use_container_width=True)
-    
-    with tab2:
-        fig_hist2 = px.histogram(
-            plot_df, 
-            x=y_metric, 
-            nbins=20,
-            title="",
-            color_discrete_sequence=['#ff6b35']
-        )
-        fig_hist2.update_layout(
-            template="plotly_dark",
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            height=400
-        )
-        st.plotly_chart(fig_hist2, use_container_width=True)
+    render_metrics_explorer(df)
 
     # Back button
     st.markdown("---")
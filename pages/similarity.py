@@ -7,11 +7,19 @@ import plotly.express as px
 import plotly.graph_objects as go
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.preprocessing import StandardScaler
+from utils import get_player_index, read_table
+import telemetry
+import figure_cache
+
+PAGE = "similarity"
+
+# Finder settings the pre-warmed bar charts are built with (the widget defaults)
+DEFAULT_SETTINGS = {"top_n": 10, "include_ovr": False, "ovr_weight": 0.15}
 
-@st.cache_data
 def load_data():
+    """The player table of the dataset snapshot this session is pinned to"""
     try:
-        return pd.read_csv('forwards_clean_with_market_values_updated.csv')
+        return read_table()
     except FileNotFoundError:
         st.error("Data file not found.")
         return pd.DataFrame()
@@ -27,7 +35,7 @@ def prepare_similarity_data(df):
     missing_cols = [col for col in feature_cols if col not in df.columns]
     if missing_cols:
         st.error(f"Missing required columns: {missing_cols}")
-        return None, None, None
+        return None, None
     
     # Create forwards_scaled (assuming the data is already scaled)
     forwards_scaled = df.copy()
@@ -35,11 +43,9 @@ def prepare_similarity_data(df):
     # Extract feature matrix
     X_fw = forwards_scaled[feature_cols].values
     
-    # Create name to index mapping
-    name_to_idx = {name: idx for idx, name in enumerate(forwards_scaled['Name'])}
-    
-    return forwards_scaled, X_fw, name_to_idx
+    return forwards_scaled, X_fw
 
+@telemetry.timed("similarity search")
 def get_top_similar_forwards(player_name, forwards_scaled, X_fw, name_to_idx, 
                            top_n=10, include_ovr_weight=False, ovr_weight=0.15):
     """
@@ -72,14 +78,277 @@ def get_top_similar_forwards(player_name, forwards_scaled, X_fw, name_to_idx,
         'market_value': forwards_scaled.get('market_value', 0)
     })
 
-    # Exclude the player himself and sort
-    results = results[results['Name'] != player_name] \
+    # Exclude the player himself (by row, so namesakes stay in) and sort
+    results = results[np.arange(len(results)) != idx] \
                  .sort_values('Similarity', ascending=False) \
                  .head(top_n) \
                  .reset_index(drop=True)
 
     return results
 
+def similarity_bar_figure(similar_players):
+    """Horizontal bar chart of the similarity scores of the top-N players"""
+    fig_bar = go.Figure()
+
+    fig_bar.add_trace(go.Bar(
+        x=similar_players['Similarity'],
+        y=similar_players['Name'],
+        orientation='h',
+        marker=dict(
+            color=similar_players['Similarity'],
+            colorscale='Teal',
+            colorbar=dict(title="Similarity Score")
+        ),
+        text=[f"{score:.3f}" for score in similar_players['Similarity']],
+        textposition='inside',
+        hovertemplate=
+        "<b>%{y}</b><br>" +
+        "Similarity: %{x:.3f}<br>" +
+        "<extra></extra>"
+    ))
+
+    fig_bar.update_layout(
+        template="plotly_dark",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=400,
+        xaxis=dict(
+            title="Similarity Score",
+            tickfont=dict(color='white'),
+            range=[0, 1]
+        ),
+        yaxis=dict(
+            title="",
+            tickfont=dict(color='white'),
+            categoryorder='total ascending'
+        ),
+        margin=dict(t=20, b=20, l=20, r=20)
+    )
+    return fig_bar
+
+def prewarm_similarity_bars(forwards_scaled, X_fw, name_to_idx):
+    """Queue bar charts (default settings) of the most-viewed players on the figure cache worker"""
+    figures = figure_cache.get_figure_cache()
+    entries = []
+    for label in figures.most_viewed():
+        if label not in name_to_idx:
+            continue
+        inputs = {"player": label, **DEFAULT_SETTINGS}
+        entries.append((
+            figure_cache.figure_key(PAGE, "similarity_bar", inputs),
+            lambda label=label: similarity_bar_figure(get_top_similar_forwards(
+                label, forwards_scaled, X_fw, name_to_idx, DEFAULT_SETTINGS["top_n"],
+                DEFAULT_SETTINGS["include_ovr"], DEFAULT_SETTINGS["ovr_weight"]))
+        ))
+    return figures.prewarm(entries)
+
+@st.fragment
+@telemetry.fragment_run("similarity finder")
+def render_similarity_finder(df, forwards_scaled, X_fw):
+    """Player picker, settings and results; a fragment, so its widgets rerun only this"""
+    # Display label -> row position from the shared player index (namesakes disambiguated by team)
+    player_index = get_player_index(df)
+    name_to_idx = player_index.positions
+    
+    # FIXED: Direct components without unnecessary containers
+    st.markdown("### 🎯 Find Similar Players")
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        # Player selection
+        players = player_index.labels_for()
+        selected_player = st.selectbox(
+            "Choose a player to find similar players:",
+            [""] + players,
+            help="Select a player to analyze their playing style and find similar forwards"
+        )
+        
+        if selected_player:
+            # Advanced controls in a styled container
+            st.markdown('''
+            <div class="controls-panel">
+                <h4 style="color: var(--teal); margin-bottom: 1rem;">⚙️ Analysis Settings</h4>
+            </div>
+            ''', unsafe_allow_html=True)
+            
+            col_a, col_b = st.columns(2)
+            with col_a:
+                top_n = st.slider("🔢 Number of similar players", 5, 20, 10)
+                
+            with col_b:
+                include_ovr = st.checkbox("📊 Weight by overall rating", value=False,
+                                        help="Boost similarity for players with similar overall ratings")
+            
+            if include_ovr:
+                ovr_weight = st.slider("⚖️ OVR weight influence", 0.0, 0.5, 0.15, 0.05)
+            else:
+                ovr_weight = 0.15
+    
+    with col2:
+        if selected_player:
+            # Target player info
+            target_info = forwards_scaled.iloc[name_to_idx[selected_player]]
+            
+            st.markdown(f'''
+            <div class="target-player">
+                <div class="target-name">{selected_player}</div>
+                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; font-size: 0.9rem;">
+                    <div><strong>Team:</strong> {target_info.get('Team', 'Unknown')}</div>
+                    <div><strong>League:</strong> {target_info.get('League', 'Unknown')}</div>
+                    <div><strong>Age:</strong> {int(target_info.get('Age', 0))} years</div>
+                    <div><strong>OVR:</strong> {target_info.get('OVR', 0):.2f}</div>
+                </div>
+            </div>
+            ''', unsafe_allow_html=True)
+    
+    # Generate similarity results
+    if selected_player:
+        try:
+            with st.spinner("🔍 Finding similar players using cosine similarity..."):
+                similar_players = get_top_similar_forwards(
+                    selected_player, 
+                    forwards_scaled, 
+                    X_fw, 
+                    name_to_idx,
+                    top_n=top_n,
+                    include_ovr_weight=include_ovr,
+                    ovr_weight=ovr_weight
+                )
+            
+            if not similar_players.empty:
+                # Results Display
+                st.markdown(f"### 🎯 Top {top_n} Similar Players")
+                
+                # Similarity visualization
+                st.markdown("### 📊 Similarity Scores")
+                
+                # Similarity bar chart, memoised per player and settings
+                figure_cache.cached_chart(
+                    PAGE, "similarity_bar",
+                    {"player": selected_player, "top_n": top_n, "include_ovr": include_ovr, "ovr_weight": ovr_weight},
+                    lambda: similarity_bar_figure(similar_players), use_container_width=True
+                )
+                figure_cache.get_figure_cache().record_view(selected_player)
+                prewarm_similarity_bars(forwards_scaled, X_fw, name_to_idx)
+                
+                # Player cards with enhanced styling
+                for idx, (_, player) in enumerate(similar_players.iterrows()):
+                    similarity_score = player['Similarity']
+                    
+                    # Color coding based on similarity
+                    if similarity_score >= 0.9:
+                        score_color = "#00e676"  # Green for very high similarity
+                    elif similarity_score >= 0.8:
+                        score_color = "#00c6ff"  # Blue for high similarity
+                    elif similarity_score >= 0.7:
+                        score_color = "#ffd700"  # Gold for good similarity
+                    else:
+                        score_color = "#ff6b35"  # Orange for moderate similarity
+                    
+                    st.markdown(f'''
+                    <div class="player-card">
+                        <div class="similarity-score" style="background: {score_color};">
+                            #{idx + 1} • {similarity_score:.3f}
+                        </div>
+                        <h3 style="color: var(--teal); margin: 0 0 1rem 0; font-size: 1.3rem;">
+                            {player['Name']}
+                        </h3>
+                        <div class="player-info">
+                            <div class="info-item">
+                                <div class="info-value">{player.get('Club', 'Unknown')}</div>
+                                <div class="info-label">Team</div>
+                            </div>
+                            <div class="info-item">
+                                <div class="info-value">{player.get('League', 'Unknown')}</div>
+                                <div class="info-label">League</div>
+                            </div>
+                            <div class="info-item">
+                                <div class="info-value">{int(player.get('Age', 0))} yrs</div>
+                                <div class="info-label">Age</div>
+                            </div>
+                        </div>
+                        <div class="similarity-bar">
+                            <div class="similarity-fill" style="width: {similarity_score * 100}%;"></div>
+                        </div>
+                    </div>
+                    ''', unsafe_allow_html=True)
+                
+                # Advanced Analytics
+                st.markdown("### 📈 Similarity Analysis")
+                
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    avg_similarity = similar_players['Similarity'].mean()
+                    st.markdown(f'''
+                    <div class="stat-box">
+                        <div class="stat-value" style="color: var(--teal);">{avg_similarity:.3f}</div>
+                        <div class="stat-label">Average Similarity</div>
+                    </div>
+                    ''', unsafe_allow_html=True)
+                
+                with col2:
+                    max_similarity = similar_players['Similarity'].max()
+                    best_match = similar_players.iloc[0]['Name']
+                    st.markdown(f'''
+                    <div class="stat-box">
+                        <div class="stat-value" style="color: var(--accent);">{max_similarity:.3f}</div>
+                        <div class="stat-label">Best Match: {best_match}</div>
+                    </div>
+                    ''', unsafe_allow_html=True)
+                
+                with col3:
+                    # Count high similarity players (>0.8)
+                    high_sim_count = len(similar_players[similar_players['Similarity'] > 0.8])
+                    st.markdown(f'''
+                    <div class="stat-box">
+                        <div class="stat-value" style="color: var(--primary);">{high_sim_count}</div>
+                        <div class="stat-label">High Similarity (>0.8)</div>
+                    </div>
+                    ''', unsafe_allow_html=True)
+                
+                # Export results
+                st.markdown("### 💾 Export Results")
+                
+                # Create downloadable CSV
+                export_df = similar_players.copy()
+                export_df['Target_Player'] = selected_player
+                export_df = export_df[['Target_Player', 'Name', 'Club', 'League', 'Similarity', 'OVR', 'Age', 'market_value']]
+                
+                csv = export_df.to_csv(index=False)
+                st.download_button(
+                    label="📊 Download Similarity Report (CSV)",
+                    data=csv,
+                    file_name=f"{selected_player.replace(' ', '_')}_similarity_report.csv",
+                    mime="text/csv",
+                    use_container_width=True
+                )
+            
+            else:
+                st.warning("No similar players found. Try adjusting the parameters.")
+                
+        except Exception as e:
+            st.error(f"Error finding similar players: {str(e)}")
+    
+    else:
+        # Help section when no player is selected
+        st.markdown("### 🤖 How Player Similarity Works")
+        
+        st.markdown("""
+**🔍 Cosine Similarity Algorithm**
+
+Our similarity engine uses advanced machine learning to find players with similar playing styles:
+
+- **📊 Feature Analysis:** Compares eight key attributes: Pace, Shooting, Passing, Dribbling, Physical, Aerial, Mental, and Overall.
+- **📐 Cosine Similarity:** Measures the angle between player vectors in multi-dimensional space.
+- **⚖️ OVR Weighting:** Optionally boosts similarity scores when players have similar overall ratings.
+- **📈 Normalized Scores:** Results range from 0 (completely different) to 1 (identical).
+
+> 💡 **Tip:** Scores above 0.8 indicate very similar playing styles, while scores above 0.9 suggest near-identical player profiles.
+""")
+    telemetry.mark("similarity")
+
 def main():
     # Enhanced CSS with CRITICAL empty container fixes
     st.markdown("""
@@ -305,6 +574,7 @@ def main():
     }
     </style>
     """, unsafe_allow_html=True)
+    telemetry.mark("css")
     
     # Page Header
     st.markdown('''
@@ -315,6 +585,7 @@ def main():
     ''', unsafe_allow_html=True)
     
     df = load_data()
+    telemetry.mark("load data")
     if df.empty:
         return
 
@@ -323,236 +594,9 @@ def main():
     if result[0] is None:
         return
     
-    forwards_scaled, X_fw, name_to_idx = result
-    
-    # FIXED: Direct components without unnecessary containers
-    st.markdown("### 🎯 Find Similar Players")
-    
-    col1, col2 = st.columns([2, 1])
-    
-    with col1:
-        # Player selection
-        players = sorted(forwards_scaled['Name'].tolist())
-        selected_player = st.selectbox(
-            "Choose a player to find similar players:",
-            [""] + players,
-            help="Select a player to analyze their playing style and find similar forwards"
-        )
-        
-        if selected_player:
-            # Advanced controls in a styled container
-            st.markdown('''
-            <div class="controls-panel">
-                <h4 style="color: var(--teal); margin-bottom: 1rem;">⚙️ Analysis Settings</h4>
-            </div>
-            ''', unsafe_allow_html=True)
-            
-            col_a, col_b = st.columns(2)
-            with col_a:
-                top_n = st.slider("🔢 Number of similar players", 5, 20, 10)
-                
-            with col_b:
-                include_ovr = st.checkbox("📊 Weight by overall rating", value=False,
-                                        help="Boost similarity for players with similar overall ratings")
-            
-            if include_ovr:
-                ovr_weight = st.slider("⚖️ OVR weight influence", 0.0, 0.5, 0.15, 0.05)
-            else:
-                ovr_weight = 0.15
-    
-    with col2:
-        if selected_player:
-            # Target player info
-            target_info = forwards_scaled[forwards_scaled['Name'] == selected_player].iloc[0]
-            
-            st.markdown(f'''
-            <div class="target-player">
-                <div class="target-name">{selected_player}</div>
-                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; font-size: 0.9rem;">
-                    <div><strong>Team:</strong> {target_info.get('Team', 'Unknown')}</div>
-                    <div><strong>League:</strong> {target_info.get('League', 'Unknown')}</div>
-                    <div><strong>Age:</strong> {int(target_info.get('Age', 0))} years</div>
-                    <div><strong>OVR:</strong> {target_info.get('OVR', 0):.2f}</div>
-                </div>
-            </div>
-            ''', unsafe_allow_html=True)
-    
-    # Generate similarity results
-    if selected_player:
-        try:
-            with st.spinner("🔍 Finding similar players using cosine similarity..."):
-                similar_players = get_top_similar_forwards(
-                    selected_player, 
-                    forwards_scaled, 
-                    X_fw, 
-                    name_to_idx,
-                    top_n=top_n,
-                    include_ovr_weight=include_ovr,
-                    ovr_weight=ovr_weight
-                )
-            
-            if not similar_players.empty:
-                # Results Display
-                st.markdown(f"### 🎯 Top {top_n} Similar Players")
-                
-                # Similarity visualization
-                st.markdown("### 📊 Similarity Scores")
-                
-                # Create similarity bar chart
-                fig_bar = go.Figure()
-                
-                fig_bar.add_trace(go.Bar(
-                    x=similar_players['Similarity'],
-                    y=similar_players['Name'],
-                    orientation='h',
-                    marker=dict(
-                        color=similar_players['Similarity'],
-                        colorscale='Teal',
-                        colorbar=dict(title="Similarity Score")
-                    ),
-                    text=[f"{score:.3f}" for score in similar_players['Similarity']],
-                    textposition='inside',
-                    hovertemplate=
-                    "<b>%{y}</b><br>" +
-                    "Similarity: %{x:.3f}<br>" +
-                    "<extra></extra>"
-                ))
-                
-                fig_bar.update_layout(
-                    template="plotly_dark",
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    height=400,
-                    xaxis=dict(
-                        title="Similarity Score",
-                        tickfont=dict(color='white'),
-                        range=[0, 1]
-                    ),
-                    yaxis=dict(
-                        title="",
-                        tickfont=dict(color='white'),
-                        categoryorder='total ascending'
-                    ),
-                    margin=dict(t=20, b=20, l=20, r=20)
-                )
-                
-                st.plotly_chart(fig_bar, use_container_width=True)
-                
-                # Player cards with enhanced styling
-                for idx, (_, player) in enumerate(similar_players.iterrows()):
-                    similarity_score = player['Similarity']
-                    
-                    # Color coding based on similarity
-                    if similarity_score >= 0.9:
-                        score_color = "#00e676"  # Green for very high similarity
-                    elif similarity_score >= 0.8:
-                        score_color = "#00c6ff"  # Blue for high similarity
-                    elif similarity_score >= 0.7:
-                        score_color = "#ffd700"  # Gold for good similarity
-                    else:
-                        score_color = "#ff6b35"  # Orange for moderate similarity
-                    
-                    st.markdown(f'''
-                    <div class="player-card">
-                        <div class="similarity-score" style="background: {score_color};">
-                            #{idx + 1} • {similarity_score:.3f}
-                        </div>
-                        <h3 style="color: var(--teal); margin: 0 0 1rem 0; font-size: 1.3rem;">
-                            {player['Name']}
-                        </h3>
-                        <div class="player-info">
-                            <div class="info-item">
-                                <div class="info-value">{player.get('Club', 'Unknown')}</div>
-                                <div class="info-label">Team</div>
-                            </div>
-                            <div class="info-item">
-                                <div class="info-value">{player.get('League', 'Unknown')}</div>
-                                <div class="info-label">League</div>
-                            </div>
-                            <div class="info-item">
-                                <div class="info-value">{int(player.get('Age', 0))} yrs</div>
-                                <div class="info-label">Age</div>
-                            </div>
-                        </div>
-                        <div class="similarity-bar">
-                            <div class="similarity-fill" style="width: {similarity_score * 100}%;"></div>
-                        </div>
-                    </div>
-                    ''', unsafe_allow_html=True)
-                
-                # Advanced Analytics
-                st.markdown("### 📈 Similarity Analysis")
-                
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    avg_similarity = similar_players['Similarity'].mean()
-                    st.markdown(f'''
-                    <div class="stat-box">
-                        <div class="stat-value" style="color: var(--teal);">{avg_similarity:.3f}</div>
-                        <div class="stat-label">Average Similarity</div>
-                    </div>
-                    ''', unsafe_allow_html=True)
-                
-                with col2:
-                    max_similarity = similar_players['Similarity'].max()
-                    best_match = similar_players.iloc[0]['Name']
-                    st.markdown(f'''
-                    <div class="stat-box">
-                        <div class="stat-value" style="color: var(--accent);">{max_similarity:.3f}</div>
-                        <div class="stat-label">Best Match: {best_match}</div>
-                    </div>
-                    ''', unsafe_allow_html=True)
-                
-                with col3:
-                    # Count high similarity players (>0.8)
-                    high_sim_count = len(similar_players[similar_players['Similarity'] > 0.8])
-                    st.markdown(f'''
-                    <div class="stat-box">
-                        <div class="stat-value" style="color: var(--primary);">{high_sim_count}</div>
-                        <div class="stat-label">High Similarity (>0.8)</div>
-                    </div>
-                    ''', unsafe_allow_html=True)
-                
-                # Export results
-                st.markdown("### 💾 Export Results")
-                
-                # Create downloadable CSV
-                export_df = similar_players.copy()
-                export_df['Target_Player'] = selected_player
-                export_df = export_df[['Target_Player', 'Name', 'Club', 'League', 'Similarity', 'OVR', 'Age', 'market_value']]
-                
-                csv = export_df.to_csv(index=False)
-                st.download_button(
-                    label="📊 Download Similarity Report (CSV)",
-                    data=csv,
-                    file_name=f"{selected_player.replace(' ', '_')}_similarity_report.csv",
-                    mime="text/csv",
-                    use_container_width=True
-                )
-            
-            else:
-                st.warning("No similar players found. Try adjusting the parameters.")
-                
-        except Exception as e:
-            st.error(f"Error finding similar players: {str(e)}")
-    
-    else:
-        # Help section when no player is selected
-        st.markdown("### 🤖 How Player Similarity Works")
-        
-        st.markdown("""
-**🔍 Cosine Similarity Algorithm**
-
-Our similarity engine uses advanced machine learning to find players with similar playing styles:
-
-- **📊 Feature Analysis:** Compares eight key attributes: Pace, Shooting, Passing, Dribbling, Physical, Aerial, Mental, and Overall.
-- **📐 Cosine Similarity:** Measures the angle between player vectors in multi-dimensional space.
-- **⚖️ OVR Weighting:** Optionally boosts similarity scores when players have similar overall ratings.
-- **📈 Normalized Scores:** Results range from 0 (completely different) to 1 (identical).
-
-> 💡 **Tip:** Scores above 0.8 indicate very similar playing styles, while scores above 0.9 suggest near-identical player profiles.
-""")
+    forwards_scaled, X_fw = result
+    telemetry.mark("prepare")
+    render_similarity_finder(df, forwards_scaled, X_fw)
 
     # Back button
     st.markdown("---")
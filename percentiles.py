@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils import dataset_version
+
+ATTRIBUTES = ["PACE", "SHOOTING", "PASSING", "DRIBBLING", "PHYSICAL", "AERIAL", "MENTAL", "OVR", "market_value"]
+
+# Everything a cube reads: the ranked attributes and the columns that define peer groups
+CUBE_COLUMNS = ATTRIBUTES + ["League", "Position", "Age"]
+
+# Peer groups a percentile can be expressed against
+PEER_GROUPS = {
+    "global": "all forwards",
+    "league": "league",
+    "position": "position",
+    "age_band": "age band",
+}
+
+POSITION_NAMES = {"ST": "strikers", "CF": "centre forwards", "LW": "left wingers", "RW": "right wingers"}
+
+AGE_BANDS = [(0, 21, "U21"), (21, 24, "21-23"), (24, 28, "24-27"), (28, 31, "28-30"), (31, 200, "31+")]
+
+
+def age_band(age) -> str:
+    """Label of the age band an age falls into"""
+    if pd.isna(age):
+        return "Unknown"
+    return next(label for low, high, label in AGE_BANDS if low <= age < high)
+
+
+def ordinal(n: int) -> str:
+    """92 -> '92nd'"""
+    suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+
+class PercentileCube:
+    """
+    Precomputed percentile / rank tables for every attribute x peer group.
+
+    Percentiles are stored as uint8 (0-100) and ranks in the smallest unsigned type
+    that holds the player count, one row per player, so a lookup is an index into an array rather than a groupby.
+    """
+
+    def __init__(self, index, attributes, percentiles, ranks, group_codes, group_labels, group_sizes):
+        self.attributes = list(attributes)
+        self.attr_pos = {a: i for i, a in enumerate(self.attributes)}
+        self.position = {label: pos for pos, label in enumerate(index)}
+        self.percentiles = percentiles      # {group: uint8 (n_players, n_attributes)}
+        self.ranks = ranks                  # {group: uint16/uint32 (n_players, n_attributes)}
+        self.group_codes = group_codes      # {group: int32 (n_players,)}
+        self.group_labels = group_labels    # {group: array of labels per code}
+        self.group_sizes = group_sizes      # {group: int array of member counts per code}
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, attributes=None):
+        """One vectorised groupby-rank per peer group, done once per dataset version"""
+        attributes = [a for a in (attributes or ATTRIBUTES) if a in df.columns]
+        values = df[attributes].apply(pd.to_numeric, errors="coerce")
+        keys = {
+            "global": pd.Series("All", index=df.index),
+            "league": df.get("League", pd.Series("Unknown", index=df.index)).fillna("Unknown"),
+            "position": df.get("Position", pd.Series("Unknown", index=df.index)).fillna("Unknown"),
+            "age_band": df.get("Age", pd.Series(np.nan, index=df.index)).apply(age_band),
+        }
+
+        percentiles, ranks, group_codes, group_labels, group_sizes = {}, {}, {}, {}, {}
+        # No rank exceeds the player count: uint16 up to 65,535 players, wider beyond
+        rank_dtype = np.promote_types(np.min_scalar_type(len(df)), np.uint16)
+        for group, key in keys.items():
+            codes, labels = pd.factorize(key)
+            grouped = values.groupby(codes)
+            # Share of the peer group at or below the player's value
+            pct = grouped.rank(pct=True, method="max") * 100
+            rank = grouped.rank(ascending=False, method="min")
+            percentiles[group] = pct.fillna(0).round().clip(0, 100).to_numpy(dtype=np.uint8)
+            ranks[group] = rank.fillna(0).to_numpy(dtype=rank_dtype)
+            group_codes[group] = codes.astype(np.int32)
+            group_labels[group] = np.asarray(labels)
+            group_sizes[group] = np.bincount(codes, minlength=len(labels))
+
+        return cls(df.index, attributes, percentiles, ranks, group_codes, group_labels, group_sizes)
+
+    def __contains__(self, index_label):
+        return index_label in self.position
+
+    def lookup(self, index_label, attribute, group="global"):
+        """(percentile, rank, group size, group label) for one player and attribute"""
+        pos = self.position[index_label]
+        col = self.attr_pos[attribute]
+        code = self.group_codes[group][pos]
+        return (int(self.percentiles[group][pos, col]), int(self.ranks[group][pos, col]),
+                int(self.group_sizes[group][code]), str(self.group_labels[group][code]))
+
+    def profile(self, index_label, group="global", attributes=None):
+        """{attribute: percentile} for one player against one peer group"""
+        pos = self.position[index_label]
+        attributes = attributes or self.attributes
+        row = self.percentiles[group][pos]
+        return {a: int(row[self.attr_pos[a]]) for a in attributes if a in self.attr_pos}
+
+    def matrix(self, index_labels, group="global", attributes=None):
+        """uint8 (n_players, n_attributes) percentile block for many players in one fancy-index"""
+        attributes = attributes or self.attributes
+        rows = np.fromiter((self.position[label] for label in index_labels), dtype=np.intp)
+        cols = np.array([self.attr_pos[a] for a in attributes], dtype=np.intp)
+        return self.percentiles[group][np.ix_(rows, cols)]
+
+    def group_label(self, index_label, group):
+        pos = self.position[index_label]
+        return str(self.group_labels[group][self.group_codes[group][pos]])
+
+    def describe(self, index_label, attribute, group="global"):
+        """Human readable peer context, e.g. '92nd percentile among Ligue 1 forwards (#4 of 61)'"""
+        pct, rank, size, label = self.lookup(index_label, attribute, group)
+        if group == "global":
+            peers = "all forwards"
+        elif group == "position":
+            peers = POSITION_NAMES.get(label, f"{label} players")
+        else:
+            peers = f"{label} forwards"
+        return f"{ordinal(pct)} percentile among {peers} (#{rank} of {size})"
+
+    def nbytes(self):
+        return sum(a.nbytes for a in self.percentiles.values()) + sum(a.nbytes for a in self.ranks.values())
+
+
+@st.cache_resource(show_spinner=False)
+def _cached_cube(_df, version, n_rows):
+    return PercentileCube.build(_df)
+
+
+def get_percentile_cube(df: pd.DataFrame, version: str = None) -> PercentileCube:
+    """
+    Shared cube for the full dataset, built once per version of CUBE_COLUMNS and
+    reused across reruns, sessions, pages and reloads that leave those columns alone.
+    """
+    return _cached_cube(df, version or dataset_version(columns=CUBE_COLUMNS), len(df))
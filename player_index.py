@@ -0,0 +1,106 @@
+import re
+import unicodedata
+from collections import defaultdict
+
+import pandas as pd
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Columns a PlayerIndex is built from; it is rebuilt only when one of them changes
+INDEX_COLUMNS = ["Name", "Team", "Position"]
+
+# Longest player name (in tokens) tried when scanning free text for names
+MAX_NAME_TOKENS = 5
+
+
+def normalize_name(name) -> str:
+    """Lowercase, strip accents and punctuation: 'Kylian Mbappé' -> 'kylian mbappe'"""
+    text = unicodedata.normalize("NFKD", str(name))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return " ".join(TOKEN_RE.findall(text))
+
+
+class PlayerIndex:
+    """
+    Hash index over player names, built once per dataset.
+
+    - label -> DataFrame index (labels are the display names; duplicate names
+      get the team appended, e.g. 'joao pedro (Chelsea)')
+    - normalised name -> DataFrame indexes, and name token -> DataFrame indexes
+    - pre-sorted label lists, overall and per position
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        names = df["Name"].astype(str)
+        teams = df["Team"].fillna("?").astype(str) if "Team" in df.columns else pd.Series("?", index=df.index)
+        duplicated = names.duplicated(keep=False)
+        labels = names.where(~duplicated, names + " (" + teams + ")")
+
+        self.rows = dict(zip(labels, df.index))
+        self.labels = dict(zip(df.index, labels))
+        self.positions = {label: pos for pos, label in enumerate(labels)}
+        self.by_name = defaultdict(list)
+        self.by_token = defaultdict(set)
+        for idx, name in zip(df.index, names):
+            normalized = normalize_name(name)
+            self.by_name[normalized].append(idx)
+            for token in normalized.split():
+                self.by_token[token].add(idx)
+
+        self.sorted_labels = sorted(self.rows)
+        self.sorted_by_position = {}
+        if "Position" in df.columns:
+            position_of = dict(zip(df.index, df["Position"]))
+            for label in self.sorted_labels:
+                self.sorted_by_position.setdefault(position_of[self.rows[label]], []).append(label)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def row(self, label):
+        """DataFrame index for a display label or a plain (case/accent-insensitive) name, or None"""
+        if label in self.rows:
+            return self.rows[label]
+        matches = self.by_name.get(normalize_name(label))
+        return matches[0] if matches else None
+
+    def label(self, idx):
+        return self.labels[idx]
+
+    def labels_for(self, position=None, rows=None):
+        """Pre-sorted display labels, optionally for one position and/or restricted to a set of rows"""
+        labels = self.sorted_labels if position is None else self.sorted_by_position.get(position, [])
+        if rows is None:
+            return labels
+        rows = rows if isinstance(rows, (set, frozenset)) else set(rows)
+        return [label for label in labels if self.rows[label] in rows]
+
+    def with_tokens(self, name):
+        """Rows whose name contains every token of `name` ('luis diaz', 'salah')"""
+        result = None
+        for token in normalize_name(name).split():
+            rows = self.by_token.get(token, set())
+            result = set(rows) if result is None else result & rows
+        return result or set()
+
+    def find_in_text(self, text, min_length=4):
+        """
+        Rows of players whose full name appears in free text, longest names first.
+        Scans the text's word n-grams against the name hash, so cost depends on
+        the text length rather than on the number of players.
+        """
+        tokens = normalize_name(text).split()
+        found = []
+        consumed = set()
+        for size in range(min(MAX_NAME_TOKENS, len(tokens)), 0, -1):
+            for start in range(len(tokens) - size + 1):
+                span = set(range(start, start + size))
+                candidate = " ".join(tokens[start:start + size])
+                # Words already part of a longer matched name ('joao pedro') don't match again ('pedro')
+                if len(candidate) < min_length or span & consumed or candidate not in self.by_name:
+                    continue
+                consumed |= span
+                for idx in self.by_name[candidate]:
+                    if idx not in found:
+                        found.append(idx)
+        return found
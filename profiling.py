@@ -0,0 +1,245 @@
+import cProfile
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Profiles are written here, shared by the Streamlit app and the API
+PROFILE_DIR = os.environ.get("SCOUT_PROFILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles"))
+
+# "sampling" writes flamegraph-ready collapsed stacks + speedscope JSON, "cprofile" a pstats .prof file
+PROFILERS = ("sampling", "cprofile")
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+MAX_PROFILES = 200  # oldest profile files beyond this are deleted
+
+_state = {
+    "enabled": os.environ.get("SCOUT_PROFILE", "").lower() in ("1", "true", "yes"),
+    "profiler": os.environ.get("SCOUT_PROFILER", "sampling"),
+}
+_forced = ContextVar("profiling_forced", default=False)
+_last_profile = ContextVar("profiling_last_profile", default=None)
+_write_lock = threading.Lock()
+# Threads with a cProfile hook installed: a thread holds one hook, so a second capture would replace it
+_cprofile_threads = set()
+_cprofile_lock = threading.Lock()
+
+
+def enable(profiler=None):
+    """Profile every wrapped call from now on (process-wide)"""
+    if profiler is not None:
+        if profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler {profiler!r}, choose from {PROFILERS}")
+        _state["profiler"] = profiler
+    _state["enabled"] = True
+
+
+def disable():
+    _state["enabled"] = False
+
+
+def should_profile() -> bool:
+    """The one check a wrapped call pays when profiling is off"""
+    return _state["enabled"] or _forced.get()
+
+
+@contextmanager
+def forced():
+    """Profile wrapped calls made inside this block (e.g. one request that asked for it)"""
+    token = _forced.set(True)
+    try:
+        yield
+    finally:
+        _forced.reset(token)
+
+
+def last_profile():
+    """Files written by the latest profiled call in this context, or None"""
+    return _last_profile.get()
+
+
+def status(limit=20) -> dict:
+    return {"enabled": _state["enabled"], "profiler": _state["profiler"], "directory": PROFILE_DIR,
+            "recent": recent_profiles(limit)}
+
+
+def recent_profiles(limit=20):
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    names = sorted(os.listdir(PROFILE_DIR), key=lambda n: os.path.getmtime(os.path.join(PROFILE_DIR, n)), reverse=True)
+    return names[:limit]
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack at a fixed interval (wall clock) from a background
+    thread. Only frames below `root` are kept; samples taken while the thread was running
+    something else (another coroutine, or the event loop waiting on I/O) count as [elsewhere].
+    """
+
+    def __init__(self, thread_id, root, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.root = root
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="profiling-sampler")
+
+    @staticmethod
+    def frame_name(frame):
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None and frame is not self.root:
+            stack.append(self.frame_name(frame))
+            frame = frame.f_back
+        if frame is None:
+            stack = ["[elsewhere]"]
+        self.stacks[tuple(reversed(stack))] += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def _collapsed(name, stacks):
+    """Brendan Gregg's folded format: 'root;caller;callee count' per line"""
+    return "".join(f"{';'.join((name,) + stack)} {count}\n" for stack, count in stacks.most_common())
+
+
+def _speedscope(name, stacks, interval_ms, elapsed_ms):
+    frames, index = [], {}
+    samples, weights = [], []
+    for stack, count in stacks.items():
+        ids = []
+        for frame in (name,) + stack:
+            if frame not in index:
+                index[frame] = len(frames)
+                frames.append({"name": frame})
+            ids.append(index[frame])
+        samples.append(ids)
+        weights.append(count * interval_ms)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [{"type": "sampled", "name": name, "unit": "milliseconds", "startValue": 0,
+                      "endValue": elapsed_ms, "samples": samples, "weights": weights}],
+        "name": name,
+        "exporter": "scout-profiling",
+    }
+
+
+def _write(name, elapsed, sampler=None, profile=None):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stem = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{name}-{uuid.uuid4().hex[:6]}")
+    paths = []
+    if sampler is not None:
+        with open(stem + ".collapsed", "w") as f:
+            f.write(_collapsed(name, sampler.stacks))
+        with open(stem + ".speedscope.json", "w") as f:
+            json.dump(_speedscope(name, sampler.stacks, sampler.interval * 1000, elapsed * 1000), f)
+        paths += [stem + ".collapsed", stem + ".speedscope.json"]
+    if profile is not None:
+        profile.dump_stats(stem + ".prof")
+        paths.append(stem + ".prof")
+    _prune()
+    _last_profile.set(paths)
+    print(f"🔬 Profiled {name} in {elapsed * 1000:.0f}ms -> {os.path.basename(stem)}")
+    return paths
+
+
+def _prune():
+    with _write_lock:
+        names = recent_profiles(limit=None)
+        for stale in names[MAX_PROFILES:]:
+            try:
+                os.remove(os.path.join(PROFILE_DIR, stale))
+            except OSError:
+                pass
+
+
+def _claim_cprofile(thread_id) -> bool:
+    with _cprofile_lock:
+        if thread_id in _cprofile_threads:
+            return False
+        _cprofile_threads.add(thread_id)
+        return True
+
+
+@contextmanager
+def _profiling(name, root):
+    """
+    cProfile hooks the whole thread, so on the API's event loop it can serve one request at
+    a time: calls that overlap a running capture on the same thread are sampled instead
+    (and the capture still includes their interleaved work, as it would any coroutine's).
+    """
+    thread_id = threading.get_ident()
+    sampler = profile = None
+    if _state["profiler"] == "cprofile" and _claim_cprofile(thread_id):
+        profile = cProfile.Profile()
+        profile.enable()
+    else:
+        if _state["profiler"] == "cprofile":
+            print(f"🔬 {name} overlaps a cProfile capture on this thread, sampling it instead")
+        sampler = StackSampler(thread_id, root).start()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if profile is not None:
+            profile.disable()
+            with _cprofile_lock:
+                _cprofile_threads.discard(thread_id)
+        if sampler is not None:
+            sampler.stop()
+        _write(name, elapsed, sampler, profile)
+
+
+def profile_call(name, fn, force=False):
+    """Call fn(), profiled when profiling is on or `force` is set (a page that asked via ?profile=1)"""
+    if not (force or should_profile()):
+        return fn()
+    with _profiling(name, sys._getframe()):
+        return fn()
+
+
+def profiled(name=None):
+    """Decorator for sync or async functions: a plain call unless should_profile()"""
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if not should_profile():
+                    return await fn(*args, **kwargs)
+                with _profiling(label, sys._getframe()):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not should_profile():
+                return fn(*args, **kwargs)
+            with _profiling(label, sys._getframe()):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
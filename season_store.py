@@ -0,0 +1,262 @@
+import argparse
+import bisect
+import json
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from dataset_watcher import DatasetChange, DatasetSnapshot
+from player_index import normalize_name
+
+# Where snapshot history lives: <root>/manifest.json plus one delta file per snapshot under season=<season>/
+STORE_PATH = os.environ.get("SCOUT_SEASON_STORE", "seasons")
+MANIFEST = "manifest.json"
+
+# A player is the same player across snapshots when these match (normalised); clubs change, names rarely do
+KEY_COLUMNS = ["Name", "Nation"]
+
+# Bookkeeping columns of the delta files and the version table
+KEY, OP, VALID_FROM, VALID_TO = "_key", "_op", "_valid_from", "_valid_to"
+
+AS_OF_CACHE_SIZE = 8  # materialised as-of tables kept per store
+
+
+def season_of(day) -> str:
+    """Football season of a date (seasons start in July): 2025-01-15 -> '2024-25'"""
+    day = pd.Timestamp(day)
+    start = day.year if day.month >= 7 else day.year - 1
+    return f"{start}-{(start + 1) % 100:02d}"
+
+
+def player_keys(df: pd.DataFrame) -> pd.Series:
+    """
+    Stable id per player: normalised name + nation. Players sharing both get their team
+    appended, and any that still clash a running number, so keys are unique per snapshot.
+    """
+    parts = [df[c].map(normalize_name) if c in df.columns else pd.Series("", index=df.index) for c in KEY_COLUMNS]
+    keys = parts[0].str.cat(parts[1:], sep="|")
+    clash = keys.duplicated(keep=False)
+    if clash.any() and "Team" in df.columns:
+        keys = keys.where(~clash, keys + "|" + df["Team"].map(normalize_name))
+    clash = keys.duplicated(keep=False)
+    if clash.any():
+        keys = keys.where(~clash, keys + "#" + keys.groupby(keys).cumcount().astype(str))
+    return keys
+
+
+def canonical(df: pd.DataFrame) -> pd.DataFrame:
+    """Numbers as float64, everything else as object, so values read back from a delta file compare equal"""
+    return df.apply(lambda col: col.astype("float64") if pd.api.types.is_numeric_dtype(col) else col.astype(object))
+
+
+class SeasonStore:
+    """
+    History of the player table as a chain of deltas. Each ingested snapshot writes only the
+    players added or changed since the previous one plus the keys removed, partitioned by
+    season. In memory the deltas become one version table (a row per player version with
+    the dates it was valid), sorted by player, which answers as-of queries with one
+    vectorised filter and per-player time series with a slice.
+    """
+
+    def __init__(self, root=STORE_PATH):
+        self.root = root
+        self.manifest = self._read_manifest()
+        self.schema = self.manifest.get("schema", {})
+        deltas = [self._read_delta(entry) for entry in self.snapshots]
+        self._log = pd.concat(deltas, ignore_index=True) if deltas else pd.DataFrame(columns=[KEY, OP, VALID_FROM])
+        self._build()
+
+    @property
+    def snapshots(self) -> list:
+        """Manifest entries (date, season, path, counts), oldest first"""
+        return self.manifest.get("snapshots", [])
+
+    @property
+    def dates(self) -> list:
+        return self._dates
+
+    def seasons(self) -> list:
+        return list(dict.fromkeys(entry["season"] for entry in self.snapshots))
+
+    # --- ingestion ---
+
+    def ingest(self, df: pd.DataFrame, day=None, season=None) -> dict:
+        """
+        Add a snapshot taken on `day` (default today). Only the difference to the latest
+        snapshot is written. Snapshots must arrive in date order; re-ingesting the latest
+        date replaces nothing and raises instead.
+        """
+        day = pd.Timestamp(day or date.today()).normalize()
+        if self.dates and day <= self.dates[-1]:
+            raise ValueError(f"Snapshot {day.date()} is not newer than the latest one ({self.dates[-1].date()})")
+        season = season or season_of(day)
+
+        new = canonical(df.set_axis(player_keys(df), axis=0))
+        self.schema.update({c: str(new[c].dtype) for c in new.columns if c not in self.schema})
+        new = new.reindex(columns=list(self.schema))
+        old = self.as_of().reindex(columns=list(self.schema))
+        change = DatasetChange(DatasetSnapshot(old), DatasetSnapshot(new))
+
+        upserts = new.loc[change.changed_rows().union(change.added)]
+        delta = pd.concat([
+            upserts.assign(**{OP: "upsert"}),
+            pd.DataFrame({OP: "delete"}, index=change.removed),
+        ]).rename_axis(KEY).reset_index()
+
+        entry = {
+            "date": day.date().isoformat(),
+            "season": season,
+            "path": os.path.join(f"season={season}", f"{day.date().isoformat()}.csv.gz"),
+            "rows": len(new),
+            "added": len(change.added),
+            "removed": len(change.removed),
+            "changed": len(upserts) - len(change.added),
+        }
+        path = os.path.join(self.root, entry["path"])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        delta.to_csv(path, index=False)
+        self.manifest = {"schema": self.schema, "snapshots": self.snapshots + [entry]}
+        self._write_manifest()
+
+        self._log = pd.concat([self._log, delta.assign(**{VALID_FROM: day})], ignore_index=True)
+        self._build()
+        return entry
+
+    # --- queries ---
+
+    def as_of(self, day=None) -> pd.DataFrame:
+        """The player table as it was on `day` (default: latest snapshot), indexed by player key"""
+        if not self.snapshots:
+            return pd.DataFrame(columns=list(self.schema))
+        position = len(self.dates) if day is None else bisect.bisect_right(self.dates, pd.Timestamp(day))
+        if position == 0:
+            return pd.DataFrame(columns=list(self.schema))
+        snapshot = self.dates[position - 1]
+        if snapshot not in self._as_of:
+            valid = (self.versions[VALID_FROM] <= snapshot) & (self.versions[VALID_TO].isna() | (self.versions[VALID_TO] > snapshot))
+            table = self.versions.loc[valid].set_index(KEY)[list(self.schema)]
+            if len(self._as_of) >= AS_OF_CACHE_SIZE:
+                self._as_of.pop(next(iter(self._as_of)))
+            self._as_of[snapshot] = table
+        return self._as_of[snapshot]
+
+    def find(self, name) -> list:
+        """Player keys whose normalised name matches `name`"""
+        prefix = normalize_name(name) + "|"
+        return [key for key in self._slices if key.startswith(prefix)]
+
+    def player_history(self, key, columns=None) -> pd.DataFrame:
+        """
+        One row per snapshot in which the player appears (index: snapshot date), with the season
+        and the values valid on that date.
+        """
+        start, stop = self._slices.get(key, (0, 0))
+        versions = self.versions.iloc[start:stop]
+        columns = list(self.schema) if columns is None else list(columns)
+        if versions.empty:
+            return pd.DataFrame(columns=["season"] + columns)
+        # The version valid on each snapshot date: the last one that started on or before it, if not yet ended
+        dates = self._date_array
+        position = np.searchsorted(versions[VALID_FROM].to_numpy(), dates, side="right") - 1
+        valid_to = versions[VALID_TO].to_numpy()[np.maximum(position, 0)]
+        present = (position >= 0) & (np.isnat(valid_to) | (dates < valid_to))
+        timeline = versions[columns].iloc[position[present]].set_axis(pd.DatetimeIndex(dates[present], name="date"))
+        timeline.insert(0, "season", [entry["season"] for entry, keep in zip(self.snapshots, present) if keep])
+        return timeline
+
+    def trend(self, metric, by=None, stat="median") -> pd.DataFrame:
+        """`stat` of `metric` per snapshot date (rows), overall or per value of `by` (columns); memoised"""
+        if (metric, by, stat) in self._trends:
+            return self._trends[(metric, by, stat)]
+        frames = {}
+        for day in self.dates:
+            table = self.as_of(day)
+            if metric not in table.columns:
+                continue
+            values = table[metric].astype("float64")
+            frames[day] = values.groupby(table[by]).agg(stat) if by else pd.Series({metric: values.agg(stat)})
+        trend = pd.DataFrame(frames).T.rename_axis("date")
+        self._trends[(metric, by, stat)] = trend
+        return trend
+
+    def stats(self) -> dict:
+        return {
+            "snapshots": len(self.snapshots),
+            "seasons": len(self.seasons()),
+            "players": len(self._slices),
+            "versions": len(self.versions),
+            "latest_rows": self.snapshots[-1]["rows"] if self.snapshots else 0,
+        }
+
+    # --- internals ---
+
+    def _build(self):
+        """Version table from the delta log: a version is valid until the player's next delta row"""
+        log = self._log.sort_values([KEY, VALID_FROM], kind="stable", ignore_index=True)
+        log[VALID_TO] = log.groupby(KEY)[VALID_FROM].shift(-1)
+        self.versions = log.loc[log[OP] == "upsert"].drop(columns=OP).reset_index(drop=True)
+        keys = self.versions[KEY].to_numpy()
+        unique, starts = np.unique(keys, return_index=True)
+        stops = np.append(starts[1:], len(keys))
+        self._slices = dict(zip(unique, zip(starts, stops)))
+        self._as_of = {}
+        self._trends = {}
+        self._dates = [pd.Timestamp(entry["date"]) for entry in self.snapshots]
+        self._date_array = np.array(self._dates, dtype="datetime64[ns]")
+
+    def _read_delta(self, entry) -> pd.DataFrame:
+        types = {c: object for c, dtype in self.schema.items() if dtype == "object"}
+        delta = pd.read_csv(os.path.join(self.root, entry["path"]), dtype={KEY: object, OP: object, **types},
+                            float_precision="round_trip")
+        numeric = [c for c, dtype in self.schema.items() if dtype != "object" and c in delta.columns]
+        delta[numeric] = delta[numeric].astype("float64")
+        return delta.assign(**{VALID_FROM: pd.Timestamp(entry["date"])})
+
+    def _read_manifest(self) -> dict:
+        try:
+            with open(os.path.join(self.root, MANIFEST)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"schema": {}, "snapshots": []}
+
+    def _write_manifest(self):
+        # Renamed over the old manifest, so readers see the snapshot list before or after, never half of it
+        path = os.path.join(self.root, MANIFEST)
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(path + ".tmp", path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-season player history built from snapshot deltas")
+    parser.add_argument("--store", default=STORE_PATH, help="Store directory (default: SCOUT_SEASON_STORE or ./seasons)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="Add a player CSV as the snapshot of a date")
+    ingest.add_argument("csv")
+    ingest.add_argument("--date", default=None, help="Snapshot date, YYYY-MM-DD (default: today)")
+    ingest.add_argument("--season", default=None, help="Season label (default: derived from the date, e.g. 2024-25)")
+    history = commands.add_parser("history", help="Print a player's values across snapshots")
+    history.add_argument("name")
+    history.add_argument("--columns", default="OVR,market_value,Team")
+    commands.add_parser("info", help="List the snapshots in the store")
+    args = parser.parse_args()
+
+    store = SeasonStore(args.store)
+    if args.command == "ingest":
+        entry = store.ingest(pd.read_csv(args.csv), args.date, args.season)
+        print(f"✅ {entry['date']} ({entry['season']}): {entry['added']} added, {entry['changed']} changed, "
+              f"{entry['removed']} removed -> {entry['path']}")
+    elif args.command == "history":
+        keys = store.find(args.name)
+        if not keys:
+            print(f"❌ No player named {args.name!r}")
+        for key in keys:
+            print(f"👤 {key}")
+            print(store.player_history(key, args.columns.split(",")).to_string())
+    else:
+        for entry in store.snapshots:
+            print(f"📅 {entry['date']} {entry['season']}: {entry['rows']} players "
+                  f"(+{entry['added']} ~{entry['changed']} -{entry['removed']})")
+        print(f"📦 {store.stats()}")
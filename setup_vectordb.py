@@ -2,12 +2,72 @@ import pandas as pd
 import chromadb
 from sentence_transformers import SentenceTransformer
 import os
+import sys
+import argparse
+import numpy as np
 
-def setup_football_vectordb():
+# Share the embedding cache with the RAG backend
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from embedding_cache import EmbeddingCache
+from vector_quantization import QUANTIZATION_MODES, QuantizedIndex, storage_report, format_storage_report
+
+# Representative scouting queries used to measure recall of quantized storage
+RECALL_QUERIES = [
+    "fast winger with great dribbling",
+    "clinical striker in the Premier League",
+    "young French talent under 20 million",
+    "strong target man good in the air",
+    "creative forward with Finesse Shot play style",
+]
+
+# Columns that feed a player's document and metadata: only changes to these need re-embedding
+DOCUMENT_COLUMNS = ["Name", "Age", "Position", "Nation", "League", "Team", "market_value", "OVR",
+                    "PACE", "SHOOTING", "PASSING", "DRIBBLING", "PHYSICAL", "AERIAL", "MENTAL",
+                    "play style", "Preferred foot", "Height", "Weight"]
+
+def player_document(player):
+    """Rich text description of a player, the text that gets embedded"""
+    return f"""
+        Name: {player['Name']}
+        Age: {player['Age']} years old
+        Position: {player['Position']}
+        Nation: {player['Nation']}
+        League: {player['League']}
+        Team: {player['Team']}
+        Market Value: €{player['market_value']}M
+        Overall Rating: {player['OVR']}
+        Pace: {player['PACE']}
+        Shooting: {player['SHOOTING']}
+        Passing: {player['PASSING']}
+        Dribbling: {player['DRIBBLING']}
+        Physical: {player['PHYSICAL']}
+        Aerial: {player['AERIAL']}
+        Mental: {player['MENTAL']}
+        Play Style: {player['play style']}
+        Preferred Foot: {player['Preferred foot']}
+        Height: {player['Height']}cm
+        Weight: {player['Weight']}kg
+        """
+
+def player_metadata(player):
+    """Filterable Chroma metadata of a player"""
+    return {
+        "name": str(player['Name']),
+        "league": str(player['League']),
+        "nation": str(player['Nation']),
+        "position": str(player['Position']),
+        "market_value": float(player['market_value']),
+        "overall": float(player['OVR']),
+        "age": int(player['Age']),
+        "team": str(player['Team'])
+    }
+
+def setup_football_vectordb(quantization=None, db_path="./football_vectordb",
+                            csv_path="forwards_clean_with_market_values_updated.csv"):
     print("🏗️ Setting up Football Vector Database...")
     
     # Initialize ChromaDB client
-    client = chromadb.PersistentClient(path="./football_vectordb")
+    client = chromadb.PersistentClient(path=db_path)
     
     # Delete existing collection if it exists
     try:
@@ -23,12 +83,13 @@ def setup_football_vectordb():
     )
     
     # Load data
-    df = pd.read_csv("forwards_clean_with_market_values_updated.csv")
+    df = pd.read_csv(csv_path)
     print(f"📊 Loaded {len(df)} players")
     
     # Initialize embedding model
     print("🤖 Loading embedding model...")
     model = SentenceTransformer('all-MiniLM-L6-v2')
+    cache = EmbeddingCache(model_name='all-MiniLM-L6-v2')
     
     # Create documents for each player
     documents = []
@@ -36,51 +97,22 @@ def setup_football_vectordb():
     ids = []
     
     for idx, player in df.iterrows():
-        # Create rich text description for each player
-        doc = f"""
-        Name: {player['Name']}
-        Age: {player['Age']} years old
-        Position: {player['Position']}
-        Nation: {player['Nation']}
-        League: {player['League']}
-        Team: {player['Team']}
-        Market Value: €{player['market_value']}M
-        Overall Rating: {player['OVR']}
-        Pace: {player['PACE']}
-        Shooting: {player['SHOOTING']}
-        Passing: {player['PASSING']}
-        Dribbling: {player['DRIBBLING']}
-        Physical: {player['PHYSICAL']}
-        Aerial: {player['AERIAL']}
-        Mental: {player['MENTAL']}
-        Play Style: {player['play style']}
-        Preferred Foot: {player['Preferred foot']}
-        Height: {player['Height']}cm
-        Weight: {player['Weight']}kg
-        """
-        
-        documents.append(doc)
-        metadatas.append({
-            "name": str(player['Name']),
-            "league": str(player['League']),
-            "nation": str(player['Nation']),
-            "position": str(player['Position']),
-            "market_value": float(player['market_value']),
-            "overall": float(player['OVR']),
-            "age": int(player['Age']),
-            "team": str(player['Team'])
-        })
+        documents.append(player_document(player))
+        metadatas.append(player_metadata(player))
         ids.append(f"player_{idx}")
     
     # Generate embeddings and add to collection in batches
     print("🔄 Generating embeddings...")
     batch_size = 100
+    all_embeddings = []
     for i in range(0, len(documents), batch_size):
         batch_docs = documents[i:i+batch_size]
         batch_metas = metadatas[i:i+batch_size]
         batch_ids = ids[i:i+batch_size]
         
-        embeddings = model.encode(batch_docs)
+        # Unchanged player documents come straight from the cache
+        embeddings = cache.encode(model, batch_docs)
+        all_embeddings.append(embeddings)
         
         collection.add(
             documents=batch_docs,
@@ -90,7 +122,29 @@ def setup_football_vectordb():
         )
         print(f"✅ Processed batch {i//batch_size + 1}/{(len(documents)-1)//batch_size + 1}")
     
+    # Optional compact storage: int8/binary codes in memory, re-ranked with Chroma's float32 vectors
+    if quantization:
+        print(f"🗜️ Building {quantization} quantized vector store...")
+        index = QuantizedIndex.build(ids, np.vstack(all_embeddings), quantization)
+        index.save(db_path)
+        
+        rng = np.random.default_rng(42)
+        sample = index.full_vectors[rng.choice(len(ids), size=min(200, len(ids)), replace=False)]
+        queries = np.vstack([sample, cache.encode(model, RECALL_QUERIES)])
+        report = storage_report(index, queries, k=10, directory=db_path)
+        print(format_storage_report(report))
+    
+    stats = cache.stats()
+    print(f"🧠 Embedding cache: {stats['hits']} hits, {stats['misses']} encoded, {stats['entries']} entries stored")
+    cache.close()
+    
     print(f"🎯 Vector database setup complete! {len(documents)} players indexed.")
 
 if __name__ == "__main__":
-    setup_football_vectordb()
+    parser = argparse.ArgumentParser(description="Build the football player vector database")
+    parser.add_argument("--quantization", choices=QUANTIZATION_MODES, default=None,
+                        help="Also store int8 or binary-quantized vectors for compact retrieval")
+    parser.add_argument("--csv", default=os.environ.get("SCOUT_DATA_PATH", "forwards_clean_with_market_values_updated.csv"),
+                        help="Player CSV to index (e.g. one written by synthetic_data.py)")
+    args = parser.parse_args()
+    setup_football_vectordb(quantization=args.quantization, csv_path=args.csv)
@@ -0,0 +1,256 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+from sklearn.linear_model import LogisticRegression
+
+SOURCE_CSV = "forwards_clean_with_market_values_updated.csv"
+
+# Numeric columns drawn jointly from a Gaussian copula over their empirical marginals (one copula per Position)
+COPULA_COLUMNS = ["PACE", "SHOOTING", "PASSING", "DRIBBLING", "PHYSICAL", "AERIAL", "MENTAL", "OVR",
+                  "Age", "Height", "Weight", "Weak foot", "Skill moves", "cluster", "market_value"]
+INTEGER_COLUMNS = ["Age", "Height", "Weight", "Weak foot", "Skill moves", "cluster"]
+
+# Leagues are drawn given the player's market-value decile (or given that the value is missing)
+VALUE_BUCKETS = 10
+
+# Categoricals drawn from their empirical distribution given a parent column
+CONDITIONAL_COLUMNS = [("Team", "League"), ("Nation", "League"), ("Alternative positions", "Position"),
+                       ("Preferred foot", "Position")]
+
+STAT_COLUMNS = ["PACE", "SHOOTING", "PASSING", "DRIBBLING", "PHYSICAL", "AERIAL", "MENTAL"]
+
+
+def _normal_scores(values, rng):
+    """
+    Rank-based normal scores, the copula's view of a column. Ties are broken at random,
+    so discrete columns (ages, foot ratings) spread over their band instead of collapsing
+    onto one score and weakening their correlations. Missing values stay NaN.
+    """
+    values = np.asarray(values, dtype=float)
+    present = ~np.isnan(values)
+    jitter = rng.random(int(present.sum()))
+    order = np.lexsort((jitter, values[present]))
+    ranks = np.empty(len(order))
+    ranks[order] = np.arange(1, len(order) + 1)
+    scores = np.full(len(values), np.nan)
+    scores[present] = ndtri(ranks / (len(ranks) + 1))
+    return scores
+
+
+def _nearest_correlation(corr):
+    """Clip negative eigenvalues of a pairwise correlation estimate so it can be factorised"""
+    eigenvalues, eigenvectors = np.linalg.eigh(corr)
+    fixed = eigenvectors @ np.diag(np.maximum(eigenvalues, 1e-6)) @ eigenvectors.T
+    scale = np.sqrt(np.diag(fixed))
+    return fixed / np.outer(scale, scale)
+
+
+def _split_traits(text):
+    return [t.strip() for t in str(text).split(",") if t.strip()] if pd.notna(text) else []
+
+
+def _frequency_table(keys, values):
+    """{key: (values, probabilities)} from two aligned arrays, missing values included"""
+    table = pd.Series(values).groupby(pd.Series(keys)).value_counts(normalize=True, dropna=False)
+    return {key: (part.index.get_level_values(1).to_numpy(), part.to_numpy())
+            for key, part in table.groupby(level=0)}
+
+
+def _draw(table, keys, rng):
+    """One draw per key from its frequency table (None for unseen keys)"""
+    out = np.empty(len(keys), dtype=object)
+    for key in pd.unique(keys):
+        mask = keys == key
+        if key not in table:
+            out[mask] = None
+            continue
+        values, probs = table[key]
+        out[mask] = values[rng.choice(len(values), size=int(mask.sum()), p=probs)]
+    return out
+
+
+class GaussianCopula:
+    """Empirical marginals tied together by the correlation of their normal scores"""
+
+    def __init__(self, frame: pd.DataFrame, rng):
+        self.columns = list(frame.columns)
+        scores = np.column_stack([_normal_scores(frame[c].to_numpy(), rng) for c in self.columns])
+        # Pairwise-complete correlations, so partly missing columns (market value) still contribute
+        self.correlation = _nearest_correlation(pd.DataFrame(scores).corr().fillna(0).to_numpy())
+        self.cholesky = np.linalg.cholesky(self.correlation)
+        self.sorted_values = [np.sort(frame[c].dropna().to_numpy()) for c in self.columns]
+        self.scores = scores
+
+    def sample(self, n, rng):
+        """(values frame, normal scores) for n new rows"""
+        z = rng.standard_normal((n, len(self.columns))) @ self.cholesky.T
+        u = ndtr(z)
+        values = {
+            column: np.interp(u[:, i] * (len(sorted_values) - 1), np.arange(len(sorted_values)), sorted_values)
+            for i, (column, sorted_values) in enumerate(zip(self.columns, self.sorted_values))
+        }
+        return pd.DataFrame(values), z
+
+
+class SyntheticPlayerModel:
+    """
+    Learns marginals, rank correlations, conditional categoricals and play-style
+    propensities from the forwards CSV, then samples any number of new players
+    with the same schema.
+    """
+
+    def fit(self, df: pd.DataFrame, seed=0):
+        rng = np.random.default_rng(seed)
+        required = [c for c in COPULA_COLUMNS if c != "market_value"]
+        df = df.dropna(subset=["Name", "Position", "League"] + required).reset_index(drop=True)
+        self.columns = list(df.columns)
+
+        # Position first, then the stats from that position's copula (strikers are taller, wingers quicker)
+        self.positions = df["Position"].value_counts(normalize=True)
+        self.copulas = {position: GaussianCopula(part[COPULA_COLUMNS].astype(float), rng)
+                        for position, part in df.groupby("Position")}
+
+        # League given market-value decile, or given a missing value
+        values = df["market_value"]
+        self.missing_value_rate = float(values.isna().mean())
+        self.value_edges = values.dropna().quantile(np.linspace(0, 1, VALUE_BUCKETS + 1)[1:-1]).to_numpy()
+        buckets = np.where(values.isna(), -1, np.searchsorted(self.value_edges, values.fillna(0).to_numpy()))
+        self.league_given_value = _frequency_table(buckets, df["League"].to_numpy())
+
+        self.conditionals = {column: (parent, _frequency_table(df[parent].to_numpy(), df[column].to_numpy()))
+                             for column, parent in CONDITIONAL_COLUMNS if column in df.columns}
+
+        # Play styles: one logistic model per trait on the stat scores and position, plus its '+' rate
+        traits = df["play style"].map(_split_traits)
+        base = traits.map(lambda ts: [t.rstrip("+") for t in ts])
+        self.trait_names = base.explode().dropna().value_counts().index.to_numpy()
+        plus = traits.explode().dropna()
+        plus_rate = plus.str.endswith("+").groupby(plus.str.rstrip("+")).mean()
+        self.trait_plus_rate = plus_rate.reindex(self.trait_names).fillna(0).to_numpy()
+
+        features = self._trait_features(self._stat_scores(df), df["Position"].to_numpy())
+        self.trait_weights = np.zeros((len(self.trait_names), features.shape[1]))
+        self.trait_bias = np.zeros(len(self.trait_names))
+        for j, trait in enumerate(self.trait_names):
+            has_trait = base.map(lambda ts: trait in ts).to_numpy()
+            model = LogisticRegression(C=1.0, max_iter=500).fit(features, has_trait)
+            self.trait_weights[j], self.trait_bias[j] = model.coef_[0], model.intercept_[0]
+
+        names = df["Name"].str.split()
+        self.first_names = names.str[0].to_numpy()
+        self.last_names = names.str[-1].to_numpy()
+        self.source_rows = len(df)
+        return self
+
+    def _stat_scores(self, df):
+        """Within-position normal scores of the stat columns, the features play styles depend on"""
+        scores = np.zeros((len(df), len(STAT_COLUMNS)))
+        for position, copula in self.copulas.items():
+            rows = np.flatnonzero(df["Position"].to_numpy() == position)
+            stat_index = [copula.columns.index(c) for c in STAT_COLUMNS]
+            scores[rows] = np.nan_to_num(copula.scores[:, stat_index])
+        return scores
+
+    def _trait_features(self, stat_scores, positions):
+        one_hot = np.column_stack([positions == position for position in self.positions.index]).astype(float)
+        return np.hstack([stat_scores, one_hot])
+
+    def _sample_traits(self, stat_scores, positions, rng):
+        """Independent draws from each trait's logistic model, listed most likely first"""
+        logits = self._trait_features(stat_scores, positions) @ self.trait_weights.T + self.trait_bias
+        probs = 1 / (1 + np.exp(-logits))
+        has = rng.random(probs.shape) < probs
+        plus = rng.random(probs.shape) < self.trait_plus_rate
+        order = np.argsort(-probs, axis=1)
+        styles = []
+        for i in range(len(probs)):
+            picked = [self.trait_names[j] + ("+" if plus[i, j] else "") for j in order[i] if has[i, j]]
+            styles.append(", ".join(picked) if picked else None)
+        return styles
+
+    def sample(self, n, rng=None, start_id=0) -> pd.DataFrame:
+        rng = rng or np.random.default_rng()
+        positions = rng.choice(self.positions.index.to_numpy(), size=n, p=self.positions.to_numpy())
+        numeric = pd.DataFrame(index=np.arange(n), columns=COPULA_COLUMNS, dtype=float)
+        stat_scores = np.zeros((n, len(STAT_COLUMNS)))
+        for position, copula in self.copulas.items():
+            rows = np.flatnonzero(positions == position)
+            values, z = copula.sample(len(rows), rng)
+            numeric.iloc[rows] = values[COPULA_COLUMNS].to_numpy()
+            stat_scores[rows] = z[:, [copula.columns.index(c) for c in STAT_COLUMNS]]
+
+        df = pd.DataFrame(index=np.arange(n))
+        for column in COPULA_COLUMNS:
+            values = numeric[column].to_numpy(dtype=float)
+            df[column] = np.rint(values).astype(int) if column in INTEGER_COLUMNS else values
+        df["Position"] = positions
+
+        missing = rng.random(n) < self.missing_value_rate
+        buckets = np.where(missing, -1, np.searchsorted(self.value_edges, df["market_value"].to_numpy()))
+        # Two decimals: the cheapest source players are worth €0.02M, which one decimal would round to an unvalued 0.0
+        df["market_value"] = np.where(missing, np.nan, np.round(df["market_value"], 2))
+        df["League"] = _draw(self.league_given_value, buckets, rng)
+
+        for column, (parent, table) in self.conditionals.items():
+            df[column] = _draw(table, df[parent].to_numpy(), rng)
+
+        df["play style"] = self._sample_traits(stat_scores, positions, rng)
+
+        ids = np.arange(start_id, start_id + n)
+        first = self.first_names[rng.integers(0, len(self.first_names), n)]
+        last = self.last_names[rng.integers(0, len(self.last_names), n)]
+        df["Name"] = [f"{f} {l} {i}" for f, l, i in zip(first, last, ids)]
+        if "team_norm" in self.columns:
+            df["team_norm"] = df["Team"].str.lower()
+        return df.reindex(columns=self.columns)
+
+
+def generate(n, chunk_size=100_000, seed=0, source=SOURCE_CSV, model=None):
+    """Yield synthetic players in DataFrame chunks (names stay unique across chunks)"""
+    model = model or SyntheticPlayerModel().fit(pd.read_csv(source), seed)
+    rng = np.random.default_rng(seed)
+    for start in range(0, n, chunk_size):
+        yield model.sample(min(chunk_size, n - start), rng, start_id=start)
+
+
+def write_players(path, n, chunk_size=100_000, seed=0, source=SOURCE_CSV):
+    """Stream n synthetic players to a .csv or .parquet file without holding them all in memory"""
+    parquet = path.endswith(".parquet")
+    writer = None
+    written = 0
+    try:
+        for i, chunk in enumerate(generate(n, chunk_size, seed, source)):
+            if parquet:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table.cast(writer.schema))
+            else:
+                chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+            written += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic forwards matching the CSV schema")
+    parser.add_argument("rows", type=int, help="Number of players to generate")
+    parser.add_argument("--output", default="synthetic_forwards.csv", help="Output .csv or .parquet path")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--source", default=SOURCE_CSV, help="CSV the distributions are learned from")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    written = write_players(args.output, args.rows, args.chunk_size, args.seed, args.source)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {written:,} synthetic players written to {args.output} in {elapsed:.1f}s "
+          f"({written / elapsed:,.0f} rows/s, {os.path.getsize(args.output) / 1e6:.1f} MB)")
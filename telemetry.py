@@ -0,0 +1,249 @@
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+import streamlit as st
+
+# Every recorded rerun is appended here when set; the debug panel can also export on demand
+TELEMETRY_LOG = os.environ.get("SCOUT_TELEMETRY_LOG")
+DEFAULT_EXPORT_PATH = "telemetry.jsonl"
+
+HISTORY_SIZE = 50  # reruns kept per session for the debug panel
+
+_local = threading.local()
+_hooks_lock = threading.Lock()
+_hooks_installed = []
+
+
+class RunRecorder:
+    """Section timings and cache hits/misses of one script rerun (or of one fragment-only rerun)"""
+
+    def __init__(self, page, session, fragment=None):
+        self.page = page
+        self.session = session
+        self.fragment = fragment
+        self.timestamp = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+        self.start = self.last_mark = time.perf_counter()
+        self.marks = []  # (name, ms): laps along the page, top to bottom
+        self.sections = defaultdict(lambda: {"calls": 0, "ms": 0.0})
+        self.cache = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.marks.append((name, (now - self.last_mark) * 1000))
+        self.last_mark = now
+
+    def finish(self) -> dict:
+        self.mark("rest of fragment" if self.fragment else "rest of page")
+        return {
+            "timestamp": self.timestamp,
+            "session": self.session,
+            "page": self.page,
+            "fragment": self.fragment,
+            "total_ms": (self.last_mark - self.start) * 1000,
+            "marks": [{"name": name, "ms": ms} for name, ms in self.marks],
+            "sections": dict(self.sections),
+            "cache": dict(self.cache),
+        }
+
+
+def _current():
+    return getattr(_local, "run", None)
+
+
+def _install_cache_hooks():
+    """
+    Count st.cache_data / st.cache_resource hits and misses of the running rerun by wrapping
+    Streamlit's CachedFunc hit/miss handlers. Internal API, so telemetry just goes without
+    cache counts if it moves.
+    """
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+        _hooks_installed.append(True)
+        try:
+            from streamlit.runtime.caching.cache_utils import CachedFunc
+        except ImportError:
+            return
+        original_hit, original_miss = CachedFunc._handle_cache_hit, CachedFunc._handle_cache_miss
+
+        def count(cached_func, outcome):
+            run = _current()
+            if run is not None:
+                func = cached_func._info.func
+                run.cache[f"{func.__module__}.{func.__qualname__}"][outcome] += 1
+
+        def handle_hit(self, result):
+            count(self, "hits")
+            return original_hit(self, result)
+
+        def handle_miss(self, *args, **kwargs):
+            count(self, "misses")
+            return original_miss(self, *args, **kwargs)
+
+        CachedFunc._handle_cache_hit, CachedFunc._handle_cache_miss = handle_hit, handle_miss
+
+
+def enabled() -> bool:
+    """The hidden debug panel: SCOUT_DEBUG=1 for everyone, ?debug=1 for one session"""
+    if os.environ.get("SCOUT_DEBUG", "").lower() in ("1", "true", "yes"):
+        return True
+    return st.query_params.get("debug") == "1"
+
+
+def begin_run(page) -> bool:
+    """Start recording this rerun if the debug panel is enabled (call once at the top of the script)"""
+    _local.run = None  # a rerun cut short by st.rerun() never reached end_run()
+    if not enabled():
+        return False
+    _install_cache_hooks()
+    _local.run = RunRecorder(page, _session_id())
+    return True
+
+
+def _session_id():
+    if "_telemetry_session" not in st.session_state:
+        st.session_state._telemetry_session = uuid.uuid4().hex[:8]
+    return st.session_state._telemetry_session
+
+
+def end_run():
+    """Stop recording, keep the rerun in the session history (and the log, if configured)"""
+    run = _current()
+    if run is None:
+        return None
+    _local.run = None
+    record = run.finish()
+    history = st.session_state.setdefault("_telemetry_history", deque(maxlen=HISTORY_SIZE))
+    history.append(record)
+    if TELEMETRY_LOG:
+        export([record], TELEMETRY_LOG)
+    return record
+
+
+def fragment_run(name):
+    """
+    Decorator for @st.fragment functions (apply it under @st.fragment). In a full rerun the
+    fragment is part of the page's recording. A fragment-only rerun never reaches begin_run() /
+    end_run(), so it gets a recorder of its own: kept in the history and the log like any rerun,
+    and summarised in a caption, as the sidebar panel only redraws on a full rerun.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current() is not None or not enabled():
+                return fn(*args, **kwargs)
+            _install_cache_hooks()
+            _local.run = RunRecorder(st.session_state.get("current_page", "dashboard"), _session_id(), name)
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                record = end_run()
+            st.caption(f"🛠️ Fragment rerun ({name}): {record['total_ms']:.0f} ms, "
+                       f"{sum(c['hits'] for c in record['cache'].values())} cache hits, "
+                       f"{sum(c['misses'] for c in record['cache'].values())} misses")
+            return result
+        return wrapper
+    return decorate
+
+
+def mark(name):
+    """Close the current lap of the page timeline: time since the previous mark goes to `name`"""
+    run = _current()
+    if run is not None:
+        run.mark(name)
+
+
+def cache_event(name, hit):
+    """Count a hit or miss of a cache other than st.cache_data / st.cache_resource (e.g. the figure cache)"""
+    run = _current()
+    if run is not None:
+        run.cache[name]["hits" if hit else "misses"] += 1
+
+
+@contextmanager
+def section(name):
+    """Time a block; repeated sections with the same name add up"""
+    run = _current()
+    if run is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = run.sections[name]
+        stats["calls"] += 1
+        stats["ms"] += (time.perf_counter() - start) * 1000
+
+
+def timed(name=None):
+    """Decorator form of section()"""
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with section(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def export(records, path=DEFAULT_EXPORT_PATH):
+    """Append rerun records to a JSONL file for offline analysis"""
+    with open(path, "a") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    return path
+
+
+def render_debug_panel():
+    """Sidebar panel with the last rerun's timeline, sections and cache hits plus recent reruns"""
+    history = list(st.session_state.get("_telemetry_history", []))
+    if not history:
+        return
+    last = history[-1]
+    with st.sidebar.expander("🛠️ Rerun telemetry", expanded=True):
+        label = f"{last['page']} ({last['fragment']})" if last.get("fragment") else last["page"]
+        st.metric(f"Last rerun: {label}", f"{last['total_ms']:.0f} ms")
+
+        timeline = pd.DataFrame(last["marks"])
+        timeline["share"] = (timeline["ms"] / max(last["total_ms"], 1e-9)).map("{:.0%}".format)
+        st.caption("Timeline")
+        st.dataframe(timeline.round({"ms": 1}), hide_index=True, use_container_width=True)
+
+        if last["sections"]:
+            st.caption("Sections")
+            sections = pd.DataFrame.from_dict(last["sections"], orient="index").rename_axis("section")
+            st.dataframe(sections.round({"ms": 1}), use_container_width=True)
+
+        if last["cache"]:
+            st.caption("Cache")
+            cache = pd.DataFrame.from_dict(last["cache"], orient="index").rename_axis("function")
+            st.dataframe(cache, use_container_width=True)
+
+        st.caption(f"Last {len(history)} reruns")
+        recent = pd.DataFrame([{"page": f"{r['page']} ({r['fragment']})" if r.get("fragment") else r["page"],
+                                "ms": r["total_ms"]} for r in history])
+        st.dataframe(recent.groupby("page")["ms"].describe()[["count", "mean", "50%", "max"]].round(0),
+                     use_container_width=True)
+
+        jsonl = "".join(json.dumps(record) + "\n" for record in history)
+        st.download_button("⬇️ Download JSONL", jsonl, file_name="telemetry.jsonl", mime="application/jsonl",
+                           key="telemetry_download")
+        if TELEMETRY_LOG:
+            st.caption(f"Every rerun is logged to {TELEMETRY_LOG}")
+        elif st.button("💾 Append to log", key="telemetry_export"):
+            exported = st.session_state.get("_telemetry_exported", "")
+            fresh = [record for record in history if record["timestamp"] > exported]
+            export(fresh, DEFAULT_EXPORT_PATH)
+            st.session_state._telemetry_exported = history[-1]["timestamp"]
+            st.success(f"{len(fresh)} new reruns appended to {DEFAULT_EXPORT_PATH}")
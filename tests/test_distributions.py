@@ -0,0 +1,18 @@
+import numpy as np
+import pandas as pd
+
+from distributions import compute_distributions, kde_curve
+
+
+def test_kde_curve_two_players():
+    # Two values give a bandwidth wide enough that the kernel outgrows the KDE grid
+    curve = kde_curve(np.array([0.0, 1.0]))
+    assert len(curve["x"]) == len(curve["density"])
+    assert abs(np.trapezoid(curve["density"], curve["x"]) - 1) < 0.01
+
+
+def test_compute_distributions_two_player_league():
+    # A league filter that leaves a single two-player group
+    df = pd.DataFrame({"League": ["A", "A"], "OVR": [70.0, 75.0]})
+    result = compute_distributions(df, "OVR", by="League")
+    assert list(result["groups"]) == ["A"]
@@ -1,15 +1,22 @@
+import os
 import pandas as pd
 import numpy as np
 import re
 import streamlit as st
+from clustering import get_clustering_engine
+from dataset_watcher import DatasetSnapshot, DatasetWatcher, file_version
+from player_index import INDEX_COLUMNS, PlayerIndex
+from season_store import MANIFEST, STORE_PATH, SeasonStore
+
+# SCOUT_DATA_PATH points every loader at another CSV (e.g. one written by synthetic_data.py)
+DATA_PATH = os.environ.get("SCOUT_DATA_PATH", "forwards_clean_with_market_values_updated.csv")
 
-@st.cache_data
 def load_data():
     """
-    Load and preprocess the forwards dataset.
+    Load and preprocess the forwards dataset (the current snapshot, see read_table()).
     Returns a DataFrame with numeric columns coerced and an OVR_size for marker sizing.
     """
-    df = pd.read_csv("forwards_clean_with_market_values_updated.csv")
+    df = read_table()
     # Ensure numeric columns
     cols = ["PACE","SHOOTING","PASSING","DRIBBLING","PHYSICAL","AERIAL",
             "MENTAL","OVR","Age","Height","Weight","market_value"]
@@ -103,10 +110,10 @@ def smart_query_processor(query: str, df):
     if ' vs ' in q or 'compare' in q:
         from pages.comparison import handle_query_comparison
         return handle_query_comparison(q, df)
-    for nm in df['Name']:
-        if len(nm) > 3 and nm.lower() in q:
-            from pages.forward_profile import format_player_info
-            return format_player_info(nm, df)
+    mentioned = get_player_index(df).find_in_text(q)
+    if mentioned:
+        from pages.forward_profile import format_player_info
+        return format_player_info(df.loc[mentioned[0], 'Name'], df)
     # Format results
     return format_results(df_r, title)
 
@@ -120,3 +127,68 @@ def format_results(df, title: str) -> str:
                f"• OVR: {p['OVR']:.1f} | Value: €{p['market_value']:.1f}M  \n"
                f"• Pace: {p['PACE']:.0f}, Shoot: {p['SHOOTING']:.0f}, Pass: {p['PASSING']:.0f}\n\n")
     return md
+
+@st.cache_resource(show_spinner=False)
+def get_dataset_watcher() -> DatasetWatcher:
+    """One watcher of DATA_PATH per server process; every session reads its snapshots"""
+    return DatasetWatcher(DATA_PATH)
+
+def watch_dataset():
+    """
+    Call at the top of every rerun: swaps in a refreshed CSV (checked at most every
+    SCOUT_RELOAD_INTERVAL seconds) and pins this session to the current snapshot, so the
+    table and every version key of the rerun - and of its fragment reruns - agree.
+    Returns the DatasetChange when a new table was swapped in.
+    """
+    watcher = get_dataset_watcher()
+    change = watcher.poll()
+    if change:
+        # Players only added: finished clusterings take a mini-batch step instead of a refit
+        get_clustering_engine().ingest(change)
+    st.session_state._dataset_snapshot = watcher.snapshot
+    return change
+
+def current_dataset() -> DatasetSnapshot:
+    """The snapshot this session is pinned to (the watcher's latest before the first pin)"""
+    try:
+        pinned = st.session_state.get("_dataset_snapshot")
+    except Exception:
+        pinned = None
+    return pinned or get_dataset_watcher().snapshot
+
+def read_table() -> pd.DataFrame:
+    """A copy of the player table of the current snapshot"""
+    snapshot = current_dataset()
+    if snapshot.version == "missing":
+        raise FileNotFoundError(DATA_PATH)
+    return snapshot.df.copy()
+
+def dataset_version(path: str = DATA_PATH, columns=None):
+    """
+    Fingerprint of the dataset, used to key cached, precomputed structures so they rebuild when it changes.
+    For DATA_PATH it is the content hash of the current snapshot; with `columns` only those columns
+    (and the row index) count, so a cache survives reloads that leave its inputs alone.
+    Any other file falls back to size + modification time.
+    """
+    if path != DATA_PATH:
+        return file_version(path)
+    return current_dataset().columns_version(columns)
+
+@st.cache_resource(show_spinner=False)
+def _cached_player_index(_df, version, n_rows):
+    return PlayerIndex(_df)
+
+def get_player_index(df, version: str = None) -> PlayerIndex:
+    """
+    Shared name -> row index for the full dataset, built once per version of the indexed columns.
+    Pages filter its pre-sorted label lists instead of re-sorting names on every rerun.
+    """
+    return _cached_player_index(df, version or dataset_version(columns=INDEX_COLUMNS), len(df))
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _cached_season_store(version):
+    return SeasonStore(STORE_PATH)
+
+def get_season_store() -> SeasonStore:
+    """Snapshot history (season_store.py), loaded once per version of its manifest, i.e. per ingestion"""
+    return _cached_season_store(file_version(os.path.join(STORE_PATH, MANIFEST)))